@@ -16,7 +16,7 @@ import zipfile
 import webbrowser
 import yaml
 from yaml import SafeLoader, SafeDumper
-from http.server import SimpleHTTPRequestHandler, HTTPServer
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 
 # Android availability will be checked at runtime
@@ -121,6 +121,9 @@ INLINE_LOADING_ASCII_ART = r"""
 LOADING_ASCII_FONT_SIZE = 3.1
 LOADING_ASCII_FONT_FAMILY = "monospace"
 
+# Batched bridge requests (POST /api/_batch from mobile_bridge.js)
+BATCH_RESPONSE_CHUNK_BYTES = 256 * 1024  # Large results are written to the response stream in slices this size
+
 
 # Custom HTTP handler that serves files and handles API calls
 class APIHandler(SimpleHTTPRequestHandler):
@@ -146,32 +149,71 @@ class APIHandler(SimpleHTTPRequestHandler):
         """Handle POST requests to /api/* endpoints."""
         if self.path.startswith('/api/'):
             # Extract method name from path
-            method = self.path[5:]  # Remove '/api/' prefix
+            parsed_path = urlparse(self.path)
+            method = parsed_path.path[5:]  # Remove '/api/' prefix
             
             # Read request body
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            request_data = json.loads(post_data.decode('utf-8'))
-            
-            args = request_data.get('args', [])
+
+            if self.headers.get('Content-Type', '').startswith('application/octet-stream'):
+                # Raw byte upload (write_bytes): the body is the data, other arguments are in the query
+                query = {key: values[-1] for key, values in parse_qs(parsed_path.query).items()}
+                args = [query.get('path', ''), post_data, query.get('write_behind') in ('1', 'true')]
+                call_id = query.get('call_id')
+                timeout_ms = None
+            else:
+                request_data = json.loads(post_data.decode('utf-8'))
+                if method == '_batch':
+                    self.handle_batch(request_data.get('calls', []))
+                    return
+                args = request_data.get('args', [])
+                call_id = request_data.get('call_id')
+                timeout_ms = request_data.get('timeout_ms')
             
             try:
-                # Route to appropriate handler
-                result = self.handle_api_method(method, args)
+                backend._bridge_batches.note_single_call()
+                # Route to appropriate handler under a cancellable call token
+                result = backend.run_bridge_call(call_id, timeout_ms, self.handle_api_method, method, args)
                 
-                # Send success response
+                # Data URLs are base64-encoded chunk by chunk straight into the response
+                if isinstance(result, backend.DataUrlStream):
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.end_headers()
+                    try:
+                        result.write_json(self.wfile.write)
+                    except Exception as e:
+                        # Headers are already sent, so the truncated body is the only signal left
+                        print(f"API Error streaming {method}: {e}")
+                    return
+
+                # Send success response; bytes results (read_bytes) go back as octet-stream
+                if isinstance(result, (bytes, bytearray)):
+                    body = bytes(result)
+                    content_type = 'application/octet-stream'
+                else:
+                    body = json.dumps(result).encode('utf-8')
+                    content_type = 'application/json'
                 self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps(result).encode('utf-8'))
+                self.wfile.write(body)
                 
             except Exception as e:
                 # Send error response with full traceback
                 import traceback
                 print(f"API Error in {method}: {e}")
                 traceback.print_exc()
-                self.send_response(500)
+                if isinstance(e, FileNotFoundError):
+                    self.send_response(404)
+                elif isinstance(e, PermissionError):
+                    self.send_response(403)
+                else:
+                    self.send_response(500)
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
@@ -180,14 +222,45 @@ class APIHandler(SimpleHTTPRequestHandler):
             self.send_response(404)
             self.end_headers()
     
+    def handle_batch(self, calls):
+        """Run a batch of API calls and stream each [call_id, result, error] line back as it finishes."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+
+        def write_line(call_id, result, error):
+            if isinstance(result, (bytes, bytearray, backend.DataUrlStream)):
+                # The bridge lists stream methods in UNBATCHED_METHODS; one missing from that
+                # list is sent again on its own request
+                fields = [call_id, None, "This method returns a stream and can't be batched", "unbatched"]
+            else:
+                fields = [call_id, result, error]
+            try:
+                line = json.dumps(fields)
+            except (TypeError, ValueError) as e:
+                line = json.dumps([call_id, None, f"Unserializable result: {e}"])
+            data = (line + "\n").encode('utf-8')
+            # The response has no Content-Length; the bridge splits lines as they arrive and
+            # reassembles results that span several reads
+            for offset in range(0, len(data), BATCH_RESPONSE_CHUNK_BYTES):
+                self.wfile.write(data[offset:offset + BATCH_RESPONSE_CHUNK_BYTES])
+
+        try:
+            backend.run_bridge_batch(calls, self.handle_api_method, write_line)
+        except (BrokenPipeError, ConnectionResetError):
+            print("Bridge: Client closed a batched request; unfinished calls were cancelled")
+
     def handle_api_method(self, method, args):
         """Route API calls to backend methods."""
         if method == 'js_log':
-            # Print JavaScript console logs to Python stdout
+            # Record JavaScript console logs in the backend log
             level = args[0] if len(args) > 0 else 'LOG'
             message = args[1] if len(args) > 1 else ''
-            print(f"[JS {level}] {message}")
-            return {"success": True}
+            return backend.log_js(level, message)
+        elif method == 'js_log_batch':
+            return backend.log_js_batch(*args)
         elif method == 'launch_app':
             return backend.launch_app(*args)
         elif method == 'stop_app':
@@ -204,28 +277,112 @@ class APIHandler(SimpleHTTPRequestHandler):
             return backend.init_apps() or backend.apps
         elif method == 'fuzzy_search_apps':
             return backend.fuzzy_search_apps(*args)
+        elif method == 'cancel_call':
+            return backend.cancel_call(*args)
+        elif method == 'call_with_deadline':
+            call_id, timeout_ms, target_method = args[0], args[1], args[2]
+            target_args = args[3] if len(args) > 3 and args[3] else []
+            if target_method in ('call_with_deadline', 'cancel_call'):
+                raise ValueError(f"Unknown API method: {target_method}")
+            return backend.run_bridge_call(call_id, timeout_ms, self.handle_api_method, target_method, target_args)
         elif method == 'get_available_update':
             return backend.available_update
         elif method == 'open_external_url':
             return open_external_url(*args)
+        elif method == 'get_bridge_stats':
+            return backend.get_bridge_batch_stats()
+        elif method == 'get_js_log_config':
+            return backend.js_log_config()
+        elif method == 'set_js_log_level':
+            return backend.set_js_log_level(*args)
         elif method == 'send_notification':
             return notification_manager.send_notification(*args)
         elif method == 'delete_notification':
             return notification_manager.delete_notification(*args)
         elif method == 'get_notifications':
-            return notification_manager.get_notifications()
+            return notification_manager.get_notifications(*args)
+        elif method == 'get_notification_stats':
+            return notification_manager.get_notification_stats()
         elif method == 'clear_all_notifications':
             return notification_manager.clear_all_notifications()
         elif method == 'display_error':
             return error_manager.display_error(*args)
         elif method == 'get_error':
             return error_manager.get_error(*args)
+        elif method == 'get_logs':
+            return error_manager.get_logs(*args)
+        elif method == 'set_log_level':
+            return error_manager.set_log_level(*args)
+        elif method == 'get_log_stats':
+            return error_manager.get_log_stats()
         elif method == 'list_directory':
             return file_manager.list_directory(*args)
+        elif method == 'list_directory_page':
+            return file_manager.list_directory_page(*args)
+        elif method == 'get_listing_cache_stats':
+            return file_manager.get_listing_cache_stats()
+        elif method == 'get_folder_size':
+            return file_manager.get_folder_size(*args)
+        elif method == 'get_folder_size_stats':
+            return file_manager.get_folder_size_stats()
+        elif method == 'watch_directory':
+            return file_manager.watch_directory(*args)
+        elif method == 'unwatch_directory':
+            return file_manager.unwatch_directory(*args)
+        elif method == 'get_watch_status':
+            return file_manager.get_watch_status()
+        elif method == 'search_files':
+            return file_manager.search_files(*args)
+        elif method == 'add_index_root':
+            return file_manager.add_index_root(*args)
+        elif method == 'remove_index_root':
+            return file_manager.remove_index_root(*args)
+        elif method == 'get_index_status':
+            return file_manager.get_index_status()
+        elif method == 'start_copy':
+            return file_manager.start_copy(*args)
+        elif method == 'start_move':
+            return file_manager.start_move(*args)
+        elif method == 'start_delete':
+            return file_manager.start_delete(*args)
+        elif method == 'get_job':
+            return file_manager.get_job(*args)
+        elif method == 'list_jobs':
+            return file_manager.list_jobs()
+        elif method == 'pause_job':
+            return file_manager.pause_job(*args)
+        elif method == 'resume_job':
+            return file_manager.resume_job(*args)
+        elif method == 'cancel_job':
+            return file_manager.cancel_job(*args)
         elif method == 'read_file':
             return file_manager.read_file(*args)
         elif method == 'write_file':
             return file_manager.write_file(*args)
+        elif method == 'read_bytes':
+            return file_manager.read_bytes(*args)
+        elif method == 'write_bytes':
+            return file_manager.write_bytes(*args)
+        elif method == 'flush_writes':
+            return file_manager.flush_writes()
+        elif method == 'get_write_stats':
+            return file_manager.get_write_stats()
+        elif method == 'get_file_hash':
+            return file_manager.get_file_hash(*args)
+        elif method == 'get_file_hashes':
+            return file_manager.get_file_hashes(*args)
+        elif method == 'get_hash_stats':
+            return file_manager.get_hash_stats()
+        elif method == 'get_thumbnail':
+            return file_manager.get_thumbnail(*args)
+        elif method == 'get_thumbnails':
+            return file_manager.get_thumbnails(*args)
+        elif method == 'cancel_thumbnails':
+            return file_manager.cancel_thumbnails(*args)
+        elif method == 'get_thumbnail_stats':
+            return file_manager.get_thumbnail_stats()
+        elif method == 'get_data_url_stats':
+            return file_manager.get_data_url_stats()
         elif method == 'delete_file':
             return file_manager.delete_file(*args)
         elif method == 'delete_directory':
@@ -240,24 +397,39 @@ class APIHandler(SimpleHTTPRequestHandler):
             return file_manager.move_item(*args)
         elif method == 'copy_item':
             return file_manager.copy_item(*args)
+        elif method == 'bulk_delete':
+            return file_manager.bulk_delete(*args)
+        elif method == 'bulk_move':
+            return file_manager.bulk_move(*args)
+        elif method == 'bulk_copy':
+            return file_manager.bulk_copy(*args)
         elif method == 'get_metadata':
             return file_manager.get_metadata(*args)
         elif method == 'get_file_info':
             return file_manager.get_file_info(*args)
         elif method == 'get_file_data_url':
-            return file_manager.get_file_data_url(*args)
+            # Streamed into the response by do_POST instead of built in memory
+            return file_manager.open_file_data_url(*args)
         elif method == 'exists':
             return file_manager.exists(*args)
         elif method == 'get_storage_path':
             return file_manager.get_storage_path(*args)
         elif method == 'get_fonts':
             return backend.fonts
+        elif method == 'get_font_manifest':
+            return settings_manager.get_font_manifest()
+        elif method == 'get_font_stats':
+            return settings_manager.get_font_stats()
         elif method == 'get_version':
             return backend.version
         elif method == 'get_wallpaper':
             return backend.wallpaper
         elif method == 'get_wallpaper_data':
-            return settings_manager.get_wallpaper_data()
+            return settings_manager.open_wallpaper_data()
+        elif method == 'get_scaled_wallpaper':
+            return settings_manager.get_scaled_wallpaper(*args)
+        elif method == 'get_wallpaper_stats':
+            return settings_manager.get_wallpaper_stats()
         elif method == 'get_day_gradient':
             return backend.day_gradient
         elif method == 'get_fullscreen':
@@ -290,6 +462,10 @@ class APIHandler(SimpleHTTPRequestHandler):
             return settings_manager.set_reduce_graphics(*args)
         elif method == 'set_color_theme':
             return settings_manager.set_color_theme(*args)
+        elif method == 'set_settings':
+            return settings_manager.set_settings(*args)
+        elif method == 'flush_settings':
+            return settings_manager.flush_settings()
         else:
             raise ValueError(f"Unknown API method: {method}")
 
@@ -305,6 +481,14 @@ class SanctumStation(toga.App):
 
         self.add_background_task(self.initialize_runtime)
 
+    def on_exit(self):
+        """Make buffered write-behind data, settings, notifications and logs durable before the app closes."""
+        backend.flush_writes()
+        backend.flush_settings()
+        backend.flush_notifications()
+        backend.flush_logs()
+        return True
+
     def _get_loading_ascii_art(self):
         """Load ASCII art from inline constant, file, or fallback."""
         inline_art = INLINE_LOADING_ASCII_ART.strip('\n').replace('\\#', '#')
@@ -631,6 +815,45 @@ class SanctumStation(toga.App):
                 print(f"  Warning: Unable to write apps version file: {e}")
                 return False
 
+        # The content hash cache lives in writable storage, so point DATA_DIR there before syncing
+        backend.DATA_DIR = writable_data_dir
+
+        # Returns the (source, dest) pairs whose dest is missing or has different content.
+        # Same-size pairs are compared by content hash in one batch; hashes are cached by
+        # (device, inode, size, mtime), so files unchanged since the last sync are not read.
+        def changed_files(pairs):
+            changed = []
+            to_hash = []
+            for src_file, dest_file in pairs:
+                try:
+                    if os.path.getsize(src_file) != os.path.getsize(dest_file):
+                        changed.append((src_file, dest_file))
+                    else:
+                        to_hash.append((src_file, dest_file))
+                except OSError:
+                    changed.append((src_file, dest_file))
+
+            if to_hash:
+                result = file_manager.get_file_hashes([path for pair in to_hash for path in pair])
+                hashes = result.get("hashes", {})
+                for src_file, dest_file in to_hash:
+                    src_hash = hashes.get(src_file)
+                    if not src_hash or src_hash != hashes.get(dest_file):
+                        changed.append((src_file, dest_file))
+            return changed
+
+        def replace_file(src_file, dest_file):
+            # Remove existing file first if it exists (fixes permission issues)
+            if os.path.exists(dest_file):
+                try:
+                    os.chmod(dest_file, 0o666)  # Make writable
+                except Exception:
+                    pass
+                os.remove(dest_file)
+            shutil.copy2(src_file, dest_file)
+            # Ensure new file is writable
+            os.chmod(dest_file, 0o666)
+
         # Extract apps from bundled resources (.txt files)
         bundled_apps_dir = os.path.join(app_dir, 'resources', 'apps')
         bundled_version_path = os.path.join(app_dir, 'resources', 'apps_version.txt')
@@ -656,7 +879,8 @@ class SanctumStation(toga.App):
             # Ensure writable apps directory exists
             os.makedirs(writable_apps_dir, exist_ok=True)
             
-            # Process each bundled app
+            # Collect every bundled app file with its writable destination
+            app_files = []
             for app_name in os.listdir(bundled_apps_dir):
                 bundled_app_path = os.path.join(bundled_apps_dir, app_name)
                 writable_app_path = os.path.join(writable_apps_dir, app_name)
@@ -683,40 +907,16 @@ class SanctumStation(toga.App):
                         
                         # Create parent directories if needed
                         os.makedirs(os.path.dirname(writable_file), exist_ok=True)
-                        
-                        # Copy if file doesn't exist or content is different
-                        should_copy = False
-                        if not os.path.exists(writable_file):
-                            should_copy = True
-                        else:
-                            # Compare file contents
-                            try:
-                                with open(bundled_file, 'rb') as f1:
-                                    bundled_content = f1.read()
-                                with open(writable_file, 'rb') as f2:
-                                    writable_content = f2.read()
-                                if bundled_content != writable_content:
-                                    should_copy = True
-                            except (PermissionError, OSError) as e:
-                                # If we can't read the file, replace it
-                                print(f"  Warning: Can't read {writable_filename}, will replace: {e}")
-                                should_copy = True
-                        
-                        if should_copy:
-                            try:
-                                # Remove existing file first if it exists (fixes permission issues)
-                                if os.path.exists(writable_file):
-                                    try:
-                                        os.chmod(writable_file, 0o666)  # Make writable
-                                    except:
-                                        pass
-                                    os.remove(writable_file)
-                                shutil.copy2(bundled_file, writable_file)
-                                # Ensure new file is writable
-                                os.chmod(writable_file, 0o666)
-                                print(f"  Updated: {app_name}/{writable_filename}")
-                            except (PermissionError, OSError) as e:
-                                print(f"  Error copying {writable_filename}: {e}")
+                        app_files.append((bundled_file, writable_file))
+
+            # Copy files that don't exist or whose content is different
+            for bundled_file, writable_file in changed_files(app_files):
+                display_name = os.path.relpath(writable_file, writable_apps_dir)
+                try:
+                    replace_file(bundled_file, writable_file)
+                    print(f"  Updated: {display_name}")
+                except (PermissionError, OSError) as e:
+                    print(f"  Error copying {display_name}: {e}")
             
             print(f"  App sync complete")
             if bundled_version:
@@ -733,6 +933,7 @@ class SanctumStation(toga.App):
         os.makedirs(writable_web_dir, exist_ok=True)
         print(f"Syncing web assets from {bundled_web_dir} to {writable_web_dir}...")
 
+        web_files = []
         for root, dirs, files in os.walk(bundled_web_dir):
             rel_root = os.path.relpath(root, bundled_web_dir)
             rel_root = '' if rel_root == '.' else rel_root
@@ -750,34 +951,15 @@ class SanctumStation(toga.App):
                 relative_path = os.path.normpath(os.path.join(rel_root, filename))
                 dest_file = os.path.join(writable_web_dir, relative_path)
                 os.makedirs(os.path.dirname(dest_file), exist_ok=True)
+                web_files.append((src_file, dest_file))
 
-                should_copy = False
-                if not os.path.exists(dest_file):
-                    should_copy = True
-                else:
-                    try:
-                        with open(src_file, 'rb') as src_fp:
-                            src_content = src_fp.read()
-                        with open(dest_file, 'rb') as dest_fp:
-                            dest_content = dest_fp.read()
-                        if src_content != dest_content:
-                            should_copy = True
-                    except Exception:
-                        should_copy = True
-
-                if should_copy:
-                    try:
-                        if os.path.exists(dest_file):
-                            try:
-                                os.chmod(dest_file, 0o666)
-                            except Exception:
-                                pass
-                            os.remove(dest_file)
-                        shutil.copy2(src_file, dest_file)
-                        os.chmod(dest_file, 0o666)
-                        print(f"  Updated web asset: {relative_path}")
-                    except Exception as e:
-                        print(f"  Error syncing web asset {relative_path}: {e}")
+        for src_file, dest_file in changed_files(web_files):
+            relative_path = os.path.relpath(dest_file, writable_web_dir)
+            try:
+                replace_file(src_file, dest_file)
+                print(f"  Updated web asset: {relative_path}")
+            except Exception as e:
+                print(f"  Error syncing web asset {relative_path}: {e}")
 
         print("Web asset sync complete")
         
@@ -807,7 +989,9 @@ class SanctumStation(toga.App):
         os.chdir(web_root_dir)
         
         # Create and start server with custom APIHandler in a background thread
-        self.httpd = HTTPServer(('127.0.0.1', 5000), APIHandler)
+        # Requests are handled on their own threads so cancel_call can reach a busy call
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 5000), APIHandler)
+        self.httpd.daemon_threads = True
         
         server_thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
         server_thread.start()
@@ -836,7 +1020,8 @@ class SanctumStation(toga.App):
                     const message = {
                         id: callId,
                         method: method,
-                        args: args
+                        args: args,
+                        timeout_ms: 30000
                     };
                     
                     // Store the promise callbacks
@@ -850,6 +1035,12 @@ class SanctumStation(toga.App):
                     setTimeout(() => {
                         if (window.pywebviewCallbacks[callId]) {
                             delete window.pywebviewCallbacks[callId];
+                            // Let Python stop work nobody is waiting for anymore
+                            window.webkit.messageHandlers.toga.postMessage(JSON.stringify({
+                                id: Date.now() + Math.random(),
+                                method: 'cancel_call',
+                                args: [String(callId)]
+                            }));
                             reject(new Error('Request timeout'));
                         }
                     }, 30000);
@@ -871,16 +1062,17 @@ class SanctumStation(toga.App):
             // Define all API methods
             const methods = [
                 'launch_app', 'stop_app', 'get_apps', 'get_running_apps', 'refresh_apps',
-                'send_notification', 'delete_notification', 'get_notifications', 'clear_all_notifications',
-                'display_error', 'get_error',
-                'list_directory', 'read_file', 'write_file', 'delete_file', 'delete_directory',
-                'create_directory', 'create_file', 'rename_item', 'move_item', 'copy_item',
+                'send_notification', 'delete_notification', 'get_notifications', 'get_notification_stats', 'clear_all_notifications',
+                'display_error', 'get_error', 'get_logs', 'set_log_level', 'get_log_stats',
+                'list_directory', 'list_directory_page', 'get_listing_cache_stats', 'get_folder_size', 'get_folder_size_stats', 'watch_directory', 'unwatch_directory', 'get_watch_status', 'search_files', 'add_index_root', 'remove_index_root', 'get_index_status', 'start_copy', 'start_move', 'start_delete', 'get_job', 'list_jobs', 'pause_job', 'resume_job', 'cancel_job', 'read_file', 'write_file', 'flush_writes', 'get_write_stats', 'get_file_hash', 'get_file_hashes', 'get_hash_stats', 'get_thumbnail', 'get_thumbnails', 'cancel_thumbnails', 'get_thumbnail_stats', 'get_data_url_stats', 'delete_file', 'delete_directory',
+                'create_directory', 'create_file', 'rename_item', 'move_item', 'copy_item', 'bulk_delete', 'bulk_move', 'bulk_copy',
                 'get_metadata', 'exists',
-                'get_fonts', 'get_version', 'get_wallpaper', 'get_wallpaper_data',
+                'get_fonts', 'get_font_manifest', 'get_font_stats', 'get_version', 'get_wallpaper', 'get_wallpaper_data', 'get_scaled_wallpaper', 'get_wallpaper_stats',
                 'get_day_gradient', 'get_fullscreen',
                 'get_settings', 'set_wallpaper', 'set_day_gradient', 'set_fullscreen',
-                'set_font', 'set_updates', 'set_notification_bind', 'set_command_palette_bind', 'set_apps_per_ring', 'set_reduce_graphics', 'set_color_theme', 'get_available_update', 'open_external_url', 'get_file_processor_support',
-                'fuzzy_search_apps', 'call_app_function'
+                'set_font', 'set_updates', 'set_notification_bind', 'set_command_palette_bind', 'set_apps_per_ring', 'set_reduce_graphics', 'set_color_theme', 'set_settings', 'flush_settings', 'get_available_update', 'open_external_url', 'get_file_processor_support',
+                'fuzzy_search_apps', 'call_app_function', 'get_bridge_stats', 'get_js_log_config', 'set_js_log_level',
+                'cancel_call', 'call_with_deadline'
             ];
             
             // Create API method wrappers
@@ -900,112 +1092,214 @@ class SanctumStation(toga.App):
         except Exception as e:
             print(f"Error injecting API bridge: {e}")
     
-    def handle_api_call(self, call_id, method, args):
+    def handle_api_call(self, call_id, method, args, timeout_ms=None):
         """Handle API calls from JavaScript."""
         try:
-            # Route to appropriate handler
-            if method == 'launch_app':
-                result = backend.launch_app(*args)
-            elif method == 'stop_app':
-                result = backend.stop_app(*args)
-            elif method == 'get_apps':
-                result = backend.apps
-            elif method == 'get_running_apps':
-                result = backend.get_running_apps()
-            elif method == 'refresh_apps':
-                result = backend.init_apps() or backend.apps
-            elif method == 'send_notification':
-                result = notification_manager.send_notification(*args)
-            elif method == 'delete_notification':
-                result = notification_manager.delete_notification(*args)
-            elif method == 'get_notifications':
-                result = notification_manager.get_notifications()
-            elif method == 'clear_all_notifications':
-                result = notification_manager.clear_all_notifications()
-            elif method == 'display_error':
-                result = error_manager.display_error(*args)
-            elif method == 'get_error':
-                result = error_manager.get_error(*args)
-            elif method == 'list_directory':
-                result = file_manager.list_directory(*args)
-            elif method == 'read_file':
-                result = file_manager.read_file(*args)
-            elif method == 'write_file':
-                result = file_manager.write_file(*args)
-            elif method == 'delete_file':
-                result = file_manager.delete_file(*args)
-            elif method == 'delete_directory':
-                result = file_manager.delete_directory(*args)
-            elif method == 'create_directory':
-                result = file_manager.create_directory(*args)
-            elif method == 'create_file':
-                result = file_manager.create_file(*args)
-            elif method == 'rename_item':
-                result = file_manager.rename_item(*args)
-            elif method == 'move_item':
-                result = file_manager.move_item(*args)
-            elif method == 'copy_item':
-                result = file_manager.copy_item(*args)
-            elif method == 'get_metadata':
-                result = file_manager.get_metadata(*args)
-            elif method == 'exists':
-                result = file_manager.exists(*args)
-            elif method == 'get_fonts':
-                result = backend.fonts
-            elif method == 'get_version':
-                result = backend.version
-            elif method == 'get_wallpaper':
-                result = backend.wallpaper
-            elif method == 'get_wallpaper_data':
-                result = settings_manager.get_wallpaper_data()
-            elif method == 'get_day_gradient':
-                result = backend.day_gradient
-            elif method == 'get_fullscreen':
-                result = backend.fullscreen
-            elif method == 'get_settings':
-                result = settings_manager.get_settings()
-            elif method == 'get_file_processor_support':
-                result = settings_manager.get_file_processor_support()
-            elif method == 'set_wallpaper':
-                result = settings_manager.set_wallpaper(*args)
-            elif method == 'set_day_gradient':
-                result = settings_manager.set_day_gradient(*args)
-            elif method == 'set_fullscreen':
-                result = settings_manager.set_fullscreen(*args)
-            elif method == 'set_font':
-                result = settings_manager.set_font(*args)
-            elif method == 'set_updates':
-                result = settings_manager.set_updates(*args)
-            elif method == 'set_notification_bind':
-                result = settings_manager.set_notification_bind(*args)
-            elif method == 'set_command_palette_bind':
-                result = settings_manager.set_command_palette_bind(*args)
-            elif method == 'set_apps_per_ring':
-                result = settings_manager.set_apps_per_ring(*args)
-            elif method == 'set_reduce_graphics':
-                result = settings_manager.set_reduce_graphics(*args)
-            elif method == 'set_color_theme':
-                result = settings_manager.set_color_theme(*args)
-            elif method == 'get_available_update':
-                result = backend.available_update
-            elif method == 'open_external_url':
-                result = open_external_url(*args)
-            elif method == 'fuzzy_search_apps':
-                result = backend.fuzzy_search_apps(*args)
-            elif method == 'call_app_function':
-                result = self.call_app_function_direct(*args)
-            else:
-                result = {"error": f"Unknown method: {method}"}
-            
+            # Route to appropriate handler under a cancellable call token
+            result = backend.run_bridge_call(str(call_id), timeout_ms, self._dispatch_api_call, method, args)
+
             # Send response back to JavaScript
             response_js = f"window.handlePythonResponse({call_id}, {json.dumps(result)}, null);"
             self.webview.evaluate_javascript(response_js)
-            
+
         except Exception as e:
             error_msg = str(e)
             response_js = f"window.handlePythonResponse({call_id}, null, {json.dumps(error_msg)});"
             self.webview.evaluate_javascript(response_js)
-    
+
+    def _dispatch_api_call(self, method, args):
+        """Route a Toga bridge call to its backend handler."""
+        if method == 'launch_app':
+            return backend.launch_app(*args)
+        elif method == 'stop_app':
+            return backend.stop_app(*args)
+        elif method == 'get_apps':
+            return backend.apps
+        elif method == 'get_running_apps':
+            return backend.get_running_apps()
+        elif method == 'refresh_apps':
+            return backend.init_apps() or backend.apps
+        elif method == 'send_notification':
+            return notification_manager.send_notification(*args)
+        elif method == 'delete_notification':
+            return notification_manager.delete_notification(*args)
+        elif method == 'get_notifications':
+            return notification_manager.get_notifications(*args)
+        elif method == 'get_notification_stats':
+            return notification_manager.get_notification_stats()
+        elif method == 'clear_all_notifications':
+            return notification_manager.clear_all_notifications()
+        elif method == 'display_error':
+            return error_manager.display_error(*args)
+        elif method == 'get_error':
+            return error_manager.get_error(*args)
+        elif method == 'get_logs':
+            return error_manager.get_logs(*args)
+        elif method == 'set_log_level':
+            return error_manager.set_log_level(*args)
+        elif method == 'get_log_stats':
+            return error_manager.get_log_stats()
+        elif method == 'list_directory':
+            return file_manager.list_directory(*args)
+        elif method == 'list_directory_page':
+            return file_manager.list_directory_page(*args)
+        elif method == 'get_listing_cache_stats':
+            return file_manager.get_listing_cache_stats()
+        elif method == 'get_folder_size':
+            return file_manager.get_folder_size(*args)
+        elif method == 'get_folder_size_stats':
+            return file_manager.get_folder_size_stats()
+        elif method == 'watch_directory':
+            return file_manager.watch_directory(*args)
+        elif method == 'unwatch_directory':
+            return file_manager.unwatch_directory(*args)
+        elif method == 'get_watch_status':
+            return file_manager.get_watch_status()
+        elif method == 'search_files':
+            return file_manager.search_files(*args)
+        elif method == 'add_index_root':
+            return file_manager.add_index_root(*args)
+        elif method == 'remove_index_root':
+            return file_manager.remove_index_root(*args)
+        elif method == 'get_index_status':
+            return file_manager.get_index_status()
+        elif method == 'start_copy':
+            return file_manager.start_copy(*args)
+        elif method == 'start_move':
+            return file_manager.start_move(*args)
+        elif method == 'start_delete':
+            return file_manager.start_delete(*args)
+        elif method == 'get_job':
+            return file_manager.get_job(*args)
+        elif method == 'list_jobs':
+            return file_manager.list_jobs()
+        elif method == 'pause_job':
+            return file_manager.pause_job(*args)
+        elif method == 'resume_job':
+            return file_manager.resume_job(*args)
+        elif method == 'cancel_job':
+            return file_manager.cancel_job(*args)
+        elif method == 'read_file':
+            return file_manager.read_file(*args)
+        elif method == 'write_file':
+            return file_manager.write_file(*args)
+        elif method == 'flush_writes':
+            return file_manager.flush_writes()
+        elif method == 'get_write_stats':
+            return file_manager.get_write_stats()
+        elif method == 'get_file_hash':
+            return file_manager.get_file_hash(*args)
+        elif method == 'get_file_hashes':
+            return file_manager.get_file_hashes(*args)
+        elif method == 'get_hash_stats':
+            return file_manager.get_hash_stats()
+        elif method == 'get_thumbnail':
+            return file_manager.get_thumbnail(*args)
+        elif method == 'get_thumbnails':
+            return file_manager.get_thumbnails(*args)
+        elif method == 'cancel_thumbnails':
+            return file_manager.cancel_thumbnails(*args)
+        elif method == 'get_thumbnail_stats':
+            return file_manager.get_thumbnail_stats()
+        elif method == 'get_data_url_stats':
+            return file_manager.get_data_url_stats()
+        elif method == 'delete_file':
+            return file_manager.delete_file(*args)
+        elif method == 'delete_directory':
+            return file_manager.delete_directory(*args)
+        elif method == 'create_directory':
+            return file_manager.create_directory(*args)
+        elif method == 'create_file':
+            return file_manager.create_file(*args)
+        elif method == 'rename_item':
+            return file_manager.rename_item(*args)
+        elif method == 'move_item':
+            return file_manager.move_item(*args)
+        elif method == 'copy_item':
+            return file_manager.copy_item(*args)
+        elif method == 'bulk_delete':
+            return file_manager.bulk_delete(*args)
+        elif method == 'bulk_move':
+            return file_manager.bulk_move(*args)
+        elif method == 'bulk_copy':
+            return file_manager.bulk_copy(*args)
+        elif method == 'get_metadata':
+            return file_manager.get_metadata(*args)
+        elif method == 'exists':
+            return file_manager.exists(*args)
+        elif method == 'get_fonts':
+            return backend.fonts
+        elif method == 'get_font_manifest':
+            return settings_manager.get_font_manifest()
+        elif method == 'get_font_stats':
+            return settings_manager.get_font_stats()
+        elif method == 'get_version':
+            return backend.version
+        elif method == 'get_wallpaper':
+            return backend.wallpaper
+        elif method == 'get_wallpaper_data':
+            return settings_manager.get_wallpaper_data()
+        elif method == 'get_scaled_wallpaper':
+            return settings_manager.get_scaled_wallpaper(*args)
+        elif method == 'get_wallpaper_stats':
+            return settings_manager.get_wallpaper_stats()
+        elif method == 'get_day_gradient':
+            return backend.day_gradient
+        elif method == 'get_fullscreen':
+            return backend.fullscreen
+        elif method == 'get_settings':
+            return settings_manager.get_settings()
+        elif method == 'get_file_processor_support':
+            return settings_manager.get_file_processor_support()
+        elif method == 'set_wallpaper':
+            return settings_manager.set_wallpaper(*args)
+        elif method == 'set_day_gradient':
+            return settings_manager.set_day_gradient(*args)
+        elif method == 'set_fullscreen':
+            return settings_manager.set_fullscreen(*args)
+        elif method == 'set_font':
+            return settings_manager.set_font(*args)
+        elif method == 'set_updates':
+            return settings_manager.set_updates(*args)
+        elif method == 'set_notification_bind':
+            return settings_manager.set_notification_bind(*args)
+        elif method == 'set_command_palette_bind':
+            return settings_manager.set_command_palette_bind(*args)
+        elif method == 'set_apps_per_ring':
+            return settings_manager.set_apps_per_ring(*args)
+        elif method == 'set_reduce_graphics':
+            return settings_manager.set_reduce_graphics(*args)
+        elif method == 'set_color_theme':
+            return settings_manager.set_color_theme(*args)
+        elif method == 'set_settings':
+            return settings_manager.set_settings(*args)
+        elif method == 'flush_settings':
+            return settings_manager.flush_settings()
+        elif method == 'get_available_update':
+            return backend.available_update
+        elif method == 'open_external_url':
+            return open_external_url(*args)
+        elif method == 'get_bridge_stats':
+            return backend.get_bridge_batch_stats()
+        elif method == 'get_js_log_config':
+            return backend.js_log_config()
+        elif method == 'set_js_log_level':
+            return backend.set_js_log_level(*args)
+        elif method == 'fuzzy_search_apps':
+            return backend.fuzzy_search_apps(*args)
+        elif method == 'call_app_function':
+            return self.call_app_function_direct(*args)
+        elif method == 'cancel_call':
+            return backend.cancel_call(*args)
+        elif method == 'call_with_deadline':
+            call_id, timeout_ms, target_method = args[0], args[1], args[2]
+            target_args = args[3] if len(args) > 3 and args[3] else []
+            if target_method in ('call_with_deadline', 'cancel_call'):
+                return {"error": f"Unknown method: {target_method}"}
+            return backend.run_bridge_call(call_id, timeout_ms, self._dispatch_api_call, target_method, target_args)
+        else:
+            return {"error": f"Unknown method: {method}"}
+
     def call_app_function_direct(self, app_name, function_name, *args):
         """Direct call to app function."""
         try:
@@ -1019,8 +1313,10 @@ class SanctumStation(toga.App):
                 return {"success": False, "message": f"Function '{function_name}' not found"}
             
             func = getattr(app_module, function_name)
-            result = func(*args)
+            result = backend.run_as_app(app_name, func, *args)
             return result
+        except backend.CallCancelledError:
+            raise
         except Exception as e:
             return {"success": False, "message": str(e)}
 
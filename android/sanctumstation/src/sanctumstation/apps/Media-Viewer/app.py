@@ -7,10 +7,9 @@ import os
 import base64
 import re
 import shutil
-import subprocess
 import wave
 
-from backend import FileManagerAPI
+from backend import CallCancelledError, FileManagerAPI, run_cancellable_subprocess
 
 FILE_MANAGER = FileManagerAPI()
 
@@ -263,7 +262,7 @@ def _run_ffmpeg_trim(input_path, output_path, start_seconds, end_seconds):
         output_path,
     ]
 
-    copy_process = subprocess.run(copy_command, capture_output=True, text=True)
+    copy_process = run_cancellable_subprocess(copy_command)
     if copy_process.returncode == 0 and os.path.isfile(output_path):
         return {
             "success": True,
@@ -284,7 +283,7 @@ def _run_ffmpeg_trim(input_path, output_path, start_seconds, end_seconds):
         input_path,
         output_path,
     ]
-    reencode_process = subprocess.run(reencode_command, capture_output=True, text=True)
+    reencode_process = run_cancellable_subprocess(reencode_command)
     if reencode_process.returncode == 0 and os.path.isfile(output_path):
         return {
             "success": True,
@@ -371,7 +370,13 @@ def save_trimmed_media(path, output_path, start_seconds, end_seconds):
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
-    ffmpeg_result = _run_ffmpeg_trim(resolved_input, resolved_output, start_value, end_value)
+    try:
+        ffmpeg_result = _run_ffmpeg_trim(resolved_input, resolved_output, start_value, end_value)
+    except CallCancelledError:
+        # Don't leave a half-written export behind when the call is cancelled
+        if os.path.isfile(resolved_output):
+            os.remove(resolved_output)
+        raise
     if ffmpeg_result.get("success"):
         return {
             "success": True,
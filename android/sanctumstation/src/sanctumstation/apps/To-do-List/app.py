@@ -60,7 +60,7 @@ def save_task(task_text):
             os.makedirs("data/to-do-list", exist_ok=True)
             file_path = "to-do-list/tasks.yaml"
             yaml_content = yaml.safe_dump(tasks)
-            file_api.write_file(file_path, yaml_content)
+            file_api.write_file(file_path, yaml_content, write_behind=True)
             next_id += 1
             return {"success": True, "tasks": tasks}
         else:
@@ -81,7 +81,7 @@ def delete_task(task_id):
                 os.makedirs("data/to-do-list", exist_ok=True)
                 file_path = "to-do-list/tasks.yaml"
                 yaml_content = yaml.safe_dump(tasks)
-                file_api.write_file(file_path, yaml_content)
+                file_api.write_file(file_path, yaml_content, write_behind=True)
                 return {"success": True, "tasks": tasks}
             else:
                 return {"success": False, "error": "File API not available"}
@@ -103,7 +103,7 @@ def toggle_task(task_id):
                 os.makedirs("data/to-do-list", exist_ok=True)
                 file_path = "to-do-list/tasks.yaml"
                 yaml_content = yaml.safe_dump(tasks)
-                file_api.write_file(file_path, yaml_content)
+                file_api.write_file(file_path, yaml_content, write_behind=True)
                 return {"success": True, "tasks": tasks}
             else:
                 return {"success": False, "error": "File API not available"}
@@ -13,6 +13,152 @@
     
     let checkCount = 0;
     const maxChecks = 20; // Check for 2 seconds
+
+    // Raw byte transfer without base64 for apps: window.sanctumBytes.read/write
+    // Mobile sends application/octet-stream bodies to the HTTP server; desktop uses the
+    // backend's loopback byte channel since pywebview's js_api only carries JSON
+    let byteChannelPromise = null;
+
+    function getByteChannel() {
+        if (!byteChannelPromise) {
+            byteChannelPromise = Promise.resolve(window.pywebview.api.get_byte_channel()).then((channel) => {
+                if (!channel || !channel.success) {
+                    throw new Error((channel && channel.error) || 'Byte channel unavailable');
+                }
+                return channel;
+            }).catch((error) => {
+                byteChannelPromise = null;
+                throw error;
+            });
+        }
+        return byteChannelPromise;
+    }
+
+    function toByteBody(data) {
+        if (data instanceof Blob || data instanceof ArrayBuffer || ArrayBuffer.isView(data)) {
+            return data;
+        }
+        if (typeof data === 'string') {
+            return new TextEncoder().encode(data);
+        }
+        throw new TypeError('write expects a Blob, ArrayBuffer, typed array or string');
+    }
+
+    window.sanctumBytes = {
+        // Resolves to a Uint8Array with the file's bytes (or length bytes from offset)
+        async read(path, offset = 0, length = null) {
+            let response;
+            if (isMobileServer) {
+                response = await fetch('http://127.0.0.1:5000/api/read_bytes', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ args: [path, offset, length], kwargs: {} })
+                });
+            } else {
+                const channel = await getByteChannel();
+                const params = new URLSearchParams({ token: channel.token, path, offset: String(offset) });
+                if (length !== null && length !== undefined) {
+                    params.set('length', String(length));
+                }
+                response = await fetch(`${channel.url}?${params}`);
+            }
+            if (!response.ok) {
+                // Mobile errors carry a JSON { error } body; a missing file is 404 on both platforms
+                let detail = '';
+                try {
+                    detail = (await response.json()).error || '';
+                } catch (e) {}
+                throw new Error(`read_bytes failed: HTTP ${response.status}${detail ? ` (${detail})` : ''}`);
+            }
+            return new Uint8Array(await response.arrayBuffer());
+        },
+
+        // Writes a Blob, ArrayBuffer, typed array or string; resolves to { success, path, byte_size }
+        async write(path, data, writeBehind = false) {
+            const params = new URLSearchParams({ path, write_behind: writeBehind ? '1' : '0' });
+            let url;
+            let method;
+            if (isMobileServer) {
+                url = `http://127.0.0.1:5000/api/write_bytes?${params}`;
+                method = 'POST';
+            } else {
+                const channel = await getByteChannel();
+                params.set('token', channel.token);
+                url = `${channel.url}?${params}`;
+                method = 'PUT';
+            }
+            const response = await fetch(url, {
+                method,
+                headers: { 'Content-Type': 'application/octet-stream' },
+                body: toByteBody(data)
+            });
+            if (!response.ok) {
+                throw new Error(`write_bytes failed: HTTP ${response.status}`);
+            }
+            return await response.json();
+        }
+    };
+    
+    // Every bridge call gets a deadline. When it passes, the promise rejects and cancel_call tells
+    // the backend to stop (long loops check the call token, subprocesses are terminated).
+    // Operations that legitimately run long get a longer deadline; jobs (start_copy...) return at once.
+    const CALL_TIMEOUT_MS = 30000;
+    const LONG_CALL_TIMEOUT_MS = 10 * 60 * 1000;
+    const LONG_CALL_METHODS = new Set([
+        'copy_item', 'move_item', 'delete_directory', 'bulk_delete', 'bulk_move', 'bulk_copy',
+        'call_app_function', 'get_file_data_url'
+    ]);
+    const NO_DEADLINE_METHODS = new Set(['call_with_deadline', 'cancel_call']);
+    let callCounter = 0;
+
+    function nextCallId() {
+        return `${Date.now().toString(36)}-${++callCounter}`;
+    }
+
+    function callTimeoutMs(method) {
+        if (NO_DEADLINE_METHODS.has(method)) {
+            return null;
+        }
+        return LONG_CALL_METHODS.has(method) ? LONG_CALL_TIMEOUT_MS : CALL_TIMEOUT_MS;
+    }
+
+    function withDeadline(promise, callId, method, timeoutMs, cancel) {
+        if (!timeoutMs) {
+            return promise;
+        }
+        let timer = null;
+        const expired = new Promise((resolve, reject) => {
+            timer = setTimeout(() => {
+                Promise.resolve().then(() => cancel(callId)).catch(() => {});
+                reject(new Error(`${method} timed out after ${timeoutMs} ms`));
+            }, timeoutMs);
+        });
+        return Promise.race([promise, expired]).finally(() => clearTimeout(timer));
+    }
+
+    // Desktop: pywebview calls js_api methods directly, so route each one through
+    // call_with_deadline under a fresh id that cancel_call can reach
+    function installDesktopDeadlines() {
+        const api = window.pywebview && window.pywebview.api;
+        if (!api || api.__sanctumDeadlines || typeof api.call_with_deadline !== 'function') {
+            return;
+        }
+        const callWithDeadline = api.call_with_deadline.bind(api);
+        const cancelCall = api.cancel_call.bind(api);
+        Object.keys(api).forEach((method) => {
+            if (typeof api[method] !== 'function' || NO_DEADLINE_METHODS.has(method)) {
+                return;
+            }
+            api[method] = function(...args) {
+                const callId = nextCallId();
+                const timeoutMs = callTimeoutMs(method);
+                return withDeadline(callWithDeadline(callId, timeoutMs, method, args), callId, method, timeoutMs, cancelCall);
+            };
+        });
+        api.__sanctumDeadlines = true;
+    }
+
+    window.sanctumDeadlines = { install: installDesktopDeadlines };
     
     function checkAndInitialize() {
         checkCount++;
@@ -29,6 +175,7 @@
                     const testResult = window.pywebview.api.get_apps();
                     if (testResult !== undefined) {
                         console.log('Desktop pywebview detected, skipping mobile bridge');
+                        installDesktopDeadlines();
                         return;
                     }
                 } catch (e) {
@@ -52,25 +199,136 @@
             api: {}
         };
         
-        async function callAPI(method, ...args) {
+        // Calls made within BATCH_DELAY_MS of each other go out as one POST /api/_batch.
+        // The backend runs them side by side and streams back one [callId, result, error]
+        // line per call as each finishes, so a slow call doesn't hold back the rest.
+        const BATCH_DELAY_MS = 4;
+        const BATCH_MAX_CALLS = 32;
+        // Streamed results (DataUrlStream or bytes) and cancellation always get their own request.
+        // A streamed result that reaches a batch anyway is retried on its own with a warning
+        const UNBATCHED_METHODS = new Set(['get_file_data_url', 'get_wallpaper_data', 'read_bytes', 'cancel_call']);
+        let queuedCalls = [];
+        let batchTimer = null;
+
+        async function postCall(call) {
+            const response = await fetch(`http://127.0.0.1:5000/api/${call.method}`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    call_id: call.callId,
+                    timeout_ms: call.timeoutMs,
+                    args: call.args,
+                    kwargs: {}
+                })
+            });
+            
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            
+            return await response.json();
+        }
+
+        async function postBatch(calls) {
+            const waiting = new Map(calls.map(call => [call.callId, call]));
+            const settle = (line) => {
+                if (!line.trim()) {
+                    return;
+                }
+                const [callId, result, error, retry] = JSON.parse(line);
+                const call = waiting.get(callId);
+                if (!call) {
+                    return;
+                }
+                waiting.delete(callId);
+                if (retry === 'unbatched') {
+                    console.warn(`${call.method} returns a stream; add it to UNBATCHED_METHODS`);
+                    postCall(call).then(call.resolve, call.reject);
+                } else if (error) {
+                    call.reject(new Error(error));
+                } else {
+                    call.resolve(result);
+                }
+            };
+
             try {
-                const response = await fetch(`http://127.0.0.1:5000/api/${method}`, {
+                const response = await fetch('http://127.0.0.1:5000/api/_batch', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json',
                     },
                     body: JSON.stringify({
-                        args: args,
-                        kwargs: {}
+                        calls: calls.map(call => ({ call_id: call.callId, timeout_ms: call.timeoutMs, method: call.method, args: call.args }))
                     })
                 });
-                
                 if (!response.ok) {
                     throw new Error(`HTTP error! status: ${response.status}`);
                 }
-                
-                const result = await response.json();
-                return result;
+
+                if (response.body && typeof response.body.getReader === 'function') {
+                    // A result can span several reads; keep the partial line until its newline arrives
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let pending = '';
+                    while (true) {
+                        const { done, value } = await reader.read();
+                        if (done) {
+                            break;
+                        }
+                        pending += decoder.decode(value, { stream: true });
+                        let newline;
+                        while ((newline = pending.indexOf('\n')) !== -1) {
+                            settle(pending.slice(0, newline));
+                            pending = pending.slice(newline + 1);
+                        }
+                    }
+                    settle(pending + decoder.decode());
+                } else {
+                    (await response.text()).split('\n').forEach(settle);
+                }
+            } catch (error) {
+                waiting.forEach(call => call.reject(error));
+                waiting.clear();
+                return;
+            }
+            waiting.forEach(call => call.reject(new Error('Batched response ended without a result')));
+        }
+
+        function flushQueuedCalls() {
+            if (batchTimer) {
+                clearTimeout(batchTimer);
+                batchTimer = null;
+            }
+            const calls = queuedCalls;
+            queuedCalls = [];
+            if (calls.length === 1) {
+                postCall(calls[0]).then(calls[0].resolve, calls[0].reject);
+            } else if (calls.length > 1) {
+                postBatch(calls);
+            }
+        }
+
+        async function callAPI(method, ...args) {
+            // Every call carries an id and a deadline so the backend can track and cancel it
+            const call = { callId: nextCallId(), method, args, timeoutMs: callTimeoutMs(method) };
+            const cancel = (callId) => postCall({ callId: nextCallId(), method: 'cancel_call', args: [callId], timeoutMs: null });
+            try {
+                if (UNBATCHED_METHODS.has(method)) {
+                    return await withDeadline(postCall(call), call.callId, method, call.timeoutMs, cancel);
+                }
+                const queued = new Promise((resolve, reject) => {
+                    call.resolve = resolve;
+                    call.reject = reject;
+                    queuedCalls.push(call);
+                    if (queuedCalls.length >= BATCH_MAX_CALLS) {
+                        flushQueuedCalls();
+                    } else if (!batchTimer) {
+                        batchTimer = setTimeout(flushQueuedCalls, BATCH_DELAY_MS);
+                    }
+                });
+                return await withDeadline(queued, call.callId, method, call.timeoutMs, cancel);
             } catch (error) {
                 console.error(`Error calling ${method}:`, error);
                 throw error;
@@ -78,19 +336,20 @@
         }
         
         const apiMethods = [
-            'js_log',
+            'js_log', 'js_log_batch', 'get_js_log_config', 'set_js_log_level', 'get_bridge_stats',
             'launch_app', 'stop_app', 'get_apps', 'get_running_apps', 'refresh_apps',
-            'send_notification', 'delete_notification', 'get_notifications', 'clear_all_notifications',
-            'display_error', 'get_error',
-            'list_directory', 'read_file', 'write_file', 'delete_file', 'delete_directory',
-            'create_directory', 'create_file', 'rename_item', 'move_item', 'copy_item',
-            'get_metadata', 'get_file_info', 'get_file_data_url', 'exists', 'get_storage_path',
-            'get_fonts', 'get_version', 'get_wallpaper', 'get_wallpaper_data',
+            'send_notification', 'delete_notification', 'get_notifications', 'get_notification_stats', 'clear_all_notifications',
+            'display_error', 'get_error', 'get_logs', 'set_log_level', 'get_log_stats',
+            'list_directory', 'list_directory_page', 'get_listing_cache_stats', 'get_folder_size', 'get_folder_size_stats', 'watch_directory', 'unwatch_directory', 'get_watch_status', 'search_files', 'add_index_root', 'remove_index_root', 'get_index_status', 'start_copy', 'start_move', 'start_delete', 'get_job', 'list_jobs', 'pause_job', 'resume_job', 'cancel_job', 'read_file', 'write_file', 'flush_writes', 'get_write_stats', 'get_file_hash', 'get_file_hashes', 'get_hash_stats', 'get_thumbnail', 'get_thumbnails', 'cancel_thumbnails', 'get_thumbnail_stats', 'delete_file', 'delete_directory',
+            'create_directory', 'create_file', 'rename_item', 'move_item', 'copy_item', 'bulk_delete', 'bulk_move', 'bulk_copy',
+            'get_metadata', 'get_file_info', 'get_file_data_url', 'get_data_url_stats', 'exists', 'get_storage_path',
+            'get_fonts', 'get_font_manifest', 'get_font_stats', 'get_version', 'get_wallpaper', 'get_wallpaper_data', 'get_scaled_wallpaper', 'get_wallpaper_stats',
             'get_day_gradient', 'get_fullscreen',
             'get_settings', 'set_wallpaper', 'set_day_gradient', 'set_fullscreen',
-            'set_font', 'set_updates', 'set_logo', 'set_ui_scale', 'set_notification_bind', 'set_command_palette_bind', 'set_apps_per_ring', 'set_reduce_graphics', 'set_color_theme', 'get_available_update', 'open_external_url',
+            'set_font', 'set_updates', 'set_logo', 'set_ui_scale', 'set_notification_bind', 'set_command_palette_bind', 'set_apps_per_ring', 'set_reduce_graphics', 'set_color_theme', 'set_settings', 'flush_settings', 'get_available_update', 'open_external_url',
             'get_file_processor_support',
-            'fuzzy_search_apps', 'call_app_function'
+            'fuzzy_search_apps', 'call_app_function',
+            'cancel_call', 'call_with_deadline'
         ];
         
         apiMethods.forEach(method => {
@@ -98,6 +357,10 @@
                 return await callAPI(method, ...args);
             };
         });
+
+        // Binary transfers bypass JSON entirely
+        window.pywebview.api.read_bytes = window.sanctumBytes.read;
+        window.pywebview.api.write_bytes = window.sanctumBytes.write;
         
         // Override launch_app to handle script injection on mobile
         window.pywebview.api.launch_app = async function(...args) {
@@ -0,0 +1,108 @@
+################################################################################
+# Mobile bridge batching benchmark for Sanctum Station
+# Compares one HTTP POST per API call with batched POST /api/_batch requests
+# The server below follows APIHandler.do_POST/handle_batch in the Android app
+# Usage: python benchmarks/bridge_batching.py [--calls 2000] [--batch 32] [--connections 6]
+################################################################################
+
+import argparse
+import concurrent.futures
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+import backend
+
+file_manager = backend.FileManagerAPI()
+
+
+def dispatch(method, args):
+    if method == "exists":
+        return file_manager.exists(*args)
+    raise ValueError(f"Unknown method: {method}")
+
+
+class BenchHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        method = self.path[5:]
+        request_data = json.loads(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+        if method == "_batch":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            backend.run_bridge_batch(
+                request_data["calls"], dispatch,
+                lambda call_id, result, error: self.wfile.write((json.dumps([call_id, result, error]) + "\n").encode("utf-8"))
+            )
+            return
+        result = backend.run_bridge_call(request_data.get("call_id"), None, dispatch, method, request_data.get("args", []))
+        body = json.dumps(result).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def post(port, path, payload):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    try:
+        connection.request("POST", path, json.dumps(payload), {"Content-Type": "application/json"})
+        return connection.getresponse().read()
+    finally:
+        connection.close()
+
+
+def run(label, requests, port, connections, calls):
+    # Browsers open about six connections per host, so requests beyond that wait their turn
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=connections) as pool:
+        list(pool.map(lambda request: post(port, *request), requests))
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {len(requests):6d} requests  {elapsed / calls * 1e6:9.1f} us/call")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched bridge requests.")
+    parser.add_argument("--calls", type=int, default=2000, help="API calls per case")
+    parser.add_argument("--batch", type=int, default=32, help="Calls per batched request (mobile_bridge.js BATCH_MAX_CALLS)")
+    parser.add_argument("--connections", type=int, default=6, help="Requests in flight at once")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BenchHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    with tempfile.TemporaryDirectory(prefix="bridge-bench-") as scratch:
+        calls = [
+            {"call_id": f"c{index}", "method": "exists", "args": [os.path.join(scratch, str(index))]}
+            for index in range(args.calls)
+        ]
+        print(f"{args.calls} exists() calls over loopback HTTP:")
+        single = run(
+            "one POST per call (before)",
+            [(f"/api/{call['method']}", {"call_id": call["call_id"], "args": call["args"]}) for call in calls],
+            port, args.connections, args.calls
+        )
+        batched = run(
+            f"/api/_batch x{args.batch} (after)",
+            [("/api/_batch", {"calls": calls[start:start + args.batch]}) for start in range(0, len(calls), args.batch)],
+            port, args.connections, args.calls
+        )
+        print(f"  speedup: {single / batched:.1f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
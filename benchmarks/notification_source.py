@@ -0,0 +1,98 @@
+################################################################################
+# Notification source attribution benchmark for Sanctum Station
+# Compares the old inspect.stack() lookup with the context variable and frame walk
+# Usage: python benchmarks/notification_source.py [--depths 10,50,200] [--calls 2000]
+################################################################################
+
+import argparse
+import inspect
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+import backend
+
+APP_SOURCE = """
+def nested(depth, func):
+    if depth <= 0:
+        return func()
+    return nested(depth - 1, func)
+"""
+
+
+# Loads a stand-in app module the same way launch_app does (named app_<id>, backed by a file)
+def load_bench_app(scratch):
+    path = os.path.join(scratch, "app.py")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(APP_SOURCE)
+    module = types.ModuleType("app_Bench")
+    module.__file__ = path
+    sys.modules[module.__name__] = module
+    exec(compile(APP_SOURCE, path, "exec"), module.__dict__)
+    return module
+
+
+# The lookup NotificationManagerAPI._resolve_source did before the context variable
+def resolve_with_inspect_stack():
+    for frame_info in inspect.stack():
+        frame_module = inspect.getmodule(frame_info.frame)
+        if frame_module and hasattr(frame_module, '__name__'):
+            module_name = frame_module.__name__
+            if module_name.startswith("app_"):
+                return module_name[4:]
+    return "Unknown"
+
+
+def timed(label, func, calls):
+    expected = func()
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<36} {elapsed / calls * 1e6:10.2f} us/call  ({expected})")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark notification source attribution.")
+    parser.add_argument("--depths", default="10,50,200", help="Comma-separated app stack depths")
+    parser.add_argument("--calls", type=int, default=2000, help="Lookups per case")
+    args = parser.parse_args()
+
+    resolver = backend.NotificationManagerAPI()._resolve_source
+    with tempfile.TemporaryDirectory(prefix="notify-bench-") as scratch:
+        app = load_bench_app(scratch)
+        for depth in (int(value) for value in args.depths.split(",")):
+            print(f"Stack depth {depth} inside the app:")
+            # Every case pays for building the stack; subtract it to compare the lookups alone
+            stack_only = timed("building the stack only", lambda: app.nested(depth, lambda: "-"), args.calls)
+            slow_calls = max(1, args.calls // 20)
+            baseline = timed("inspect.stack() (old)", lambda: app.nested(depth, resolve_with_inspect_stack), slow_calls)
+            context = timed(
+                "context variable (call_app_function)",
+                lambda: backend.run_as_app("Bench", app.nested, depth, resolver), args.calls
+            )
+
+            # App-spawned threads have no context, so the frame walk fallback is used
+            results = {}
+            def in_thread():
+                results["walk"] = timed("frame walk (app-spawned thread)", lambda: app.nested(depth, resolver), args.calls)
+            thread = threading.Thread(target=in_thread)
+            thread.start()
+            thread.join()
+
+            def lookup_cost(elapsed, calls):
+                return max(elapsed / calls - stack_only / args.calls, 1e-9)
+            old_cost = lookup_cost(baseline, slow_calls)
+            print(
+                f"  lookup only: {old_cost * 1e6:.1f} us (old), {lookup_cost(context, args.calls) * 1e6:.2f} us (context), "
+                f"{lookup_cost(results['walk'], args.calls) * 1e6:.2f} us (frame walk)"
+            )
+
+
+if __name__ == "__main__":
+    main()
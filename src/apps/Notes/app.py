@@ -16,7 +16,7 @@ def save_note(title, content):
     
     try:
         file_path = f"notes/{title}.md"
-        success = file_api.write_file(file_path, content)
+        success = file_api.write_file(file_path, content, write_behind=True)
         if success:
             return {"success": True}
         else:
@@ -47,7 +47,7 @@ def save_board(name, data):
         json_content = json.dumps(data)
         
         # Write to file
-        success = file_api.write_file(file_path, json_content)
+        success = file_api.write_file(file_path, json_content, write_behind=True)
         
         if success:
             return {"success": True}
@@ -6,17 +6,39 @@
 import json
 import os
 import base64
+import binascii
 import threading
 import importlib.util
 import sys
 import time
 import inspect
+import functools
 import concurrent.futures
 import mimetypes
 import uuid
 import queue
 import webbrowser
-from urllib.parse import urlparse
+import contextvars
+import shutil
+import subprocess
+import fnmatch
+import re
+import collections
+import itertools
+import errno
+import atexit
+import sqlite3
+import secrets
+import hashlib
+import ctypes
+import ctypes.util
+import select
+import stat
+import struct
+import math
+from urllib.parse import urlparse, parse_qs, quote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from fuzzywuzzy import fuzz
 from fuzzywuzzy import process as fuzzy_process
 
 sys.modules.setdefault("backend", sys.modules[__name__])
@@ -35,6 +57,7 @@ if IS_MOBILE:
     # Force pure Python implementation on mobile
     from yaml import SafeLoader, SafeDumper
     yaml_loader = SafeLoader
+    yaml_dumper = SafeDumper
     print("Using pure Python YAML loader for mobile")
 else:
     # Try to use C loader on desktop for speed, fall back to pure Python
@@ -44,6 +67,10 @@ else:
     except ImportError:
         from yaml import SafeLoader as yaml_loader
         print("Using pure Python YAML loader")
+    try:
+        from yaml import CSafeDumper as yaml_dumper
+    except ImportError:
+        from yaml import SafeDumper as yaml_dumper
     
     # Import psutil
     import psutil
@@ -56,8 +83,100 @@ except ImportError:
     REQUESTS_AVAILABLE = False
     print("Warning: requests library not available, update checking disabled")
 
+# Import Pillow (optional, needed for image thumbnails and display proxies)
+try:
+    from PIL import Image
+    import image_render
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+    print("Warning: Pillow not available, image thumbnails disabled")
+
+# Import fontTools with brotli (optional, needed for WOFF2 font compression)
+try:
+    from fontTools.ttLib import woff2
+    import brotli  # noqa: F401 (fontTools needs it for WOFF2)
+    WOFF2_AVAILABLE = True
+except ImportError:
+    WOFF2_AVAILABLE = False
+
 MAX_ERROR_LOG_SIZE = 2 * 1024 * 1024  # 2 MB
+BRIDGE_BATCH_WORKERS = 16  # Threads running the calls of a batched bridge request side by side
+ERROR_LOG_FLUSH_SECONDS = 1.0  # Error log lines are appended in one write this long after the first is queued
+LOG_APPENDER_MAX_PENDING = 10000  # Lines a log appender holds while its file can't be written; older ones are dropped
+LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}  # Log levels by severity
+LOG_LEVEL = "info"  # Lowest level recorded; "debug" adds per-call messages from hot paths such as launch_app and init_apps
+LOG_BUFFER_SIZE = 2000  # Recent log records kept in memory for get_logs
+LOG_PAGE_SIZE = 200  # Default number of records returned by get_logs
+LOG_FILE_MAX_SIZE = 2 * 1024 * 1024  # sanctum_log.txt is rotated to old_sanctum_log.txt past this
+LOG_FLUSH_SECONDS = 0.2  # Log lines are printed and appended in one write this long after the first is queued
+JS_LOG_LEVEL = "info"  # Lowest frontend console level sent to the backend ("info" covers console.log)
+JS_LOG_FLUSH_MS = 1000  # The frontend sends buffered console lines this often...
+JS_LOG_BATCH_MAX = 50  # ...or once this many are buffered, and right away after an error
+JS_LOG_BATCH_LIMIT = 500  # Records accepted from a single js_log_batch call; the rest are counted as dropped
 MAX_FILE_DATA_URL_BYTES = 100 * 1024 * 1024  # 100 MB
+LIST_DIRECTORY_PAGE_SIZE = 500  # Default page size for list_directory_page
+LIST_DIRECTORY_MAX_PAGE_SIZE = 5000  # Upper bound for a single list_directory_page call
+LISTING_CACHE_MAX_ENTRIES = 200000  # Total directory entries kept in the listing cache
+LISTING_CACHE_RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000  # Skip caching directories changed in the last 2 s
+FILE_INDEX_DB_NAME = "file_index.db"  # sqlite filename index, stored in DATA_DIR
+FILE_INDEX_RESCAN_INTERVAL_SECONDS = 300  # Periodic mtime rescan of the indexed roots
+FILE_INDEX_COMMIT_ROWS = 5000  # Rows written per index transaction during scans
+FILE_INDEX_SEARCH_LIMIT = 50  # Default number of search_files results
+FILE_INDEX_MAX_SEARCH_LIMIT = 500  # Upper bound for a single search_files call
+FILE_INDEX_FUZZY_CANDIDATES = 400  # Trigram candidates rescored when looking for fuzzy matches
+FILE_INDEX_TRIGRAM_POSTINGS = 5000  # Rows read per query trigram when gathering fuzzy candidates
+COPY_CHUNK_BYTES = 8 * 1024 * 1024  # Bytes per copy_file_range/sendfile call (also the cancellation granularity)
+COPY_BUFFER_BYTES = 1024 * 1024  # Reused per-thread readinto buffer for the portable copy fallback
+WRITE_BEHIND_DELAY_SECONDS = 1.0  # Write-behind data is flushed this long after its first write
+WRITE_BEHIND_MAX_PENDING_BYTES = 32 * 1024 * 1024  # Flush early once this much write-behind data is pending
+WRITE_BEHIND_RETRY_MAX_SECONDS = 30  # Data that failed to write is retried after a delay that doubles up to this
+WRITE_STATS_WINDOW_SECONDS = 60  # Window for the writes-saved-per-second figure
+FILE_JOB_MAX_CONCURRENT = 2  # File jobs running at once; later jobs wait in the queue
+FILE_JOB_WORKERS = 4  # Shared worker pool that copies small files in parallel
+FILE_JOB_SMALL_FILE_BYTES = 1024 * 1024  # Files below this size are copied on the worker pool
+FILE_JOB_PROGRESS_INTERVAL_SECONDS = 0.25  # Minimum gap between progress events for one job
+FILE_JOB_HISTORY = 100  # Finished jobs kept for get_job/list_jobs
+FOLDER_SIZE_MAX_ENTRIES = 200000  # Directories whose recursive sizes are kept in memory
+FOLDER_SIZE_REVALIDATE_SECONDS = 30  # Listed folder sizes older than this are rechecked in the background
+HASH_DB_NAME = "file_hashes.db"  # Persistent content hash cache, stored in DATA_DIR
+HASH_DEFAULT_ALGORITHM = "blake2b"  # Default algorithm for get_file_hash/get_file_hashes
+HASH_CHUNK_BYTES = 4 * 1024 * 1024  # Bytes read per hashlib update
+HASH_WORKERS = 4  # Threads hashing cache misses in parallel
+HASH_CACHE_MAX_ENTRIES = 200000  # Cached digests kept before the least recently used are pruned
+THUMBNAIL_DIR_NAME = "thumbnails"  # On-disk thumbnail and display proxy cache, stored in DATA_DIR
+THUMBNAIL_SIZES = {"thumb": 256, "proxy": 1920}  # Longest edge in pixels for each thumbnail size
+THUMBNAIL_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Thumbnail cache is trimmed back below this, least recently used first
+THUMBNAIL_WORKERS = 2  # Decoder processes (threads on mobile)
+THUMBNAIL_JPEG_QUALITY = 85  # JPEG quality for opaque thumbnails and proxies
+WALLPAPER_SIZE_STEP = 256  # Wallpapers are rendered for the screen size rounded up to this step, so small resizes reuse them
+WALLPAPER_MAX_EDGE = 7680  # Largest wallpaper rendition
+FONT_CACHE_DIR_NAME = "fonts"  # WOFF2 copies of the configured fonts, stored in DATA_DIR
+FONT_FAMILY = "Inter"  # Family name the configured font weights are registered under
+FS_WATCH_DEBOUNCE_SECONDS = 0.2  # Filesystem events are flushed once a directory has been quiet this long
+FS_WATCH_MAX_DELAY_SECONDS = 1.0  # ...or at the latest this long after the first event
+FS_WATCH_POLL_SECONDS = 2.0  # Polling interval where inotify is unavailable
+FS_WATCH_POLL_MAX_ENTRIES = 5000  # Larger directories are only compared by polling when their mtime changes
+FS_WATCH_MAX_WATCHES = 64  # Oldest subscriptions are dropped beyond this
+BULK_OPERATION_WORKERS = 4  # Items handled in parallel by bulk_delete, bulk_move and bulk_copy
+DATA_URL_CHUNK_BYTES = 3 * 1024 * 1024  # Bytes base64-encoded per step; a multiple of 3 so chunk encodings join cleanly
+DATA_URL_MEMORY_BUDGET_BYTES = (96 if IS_MOBILE else 512) * 1024 * 1024  # Data URL encodings wait while this much memory is in use
+SETTINGS_SAVE_DELAY_SECONDS = 0.5  # settings.yaml is written once changes have stopped for this long
+SETTINGS_SAVE_RETRY_MAX_SECONDS = 30  # A failed save is retried after a delay that doubles up to this
+SETTINGS_SAVE_MAX_RETRIES = 5  # Background retries after a failed save; later changes or flush() try again
+NOTIFICATION_STORE_MAX = 500  # Notifications kept in memory; older ones are evicted past this
+NOTIFICATION_EVICTION = "source"  # "source" evicts the oldest entry of the app with the most entries, "oldest" the oldest overall
+NOTIFICATION_CHANGELOG_MAX = 1000  # Changes kept for get_notifications(since_cursor); older cursors get a full page
+NOTIFICATION_PAGE_SIZE = 100  # Default page size for get_notifications
+NOTIFICATION_MAX_PAGE_SIZE = 1000  # Upper bound for a single get_notifications call
+NOTIFICATION_JOURNAL_NAME = "notifications.jsonl"  # Append-only notification journal, stored in DATA_DIR
+NOTIFICATION_JOURNAL_DELAY_SECONDS = 0.25  # Journal records are appended in one write this long after the first is queued
+NOTIFICATION_JOURNAL_COMPACT_RECORDS = 2000  # Rewrite the journal once it holds this many dead records (and more dead than live)
+NOTIFICATION_COALESCE_SECONDS = 300  # A repeat of a source's message within this long raises the earlier entry's count instead
+NOTIFICATION_RATE_PER_SECOND = 2.0  # New notifications per second a source can keep sending
+NOTIFICATION_RATE_BURST = 10  # New notifications a source can send at once before it is rate limited
+NOTIFICATION_EVENT_BATCH_SECONDS = 0.1  # Events within this long of the last one sent go out together as notifications-batch
+NOTIFICATION_EVENT_BATCH_MAX = 50  # Events listed in one notifications-batch; older ones in the batch are only counted
 
 # Get the base directory (where backend.py is located)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -100,6 +219,10 @@ SUPPORTED_FONT_KEYS = {
     "black_font", "extra_bold_font", "bold_font", "semi_bold_font",
     "medium_font", "regular_font", "light_font", "extra_light_font", "thin_font"
 }
+FONT_WEIGHTS = {
+    "black_font": 900, "extra_bold_font": 800, "bold_font": 700, "semi_bold_font": 600,
+    "medium_font": 500, "regular_font": 400, "light_font": 300, "extra_light_font": 200, "thin_font": 100
+}
 
 
 def open_external_url(url):
@@ -166,6 +289,362 @@ else:
     import webview
     print("Running on desktop platform")
 
+# Raised inside a bridge call once it has been cancelled or has passed its deadline
+class CallCancelledError(Exception):
+    pass
+
+# Tracks cancellation state, deadline and child processes for one bridge call
+class CallToken:
+    def __init__(self, call_id, timeout_ms=None):
+        self.call_id = str(call_id)
+        self.deadline = None
+        if timeout_ms is not None:
+            try:
+                timeout_value = float(timeout_ms)
+                if timeout_value > 0:
+                    self.deadline = time.monotonic() + timeout_value / 1000.0
+            except (TypeError, ValueError):
+                pass
+        self._cancelled = threading.Event()
+        self._processes = []
+        self._lock = threading.Lock()
+
+    # Marks the call as cancelled and terminates any attached subprocesses
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            _terminate_process(process)
+
+    def is_cancelled(self):
+        if self._cancelled.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self._cancelled.set()
+            return True
+        return False
+
+    def check(self):
+        if self.is_cancelled():
+            raise CallCancelledError(f"Call {self.call_id} was cancelled")
+
+    def attach_process(self, process):
+        with self._lock:
+            self._processes.append(process)
+        if self._cancelled.is_set():
+            _terminate_process(process)
+
+    def detach_process(self, process):
+        with self._lock:
+            if process in self._processes:
+                self._processes.remove(process)
+
+_call_tokens = {} # Active bridge calls by call id
+_call_tokens_lock = threading.Lock()
+_current_call_token = contextvars.ContextVar("sanctum_call_token", default=None)
+_current_app_id = contextvars.ContextVar("sanctum_app_id", default=None)
+
+def _terminate_process(process, grace_seconds=2.0):
+    try:
+        if process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=grace_seconds)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    except Exception as e:
+        print(f"CT: Failed to terminate process: {e}")
+
+# Returns the token of the bridge call running in the current context (or None)
+def get_call_token():
+    return _current_call_token.get()
+
+# Returns the id of the app whose code is running in the current context (or None)
+def get_current_app():
+    return _current_app_id.get()
+
+# Runs func as code of app_id, so backend calls it makes (e.g. send_notification) are attributed to it
+def run_as_app(app_id, func, *args, **kwargs):
+    context_token = _current_app_id.set(app_id)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _current_app_id.reset(context_token)
+
+# Returns True when the current bridge call was cancelled or passed its deadline
+def is_call_cancelled():
+    token = _current_call_token.get()
+    return bool(token and token.is_cancelled())
+
+# Raises CallCancelledError when the current bridge call should stop
+# Long-running backend and app code should call this cooperatively
+def check_cancelled():
+    token = _current_call_token.get()
+    if token is not None:
+        token.check()
+
+# Runs func as a bridge call that can be cancelled by id or by deadline
+# Returns the function result, or a cancelled result dict
+def run_bridge_call(call_id, timeout_ms, func, *args, **kwargs):
+    if call_id is None or str(call_id) == "":
+        call_id = uuid.uuid4().hex
+    token = CallToken(call_id, timeout_ms)
+    with _call_tokens_lock:
+        _call_tokens[token.call_id] = token
+    context_token = _current_call_token.set(token)
+    try:
+        return func(*args, **kwargs)
+    except CallCancelledError as e:
+        print(f"CT: {e}")
+        return {"success": False, "cancelled": True, "call_id": token.call_id, "error": "Call cancelled."}
+    finally:
+        _current_call_token.reset(context_token)
+        with _call_tokens_lock:
+            if _call_tokens.get(token.call_id) is token:
+                del _call_tokens[token.call_id]
+
+# Wraps every public method of a js_api class so each call runs under a call token
+# Calls that come through call_with_deadline already have a token (with the caller's id and deadline)
+def bridge_methods(cls, exclude=("call_with_deadline", "cancel_call")):
+    for name, func in list(vars(cls).items()):
+        if name.startswith("_") or name in exclude or not callable(func):
+            continue
+        setattr(cls, name, _bridge_method(func))
+    return cls
+
+def _bridge_method(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current_call_token.get() is not None:
+            return func(*args, **kwargs)
+        return run_bridge_call(None, None, func, *args, **kwargs)
+    # pywebview reads parameter names without following __wrapped__
+    wrapper.__signature__ = inspect.signature(func)
+    return wrapper
+
+# Cancels a running bridge call by its id
+def cancel_call(call_id):
+    with _call_tokens_lock:
+        token = _call_tokens.get(str(call_id))
+    if token is None:
+        return {"success": False, "error": "Call not found or already finished."}
+    token.cancel()
+    return {"success": True, "call_id": token.call_id}
+
+# Runs the calls of one batched bridge request side by side and reports each result as it finishes
+# calls are {"call_id", "method", "args", "timeout_ms"} dicts. dispatch(method, args) runs one call
+# and write(call_id, result, error) is called on the caller's thread in completion order, so a slow
+# call never holds back the others. If write raises (the client went away), unfinished calls are cancelled
+class BridgeBatchRunner:
+    def __init__(self, workers=BRIDGE_BATCH_WORKERS):
+        # Worker threads are started on first use
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="BridgeBatch")
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "batched_calls": 0, "largest_batch": 0, "abandoned_calls": 0}
+
+    # Counts a request that carried a single call, for the calls-per-request figure
+    def note_single_call(self):
+        with self._lock:
+            self._stats["requests"] += 1
+
+    def run(self, calls, dispatch, write):
+        futures = {}
+        for call in calls:
+            call_id = str(call.get("call_id") or uuid.uuid4().hex)
+            future = self._executor.submit(
+                run_bridge_call, call_id, call.get("timeout_ms"), dispatch, call.get("method"), call.get("args") or []
+            )
+            futures[future] = call_id
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["batches"] += 1
+            self._stats["batched_calls"] += len(futures)
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(futures))
+
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, str(e)
+                write(futures[future], result, error)
+        except Exception:
+            abandoned = 0
+            for future, call_id in futures.items():
+                if not future.done():
+                    future.cancel()
+                    cancel_call(call_id)
+                    abandoned += 1
+            with self._lock:
+                self._stats["abandoned_calls"] += abandoned
+            raise
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        calls = stats["requests"] - stats["batches"] + stats["batched_calls"]
+        stats["calls"] = calls
+        stats["calls_per_request"] = (calls / stats["requests"]) if stats["requests"] else 0.0
+        return stats
+
+_bridge_batches = BridgeBatchRunner()
+
+# Runs a batched bridge request; see BridgeBatchRunner.run
+def run_bridge_batch(calls, dispatch, write):
+    return _bridge_batches.run(calls, dispatch, write)
+
+def get_bridge_batch_stats():
+    return _bridge_batches.stats()
+
+# Runs a subprocess that is terminated when the current bridge call is cancelled
+# Returns a subprocess.CompletedProcess like subprocess.run(capture_output=True)
+def run_cancellable_subprocess(command, text=True, poll_interval=0.1):
+    token = _current_call_token.get()
+    if token is not None:
+        token.check()
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text)
+    if token is not None:
+        token.attach_process(process)
+    try:
+        while True:
+            try:
+                stdout, stderr = process.communicate(timeout=poll_interval)
+                break
+            except subprocess.TimeoutExpired:
+                if token is not None and token.is_cancelled():
+                    _terminate_process(process)
+                    process.communicate()
+                    raise CallCancelledError(f"Call {token.call_id} was cancelled")
+    finally:
+        if token is not None:
+            token.detach_process(process)
+
+    if token is not None:
+        token.check()
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+# copy_file_range/sendfile errors that mean "not supported here", so the next method is tried
+_COPY_FALLBACK_ERRNOS = {
+    code for code in (
+        getattr(errno, name, None) for name in
+        ("EXDEV", "ENOSYS", "EINVAL", "EOPNOTSUPP", "ENOTSUP", "EBADF", "ENOTSOCK", "EPERM", "ENODATA")
+    ) if code is not None
+}
+_unsupported_copy_methods = set()  # Methods that failed with ENOSYS and are skipped from then on
+_copy_buffers = threading.local()
+
+def _zero_copy_loop(copy_chunk, method, size, progress, checkpoint):
+    copied = 0
+    try:
+        while True:
+            checkpoint()
+            sent = copy_chunk(copied)
+            if not sent:
+                break
+            copied += sent
+            if progress is not None:
+                progress(sent)
+    except OSError as e:
+        if copied or e.errno not in _COPY_FALLBACK_ERRNOS:
+            raise
+        if e.errno == errno.ENOSYS:
+            _unsupported_copy_methods.add(method)
+        return None
+    # Some filesystems (procfs, sysfs, some FUSE mounts) report 0 bytes for files that have data
+    if copied == 0 and size > 0:
+        return None
+    return copied
+
+# Copies the contents of one open file to another with the fastest path available:
+# os.copy_file_range (in-kernel, reflinks on btrfs/XFS), then os.sendfile, then readinto with a
+# reused buffer. progress(byte_count) runs after each chunk and checkpoint() between chunks
+def _copy_file_contents(source_file, dest_file, progress=None, checkpoint=check_cancelled):
+    source_fd = source_file.fileno()
+    dest_fd = dest_file.fileno()
+    size = os.fstat(source_fd).st_size
+
+    if hasattr(os, "copy_file_range") and "copy_file_range" not in _unsupported_copy_methods:
+        copied = _zero_copy_loop(
+            lambda offset: os.copy_file_range(source_fd, dest_fd, COPY_CHUNK_BYTES),
+            "copy_file_range", size, progress, checkpoint
+        )
+        if copied is not None:
+            return copied
+
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux") and "sendfile" not in _unsupported_copy_methods:
+        copied = _zero_copy_loop(
+            lambda offset: os.sendfile(dest_fd, source_fd, offset, COPY_CHUNK_BYTES),
+            "sendfile", size, progress, checkpoint
+        )
+        if copied is not None:
+            return copied
+
+    buffer = getattr(_copy_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _copy_buffers.buffer = bytearray(COPY_BUFFER_BYTES)
+    view = memoryview(buffer)
+    source_file.seek(0)
+    dest_file.seek(0)
+    copied = 0
+    while True:
+        checkpoint()
+        read = source_file.readinto(buffer)
+        if not read:
+            break
+        dest_file.write(view[:read])
+        copied += read
+        if progress is not None:
+            progress(read)
+    return copied
+
+# shutil.copyfile equivalent built on _copy_file_contents
+def _copy_file(src, dst, progress=None, checkpoint=check_cancelled):
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    with open(src, "rb") as source_file, open(dst, "wb") as dest_file:
+        _copy_file_contents(source_file, dest_file, progress, checkpoint)
+    return dst
+
+# copy2 replacement used by copytree/move: zero-copy where possible, and cancellable between chunks
+def _cancellable_copy2(src, dst, *, follow_symlinks=True):
+    check_cancelled()
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if not follow_symlinks and os.path.islink(src):
+        os.symlink(os.readlink(src), dst)
+    else:
+        try:
+            _copy_file(src, dst)
+        except CallCancelledError:
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+            raise
+    shutil.copystat(src, dst, follow_symlinks=follow_symlinks)
+    return dst
+
+# rmtree replacement that checks for cancellation between entries
+def _cancellable_rmtree(path):
+    if _current_call_token.get() is None:
+        shutil.rmtree(path)
+        return
+
+    for root, dirs, files in os.walk(path, topdown=False):
+        check_cancelled()
+        for name in files:
+            os.remove(os.path.join(root, name))
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            if os.path.islink(dir_path):
+                os.unlink(dir_path)
+            else:
+                os.rmdir(dir_path)
+    os.rmdir(path)
+
 # Handles the initialization of the environment components and apps
 # This initializes both essential and non-essential components
 # Called on startup of the backend
@@ -173,8 +652,12 @@ def initialize():
     global available_update
     if not init_settings():
         print("WARNING: Failed to initialize settings. Using default settings.\n\nWARNING 0")
+    init_notifications()
     if not init_apps():
         print("WARNING: No apps found to initialize. No apps will be loaded.\n\nWARNING 1")
+
+    # Build or refresh the filename index in the background
+    _file_index.start()
     
     # Check for updates
     available_update = check_for_updates()
@@ -190,6 +673,19 @@ def initialize():
         print("Mobile platform detected - skipping webview initialization")
         return True
 
+# Restores notifications from the journal in DATA_DIR
+# Returns True on success, False on failure
+def init_notifications():
+    try:
+        count = _notification_journal.replay(_notifications)
+        print(f"IN: Restored {count} notifications")
+        return True
+    except Exception as e:
+        print(f"NMA-E2: Error reading notification journal: {e}")
+        if webview_window and not IS_MOBILE:
+            webview_window.evaluate_js('displayError("NMA-E2")')
+        return False
+
 # Initializes the environment settings from data/settings.yaml
 # Returns True on success, False on failure
 def init_settings():
@@ -197,8 +693,7 @@ def init_settings():
     try:
         settings_path = os.path.join(DATA_DIR, "settings.yaml")
         print(f"Loading settings from: {settings_path}")
-        with open(settings_path, "r") as file:
-            settings = yaml.load(file, Loader=yaml_loader) or {}
+        settings = _settings_store.load()
         
         if "version" in settings:
             version = settings["version"]
@@ -260,9 +755,9 @@ def init_apps():
         import os
         # Use APPS_DIR which points to writable location on mobile
         app_dir = APPS_DIR
-        print(f"IA: Scanning apps directory: {app_dir}")
+        log_debug("IA", "Scanning apps directory: %s", app_dir)
         dir_contents = sorted(os.listdir(app_dir))
-        print(f"IA: Found {len(dir_contents)} items: {dir_contents}")
+        log_debug("IA", "Found %d items: %s", len(dir_contents), dir_contents)
         for app in dir_contents:
             if os.path.isdir(os.path.join(app_dir, app)):
                 app_path = os.path.join(app_dir, app)
@@ -313,13 +808,13 @@ def init_apps():
                                         if isinstance(mime, str) and mime.strip()
                                     })
                         except Exception as config_error:
-                            print(f"IA: Warning - failed to parse app_config.json for '{app}': {config_error}")
+                            log_warning("IA", "Failed to parse app_config.json for '%s': %s", app, config_error)
 
                     # Use simple relative path from src/ directory
                     icon_url = None
                     if os.path.exists(icon_path):
                         icon_url = f"apps/{app}/icon.png"
-                        print(f"IA: Icon URL for {app}: {icon_url}")
+                        log_debug("IA", "Icon URL for %s: %s", app, icon_url)
                     
                     apps.append({
                         "id": app,
@@ -333,15 +828,15 @@ def init_apps():
                         "app_dir": os.path.abspath(app_path)  # Use absolute path for backend
                     })
                     app_names.append(app_name)
-                    print(f"IA: Added app '{app_name}' (id='{app}') with icon: {icon_url}")
+                    log_debug("IA", "Added app '%s' (id='%s') with icon: %s", app_name, app, icon_url)
                 else:
-                    print(f"IA: App '{app}' missing required files:")
-                    print(f"  App path: {app_path}")
-                    print(f"  app.html exists: {os.path.exists(html_path)} - {html_path}")
-                    print(f"  app.py exists: {os.path.exists(py_path)} - {py_path}")
+                    log_warning(
+                        "IA", "App '%s' missing required files (app.html exists: %s, app.py exists: %s) in %s",
+                        app, os.path.exists(html_path), os.path.exists(py_path), app_path
+                    )
         
-        print(f"IA: Found {len(apps)} valid apps")
-        print(f"IA: Found {len(extension_support)} supported extensions: {list(extension_support.keys())}")
+        log_info("IA", "Found %d valid apps", len(apps))
+        log_debug("IA", "Found %d supported extensions: %s", len(extension_support), list(extension_support.keys()))
         return True
     except FileNotFoundError:
         print("IA-E1: Apps directory not found. No apps will be loaded.")
@@ -368,7 +863,7 @@ def launch_app(app_name, file_path=None):
             break
     
     if not app_info:
-        print(f"LA: App '{app_name}' not found")
+        log_warning("LA", "App '%s' not found", app_name)
         return False
 
     app_id = app_info.get("id", app_name)
@@ -492,20 +987,20 @@ def launch_app(app_name, file_path=None):
         
         # Inject the script directly if webview is available
         inject_via_return = False
-        print(f"LA: webview_window = {webview_window}, IS_MOBILE = {IS_MOBILE}")
+        log_debug("LA", "webview_window = %s, IS_MOBILE = %s", webview_window, IS_MOBILE)
         
         if webview_window and not IS_MOBILE:
             # Desktop: use direct injection via webview.evaluate_js()
-            print(f"LA: Using desktop direct injection")
+            log_debug("LA", "Using desktop direct injection")
             try:
                 webview_window.evaluate_js(inject_script)
-                print(f"LA: Desktop injection successful!")
+                log_debug("LA", "Desktop injection successful")
             except Exception as e:
-                print(f"LA: Error with desktop injection: {e}")
+                log_warning("LA", "Error with desktop injection: %s", e)
                 inject_via_return = True
         else:
             # Mobile: always use fallback method (return script for mobile_bridge.js to execute)
-            print(f"LA: Using mobile fallback injection (returning script to HTTP)")
+            log_debug("LA", "Using mobile fallback injection (returning script to HTTP)")
             inject_via_return = True
         
         # Always load the app module (even if it doesn't have main/run)
@@ -545,14 +1040,14 @@ def launch_app(app_name, file_path=None):
                             "stop_event": None
                         }
             except Exception as e:
-                print(f"LA: Error loading app module: {e}")
+                log_warning("LA", "Error loading app module: %s", e)
                 # Continue anyway, app might still work without backend
         
-        print(f"LA: Successfully launched app '{app_display_name}' (id='{app_id}')")
+        log_info("LA", "Launched app '%s' (id='%s')", app_display_name, app_id)
         
         # Only return the injection script if direct injection failed
         if inject_via_return:
-            print(f"LA: Returning injection script for JavaScript to execute (length: {len(inject_script)} chars)")
+            log_debug("LA", "Returning injection script for JavaScript to execute (%d chars)", len(inject_script))
             return {"success": True, "inject_script": inject_script}
         else:
             return True
@@ -572,6 +1067,8 @@ def launch_app(app_name, file_path=None):
 # Runs the backend script of the app in its own thread
 # Passes a stop_event to signal when to stop
 def run_app_backend(app_name, py_path, app_dir, stop_event, file_path=None):
+    # Threads start with an empty context, so this lasts exactly as long as the app thread
+    _current_app_id.set(app_name)
     try:
         original_cwd = os.getcwd()
         # app_dir is already absolute, so use it directly
@@ -588,7 +1085,7 @@ def run_app_backend(app_name, py_path, app_dir, stop_event, file_path=None):
         elif hasattr(app_module, 'run'):
             _invoke_app_entrypoint(app_module.run, stop_event=stop_event, file_path=file_path)
         
-        print(f"RAB: App '{app_name}' backend finished")
+        log_info("RAB", "App '%s' backend finished", app_name)
         
     except Exception as e:
         print(f"RAB-E1: Error running app '{app_name}' backend: {e}")
@@ -628,13 +1125,15 @@ def _invoke_app_entrypoint(entrypoint, stop_event=None, file_path=None):
 
 # Runs the main/run function of an already-loaded app module in a thread
 def run_app_backend_thread(app_name, app_module, stop_event, file_path=None):
+    # Threads start with an empty context, so this lasts exactly as long as the app thread
+    _current_app_id.set(app_name)
     try:
         if hasattr(app_module, 'main'):
             _invoke_app_entrypoint(app_module.main, stop_event=stop_event, file_path=file_path)
         elif hasattr(app_module, 'run'):
             _invoke_app_entrypoint(app_module.run, stop_event=stop_event, file_path=file_path)
         
-        print(f"RAB: App '{app_name}' backend finished")
+        log_info("RAB", "App '%s' backend finished", app_name)
         
     except Exception as e:
         print(f"RAB-E1: Error running app '{app_name}' backend: {e}")
@@ -646,7 +1145,7 @@ def stop_app(app_name):
     global active_apps
     
     if app_name in active_apps:
-        print(f"SA: Stopping app '{app_name}'")
+        log_info("SA", "Stopping app '%s'", app_name)
         # Signal the app to stop (only if it has a background thread)
         if "stop_event" in active_apps[app_name] and active_apps[app_name]["stop_event"] is not None:
             active_apps[app_name]["stop_event"].set()
@@ -670,6 +1169,7 @@ def init_webview():
         error_manager = ErrorManagerAPI()
         usage_monitor = UsageMonitorAPI()
         
+        @bridge_methods
         class API:
             def launch_app(self, app_name, file_path=None):
                 return launch_app(app_name, file_path)
@@ -695,8 +1195,11 @@ def init_webview():
             def delete_notification(self, notification_id):
                 return notification_manager.delete_notification(notification_id)
             
-            def get_notifications(self):
-                return notification_manager.get_notifications()
+            def get_notifications(self, since_cursor=None, limit=None, before=None):
+                return notification_manager.get_notifications(since_cursor, limit, before)
+
+            def get_notification_stats(self):
+                return notification_manager.get_notification_stats()
             
             def clear_all_notifications(self):
                 return notification_manager.clear_all_notifications()
@@ -708,15 +1211,100 @@ def init_webview():
             def get_error(self, code):
                 return error_manager.get_error(code)
 
+            def get_logs(self, level=None, since=None, category=None, limit=None):
+                return error_manager.get_logs(level, since, category, limit)
+
+            def set_log_level(self, level):
+                return error_manager.set_log_level(level)
+
+            def get_log_stats(self):
+                return error_manager.get_log_stats()
+
             # File Management - Delegate to FileManagerAPI
-            def list_directory(self, path):
-                return file_manager.list_directory(path)
+            def list_directory(self, path, sort_by=None, descending=False, extensions=None, pattern=None, folders_first=True):
+                return file_manager.list_directory(path, sort_by, descending, extensions, pattern, folders_first)
+
+            def list_directory_page(self, path, sort_by="name", descending=False, extensions=None, pattern=None, cursor=None, limit=LIST_DIRECTORY_PAGE_SIZE, folders_first=True):
+                return file_manager.list_directory_page(path, sort_by, descending, extensions, pattern, cursor, limit, folders_first)
+
+            def get_listing_cache_stats(self):
+                return file_manager.get_listing_cache_stats()
+
+            def get_folder_size(self, path):
+                return file_manager.get_folder_size(path)
+
+            def get_folder_size_stats(self):
+                return file_manager.get_folder_size_stats()
+
+            def watch_directory(self, path):
+                return file_manager.watch_directory(path)
+
+            def unwatch_directory(self, watch_id):
+                return file_manager.unwatch_directory(watch_id)
+
+            def get_watch_status(self):
+                return file_manager.get_watch_status()
+
+            def search_files(self, query, limit=FILE_INDEX_SEARCH_LIMIT):
+                return file_manager.search_files(query, limit)
+
+            def add_index_root(self, path):
+                return file_manager.add_index_root(path)
+
+            def remove_index_root(self, path):
+                return file_manager.remove_index_root(path)
+
+            def get_index_status(self):
+                return file_manager.get_index_status()
+
+            def start_copy(self, src, dest):
+                return file_manager.start_copy(src, dest)
+
+            def start_move(self, src, dest):
+                return file_manager.start_move(src, dest)
+
+            def start_delete(self, path):
+                return file_manager.start_delete(path)
+
+            def get_job(self, job_id):
+                return file_manager.get_job(job_id)
+
+            def list_jobs(self):
+                return file_manager.list_jobs()
+
+            def pause_job(self, job_id):
+                return file_manager.pause_job(job_id)
+
+            def resume_job(self, job_id):
+                return file_manager.resume_job(job_id)
+
+            def cancel_job(self, job_id):
+                return file_manager.cancel_job(job_id)
             
             def read_file(self, path):
                 return file_manager.read_file(path)
             
-            def write_file(self, path, content):
-                return file_manager.write_file(path, content)
+            def write_file(self, path, content, write_behind=False):
+                return file_manager.write_file(path, content, write_behind)
+
+            # Raw bytes travel over the loopback byte channel; see window.sanctumBytes in mobile_bridge.js
+            def get_byte_channel(self):
+                return file_manager.get_byte_channel()
+
+            def flush_writes(self):
+                return file_manager.flush_writes()
+
+            def get_write_stats(self):
+                return file_manager.get_write_stats()
+
+            def get_file_hash(self, path, algorithm=HASH_DEFAULT_ALGORITHM):
+                return file_manager.get_file_hash(path, algorithm)
+
+            def get_file_hashes(self, paths, algorithm=HASH_DEFAULT_ALGORITHM):
+                return file_manager.get_file_hashes(paths, algorithm)
+
+            def get_hash_stats(self):
+                return file_manager.get_hash_stats()
             
             def delete_file(self, path):
                 return file_manager.delete_file(path)
@@ -738,6 +1326,15 @@ def init_webview():
             
             def copy_item(self, src, dest):
                 return file_manager.copy_item(src, dest)
+
+            def bulk_delete(self, paths):
+                return file_manager.bulk_delete(paths)
+
+            def bulk_move(self, paths, dest):
+                return file_manager.bulk_move(paths, dest)
+
+            def bulk_copy(self, paths, dest):
+                return file_manager.bulk_copy(paths, dest)
             
             def get_metadata(self, path):
                 return file_manager.get_metadata(path)
@@ -753,12 +1350,33 @@ def init_webview():
 
             def get_file_data_url(self, path, max_bytes=None, fallback_mime=None):
                 return file_manager.get_file_data_url(path, max_bytes, fallback_mime)
+
+            def get_data_url_stats(self):
+                return file_manager.get_data_url_stats()
+
+            def get_thumbnail(self, path, size="thumb"):
+                return file_manager.get_thumbnail(path, size)
+
+            def get_thumbnails(self, paths, size="thumb"):
+                return file_manager.get_thumbnails(paths, size)
+
+            def cancel_thumbnails(self, batch_id):
+                return file_manager.cancel_thumbnails(batch_id)
+
+            def get_thumbnail_stats(self):
+                return file_manager.get_thumbnail_stats()
             
             # Settings access
             def get_fonts(self):
                 global fonts
                 return fonts
             
+            def get_font_manifest(self):
+                return settings_manager.get_font_manifest()
+
+            def get_font_stats(self):
+                return settings_manager.get_font_stats()
+
             def get_version(self):
                 global version
                 return version
@@ -769,6 +1387,12 @@ def init_webview():
             
             def get_wallpaper_data(self):
                 return settings_manager.get_wallpaper_data()
+
+            def get_scaled_wallpaper(self, width, height):
+                return settings_manager.get_scaled_wallpaper(width, height)
+
+            def get_wallpaper_stats(self):
+                return settings_manager.get_wallpaper_stats()
             
             def get_day_gradient(self):
                 global day_gradient
@@ -821,6 +1445,12 @@ def init_webview():
             def set_color_theme(self, theme):
                 return settings_manager.set_color_theme(theme)
 
+            def set_settings(self, changes):
+                return settings_manager.set_settings(changes)
+
+            def flush_settings(self):
+                return settings_manager.flush_settings()
+
             # Usage Monitor - Delegate to UsageMonitorAPI
             def get_processor_usage(self):
                 return usage_monitor.get_processor_usage()
@@ -855,11 +1485,30 @@ def init_webview():
                 return open_external_url(url)
 
             def js_log(self, level, message):
-                print(f"[JS/{level}] {message}")
+                return log_js(level, message)
+
+            def js_log_batch(self, records, dropped=0):
+                return log_js_batch(records, dropped)
+
+            def get_js_log_config(self):
+                return js_log_config()
+
+            def set_js_log_level(self, level):
+                return set_js_log_level(level)
             
             # Fuzzy search for apps
             def fuzzy_search_apps(self, query):
                 return fuzzy_search_apps(query)
+
+            # Call cancellation - runs another API method under a cancellable call id
+            def call_with_deadline(self, call_id, timeout_ms, method, args=None):
+                method_name = str(method or "")
+                if method_name.startswith("_") or method_name in ("call_with_deadline", "cancel_call") or not hasattr(self, method_name):
+                    return {"success": False, "error": f"Unknown API method: {method_name}"}
+                return run_bridge_call(call_id, timeout_ms, getattr(self, method_name), *(args or []))
+
+            def cancel_call(self, call_id):
+                return cancel_call(call_id)
             
             # Generic app function call - allows apps to expose their own API
             def call_app_function(self, app_name, function_name, *args, **kwargs):
@@ -874,9 +1523,11 @@ def init_webview():
                         return {"success": False, "message": f"Function '{function_name}' not found in app '{app_name}'"}
                     
                     func = getattr(app_module, function_name)
-                    result = func(*args, **kwargs)
+                    result = run_as_app(app_name, func, *args, **kwargs)
                     return result
                     
+                except CallCancelledError:
+                    raise
                 except Exception as e:
                     return {"success": False, "message": f"Error calling {function_name}: {str(e)}"}
 
@@ -921,8 +1572,377 @@ def on_webview_ready():
         print("OWR: Applying fullscreen setting from startup...")
         webview_window.toggle_fullscreen()
 
+# Bounded, insertion-ordered notification storage with a change cursor
+# Every change (add, delete, clear) takes the next cursor value and is kept in a short changelog,
+# so callers holding a cursor can fetch only what changed since. Past max_entries, entries are
+# evicted by policy: "source" drops the oldest entry of the app with the most entries, so a chatty
+# app only pushes out its own notifications; "oldest" drops the oldest entry overall
+class NotificationStore:
+    EVICTION_POLICIES = ("source", "oldest")
+
+    def __init__(self, max_entries=NOTIFICATION_STORE_MAX, eviction=NOTIFICATION_EVICTION, changelog_size=NOTIFICATION_CHANGELOG_MAX):
+        if eviction not in self.EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction} (expected one of {', '.join(self.EVICTION_POLICIES)})")
+        self.max_entries = max(1, int(max_entries))
+        self.eviction = eviction
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()  # id -> notification, oldest first
+        self._by_source = {}  # source -> OrderedDict of its ids, oldest first
+        self._changes = collections.deque(maxlen=changelog_size)  # (cursor, kind, id)
+        self._latest = {}  # (source, message) -> id of its newest entry, for coalescing
+        self._cursor = 0
+        self._evicted = collections.Counter()  # source -> entries evicted
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def cursor(self):
+        return self._cursor
+
+    # Stores a notification dict with "id", "message", "timestamp", "source" and optionally "count"
+    # Returns (stored copy with its "seq", ids evicted to make room)
+    def add(self, notification):
+        with self._lock:
+            evicted = []
+            while len(self._entries) >= self.max_entries:
+                evicted.append(self._evict_one())
+            entry = dict(notification, seq=self._record("add", notification["id"]))
+            entry.setdefault("count", 1)
+            self._entries[entry["id"]] = entry
+            self._by_source.setdefault(entry["source"], collections.OrderedDict())[entry["id"]] = None
+            key = self._coalesce_key(entry["source"], entry["message"])
+            if key is not None:
+                self._latest[key] = entry["id"]
+            return dict(entry), evicted
+
+    # Folds a repeat of source's message into its newest entry if that was updated within window
+    # seconds: the count goes up and the entry moves to the front. Returns the entry, or None
+    def coalesce(self, source, message, timestamp, window=NOTIFICATION_COALESCE_SECONDS):
+        key = self._coalesce_key(source, message)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(self._latest.get(key))
+            if entry is None or timestamp - entry["timestamp"] > window:
+                return None
+            entry["count"] += 1
+            entry["timestamp"] = timestamp
+            entry["seq"] = self._record("update", entry["id"])
+            self._entries.move_to_end(entry["id"])
+            self._by_source[source].move_to_end(entry["id"])
+            return dict(entry)
+
+    def delete(self, notification_id):
+        with self._lock:
+            if notification_id not in self._entries:
+                return False
+            self._remove(notification_id)
+            self._record("delete", notification_id)
+            return True
+
+    def clear(self):
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._by_source.clear()
+            self._latest.clear()
+            self._record("clear", None)
+            return count
+
+    # Returns copies of the stored notifications, oldest first, without their "seq"
+    def snapshot(self):
+        with self._lock:
+            return [{key: value for key, value in entry.items() if key != "seq"} for entry in self._entries.values()]
+
+    def __contains__(self, notification_id):
+        return notification_id in self._entries
+
+    # Returns notifications newest first, limit at a time; pass next_before as before for the next page
+    def page(self, limit=NOTIFICATION_PAGE_SIZE, before=None):
+        with self._lock:
+            return self._page(limit, before)
+
+    # Returns what changed after cursor since: {"reset": False, "added", "deleted", "cursor", "total"}
+    # "added" also holds entries whose count went up; callers replace their copy of those
+    # A cursor that is unknown, older than the changelog or from before a clear gets a first
+    # page with "reset": True instead, as does a delta with more than limit changes
+    def changes_since(self, since, limit=NOTIFICATION_PAGE_SIZE):
+        with self._lock:
+            if since > self._cursor or (since < self._cursor and (not self._changes or self._changes[0][0] > since + 1)):
+                return self._reset_page(limit)
+
+            newer = []
+            for change in reversed(self._changes):
+                if change[0] <= since:
+                    break
+                newer.append(change)
+
+            added = collections.OrderedDict()  # added or updated since the cursor, oldest change first
+            fresh = set()  # added since the cursor, so the caller has never seen them
+            deleted = []
+            for _, kind, notification_id in reversed(newer):
+                if kind == "clear":
+                    return self._reset_page(limit)
+                if kind == "add":
+                    fresh.add(notification_id)
+                    added[notification_id] = None
+                elif kind == "update":
+                    added.pop(notification_id, None)
+                    added[notification_id] = None
+                else:
+                    added.pop(notification_id, None)
+                    if notification_id not in fresh:
+                        deleted.append(notification_id)
+            if len(added) + len(deleted) > limit:
+                return self._reset_page(limit)
+
+            return {
+                "reset": False,
+                "added": [dict(self._entries[nid]) for nid in reversed(added) if nid in self._entries],
+                "deleted": deleted,
+                "cursor": self._cursor,
+                "total": len(self._entries)
+            }
+
+    def stats(self):
+        with self._lock:
+            return {
+                "count": len(self._entries),
+                "max_entries": self.max_entries,
+                "eviction": self.eviction,
+                "cursor": self._cursor,
+                "evicted": sum(self._evicted.values()),
+                "sources": {source: len(ids) for source, ids in self._by_source.items()},
+                "evicted_by_source": dict(self._evicted)
+            }
+
+    def _reset_page(self, limit):
+        result = self._page(limit, None)
+        result["reset"] = True
+        return result
+
+    def _page(self, limit, before):
+        notifications = []
+        has_more = False
+        for entry in reversed(self._entries.values()):
+            if before is not None and entry["seq"] >= before:
+                continue
+            if len(notifications) == limit:
+                has_more = True
+                break
+            notifications.append(dict(entry))
+        return {
+            "notifications": notifications,
+            "cursor": self._cursor,
+            "total": len(self._entries),
+            "has_more": has_more,
+            "next_before": notifications[-1]["seq"] if has_more else None
+        }
+
+    def _record(self, kind, notification_id):
+        self._cursor += 1
+        self._changes.append((self._cursor, kind, notification_id))
+        return self._cursor
+
+    def _remove(self, notification_id):
+        entry = self._entries.pop(notification_id)
+        source_ids = self._by_source[entry["source"]]
+        del source_ids[notification_id]
+        if not source_ids:
+            del self._by_source[entry["source"]]
+        key = self._coalesce_key(entry["source"], entry["message"])
+        if key is not None and self._latest.get(key) == notification_id:
+            del self._latest[key]
+        return entry
+
+    # Only plain text messages are coalesced
+    @staticmethod
+    def _coalesce_key(source, message):
+        return (source, message) if isinstance(message, str) else None
+
+    def _evict_one(self):
+        if self.eviction == "source":
+            source_ids = max(self._by_source.values(), key=len)
+            notification_id = next(iter(source_ids))
+        else:
+            notification_id = next(iter(self._entries))
+        entry = self._remove(notification_id)
+        self._record("delete", notification_id)
+        self._evicted[entry["source"]] += 1
+        return notification_id
+
 # Shared notifications storage at module level
-_notifications = {}
+_notifications = NotificationStore()
+
+# Append-only journal that keeps notifications across restarts
+# Each add, update (coalesced repeat), delete and clear is one JSON line. Records are queued and appended by a background
+# thread in one write once NOTIFICATION_JOURNAL_DELAY_SECONDS has passed since the first, so a burst
+# of notifications costs a few sequential writes. Replaying is idempotent (adds of known ids and
+# deletes of unknown ones are skipped), which lets the writer compact the journal into a snapshot
+# of the store while newer records are still queued
+class NotificationJournal:
+    def __init__(self, delay=NOTIFICATION_JOURNAL_DELAY_SECONDS, compact_records=NOTIFICATION_JOURNAL_COMPACT_RECORDS):
+        self.delay = delay
+        self.compact_records = compact_records
+        self.path = None
+        self._pending = []  # encoded lines not yet written
+        self._first_pending = None  # monotonic time the oldest pending line was queued
+        self._records = 0  # lines in the journal file
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stats = {"appended": 0, "writes": 0, "compactions": 0, "errors": 0}
+
+    # Rebuilds store from the journal in DATA_DIR (which can change before backend.initialize on Android)
+    # Returns the number of notifications restored
+    def replay(self, store):
+        path = os.path.join(DATA_DIR, NOTIFICATION_JOURNAL_NAME)
+        entries = collections.OrderedDict()
+        records = 0
+        damaged = 0
+        try:
+            with open(path, "r", encoding="utf-8") as journal_file:
+                for line in journal_file:
+                    records += 1
+                    try:
+                        record = json.loads(line)
+                        op = record["op"]
+                        if op == "add":
+                            notification = record["notification"]
+                            entries.setdefault(notification["id"], notification)
+                        elif op == "update":
+                            notification = entries.get(record["id"])
+                            if notification is not None:
+                                notification["count"] = record["count"]
+                                notification["timestamp"] = record["timestamp"]
+                                entries.move_to_end(record["id"])
+                        elif op == "delete":
+                            entries.pop(record["id"], None)
+                        elif op == "clear":
+                            entries.clear()
+                    except (ValueError, KeyError, TypeError):
+                        # Usually a line cut short by a crash mid-write
+                        damaged += 1
+        except FileNotFoundError:
+            pass
+
+        for notification in entries.values():
+            if notification["id"] not in store:
+                store.add(notification)
+        with self._write_lock:
+            with self._condition:
+                self.path = path
+                self._records = records
+            if damaged:
+                log_warning("NMA", "Skipped %d damaged notification journal records", damaged)
+                # Rewriting also drops a torn last line that later appends would be glued onto
+                self._compact(store)
+        return len(store)
+
+    def append(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._condition:
+            self._pending.append(line)
+            self._stats["appended"] += 1
+            if self._first_pending is None:
+                self._first_pending = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="NotificationJournal", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    # Writes queued records now, compacting if enough are dead; returns False if the write failed
+    def flush(self, store=None):
+        store = _notifications if store is None else store
+        with self._write_lock:
+            with self._condition:
+                if not self._pending:
+                    return True
+                lines = self._pending
+                self._pending = []
+                self._first_pending = None
+                if self.path is None:
+                    self.path = os.path.join(DATA_DIR, NOTIFICATION_JOURNAL_NAME)
+                path = self.path
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "a", encoding="utf-8") as journal_file:
+                    journal_file.write("".join(lines))
+                with self._condition:
+                    self._records += len(lines)
+                    self._stats["writes"] += 1
+            except Exception as e:
+                with self._condition:
+                    # Requeue ahead of newer records so the next flush retries in order
+                    self._pending[:0] = lines
+                    if self._first_pending is None:
+                        self._first_pending = time.monotonic()
+                    self._stats["errors"] += 1
+                print(f"NMA-E1: Error writing notification journal: {e}")
+                if webview_window and not IS_MOBILE:
+                    webview_window.evaluate_js('displayError("NMA-E1")')
+                return False
+
+            dead = self._records - len(store)
+            if dead >= self.compact_records and dead > len(store):
+                self._compact(store)
+            return True
+
+    def stats(self, store=None):
+        store = _notifications if store is None else store
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+            stats["records"] = self._records
+            stats["dead_records"] = max(0, self._records - len(store))
+        return stats
+
+    # Rewrites the journal as one add per stored notification; callers hold _write_lock
+    def _compact(self, store):
+        path = self.path
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            entries = store.snapshot()
+            with open(temp_path, "x", encoding="utf-8") as temp_file:
+                for notification in entries:
+                    temp_file.write(json.dumps({"op": "add", "notification": notification}, separators=(",", ":")) + "\n")
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, path)
+            _fsync_directory(os.path.dirname(path))
+            with self._condition:
+                self._records = len(entries)
+                self._stats["compactions"] += 1
+        except Exception as e:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            with self._condition:
+                self._stats["errors"] += 1
+            print(f"NMA: Error compacting notification journal: {e}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                wait_seconds = self._first_pending + self.delay - time.monotonic()
+                if wait_seconds > 0:
+                    self._condition.wait(wait_seconds)
+                    continue
+            if not self.flush():
+                time.sleep(self.delay)
+
+_notification_journal = NotificationJournal()
+atexit.register(_notification_journal.flush)
+
+# Writes queued notification journal records now instead of after the journal delay
+def flush_notifications():
+    return _notification_journal.flush()
+
+
 _NOTIFICATION_EVENT_QUEUE_MAX = 512
 _notification_event_queue = queue.Queue(maxsize=_NOTIFICATION_EVENT_QUEUE_MAX)
 _notification_event_worker_started = False
@@ -1020,7 +2040,11 @@ def _dispatch_notification_event(payload):
         window.dispatchEvent(new CustomEvent('sanctum-notification-event', {{ detail: payload }}));
     }})();
     """
+    return _queue_frontend_script(script)
 
+
+# Queues a script for evaluation in the main window without blocking the caller
+def _queue_frontend_script(script):
     # On mobile, evaluating JavaScript from the UI/event loop thread is more reliable.
     if IS_MOBILE and _dispatch_notification_event_on_main_loop(script):
         return True
@@ -1038,24 +2062,188 @@ def _dispatch_notification_event(payload):
 
         try:
             _notification_event_queue.put_nowait(script)
-            print("NMA: Notification event queue was full, dropped oldest event")
+            log_warning("NMA", "Notification event queue was full, dropped oldest event")
             return True
         except queue.Full:
-            print("NMA: Notification event queue full, dropping event")
+            log_warning("NMA", "Notification event queue full, dropping event")
             return False
 
 
+_window_event_queue = queue.Queue()
+_window_event_worker = None
+_window_event_worker_lock = threading.Lock()
+
+
+def _window_event_dispatch_worker():
+    while True:
+        script, log_prefix = _window_event_queue.get()
+        try:
+            _evaluate_notification_event_script(script)
+        except Exception as emit_error:
+            print(f"{log_prefix}: Failed to dispatch window event: {emit_error}")
+
+
+# Queues a window event script on its own unbounded queue, evaluated in order by one worker
+# Unlike notifications, which the frontend can resync by cursor, these are never dropped:
+# a lost job "completed" state or thumbnail would leave a view waiting forever
+def _queue_window_event_script(script, log_prefix):
+    global _window_event_worker
+
+    # On mobile, evaluating JavaScript from the UI/event loop thread is more reliable
+    if IS_MOBILE and _dispatch_notification_event_on_main_loop(script):
+        return True
+
+    with _window_event_worker_lock:
+        if _window_event_worker is None or not _window_event_worker.is_alive():
+            _window_event_worker = threading.Thread(
+                target=_window_event_dispatch_worker,
+                name="window-event-dispatch",
+                daemon=True,
+            )
+            _window_event_worker.start()
+    _window_event_queue.put((script, log_prefix))
+    return True
+
+
+# Sends payload to the frontend as a CustomEvent named event_type on window, calling
+# window[handler_name](payload) first when an app has defined it
+def _dispatch_window_event(event_type, handler_name, payload, log_prefix="NMA"):
+    if not webview_window:
+        return False
+
+    try:
+        payload_json = json.dumps(payload, separators=(",", ":"))
+    except Exception as encode_error:
+        print(f"{log_prefix}: Failed to encode {event_type} payload: {encode_error}")
+        return False
+
+    script = f"""
+    (function() {{
+        const payload = {payload_json};
+        if (typeof window.{handler_name} === 'function') {{
+            try {{
+                window.{handler_name}(payload);
+            }} catch (handlerError) {{
+                console.error('{event_type} handler failed:', handlerError);
+            }}
+        }}
+        window.dispatchEvent(new CustomEvent('{event_type}', {{ detail: payload }}));
+    }})();
+    """
+    return _queue_window_event_script(script, log_prefix)
+
+
+# Per-source token buckets for new notifications, plus delivery counters for diagnosis
+class NotificationRateLimiter:
+    def __init__(self, rate=NOTIFICATION_RATE_PER_SECOND, burst=NOTIFICATION_RATE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets = {}  # source -> [tokens, monotonic time of the last refill]
+        self._counters = {}  # source -> {"delivered", "coalesced", "dropped"}
+
+    # Takes a token for source; returns False (and counts a drop) when it has none left
+    def allow(self, source):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(source, [float(self.burst), now])
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                self._count(source, "dropped")
+                return False
+            bucket[0] -= 1
+            return True
+
+    def record(self, source, outcome):
+        with self._lock:
+            self._count(source, outcome)
+
+    def stats(self):
+        with self._lock:
+            return {source: dict(counters) for source, counters in self._counters.items()}
+
+    def _count(self, source, outcome):
+        counters = self._counters.setdefault(source, {"delivered": 0, "coalesced": 0, "dropped": 0})
+        counters[outcome] += 1
+
+_notification_limiter = NotificationRateLimiter()
+
+# Sends notification events to the frontend, grouping bursts
+# The first event after a quiet spell goes out at once. Events within NOTIFICATION_EVENT_BATCH_SECONDS
+# of the last send are held and then sent together as one notifications-batch event, so a flood
+# costs one evaluate_js per window instead of one per notification and never overflows the queue
+class NotificationEventBatcher:
+    def __init__(self, window=NOTIFICATION_EVENT_BATCH_SECONDS, max_events=NOTIFICATION_EVENT_BATCH_MAX):
+        self.window = window
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+        self._last_sent = None  # monotonic time of the last dispatch
+        self._stats = {"events": 0, "dispatched": 0, "batches": 0, "omitted": 0}
+
+    def emit(self, payload):
+        now = time.monotonic()
+        with self._lock:
+            self._stats["events"] += 1
+            if self._timer is None and (self._last_sent is None or now - self._last_sent >= self.window):
+                self._last_sent = now
+                self._stats["dispatched"] += 1
+            else:
+                self._pending.append(payload)
+                if self._timer is None:
+                    self._timer = threading.Timer(max(0.0, self._last_sent + self.window - now), self._flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        _dispatch_notification_event(payload)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+        return stats
+
+    def _flush(self):
+        with self._lock:
+            events = self._pending
+            self._pending = []
+            self._timer = None
+            self._last_sent = time.monotonic()
+            if not events:
+                return
+            self._stats["dispatched"] += 1
+            if len(events) > 1:
+                self._stats["batches"] += 1
+                self._stats["omitted"] += max(0, len(events) - self.max_events)
+        if len(events) == 1:
+            _dispatch_notification_event(events[0])
+            return
+        latest = events[-1]
+        _dispatch_notification_event({
+            "event": "notifications-batch",
+            "count": latest["count"],
+            "cursor": latest["cursor"],
+            "timestamp": latest["timestamp"],
+            "events": events[-self.max_events:],
+            "omitted": max(0, len(events) - self.max_events)
+        })
+
+_notification_events = NotificationEventBatcher()
+
 def _emit_notification_event(event_name, notification=None, notification_id=None, timestamp=None):
     payload = {
         "event": event_name,
         "count": len(_notifications),
+        "cursor": _notifications.cursor,
         "timestamp": timestamp if timestamp is not None else time.time(),
     }
     if notification is not None:
         payload["notification"] = notification
     if notification_id is not None:
         payload["notification_id"] = notification_id
-    _dispatch_notification_event(payload)
+    _notification_events.emit(payload)
 
 def fuzzy_search_apps(query):
     global app_names
@@ -1070,35 +2258,69 @@ class NotificationManagerAPI:
         if isinstance(source, str) and source.strip():
             return source.strip()
 
-        for frame_info in inspect.stack():
-            frame_module = inspect.getmodule(frame_info.frame)
-            if frame_module and hasattr(frame_module, '__name__'):
-                module_name = frame_module.__name__
-                if module_name.startswith("app_"):
-                    return module_name[4:]
+        app_id = _current_app_id.get()
+        if app_id:
+            return app_id
+
+        # Threads an app starts itself don't inherit the context, but its module is still on the
+        # stack; reading f_globals avoids the source file lookups inspect.stack() does per frame
+        frame = sys._getframe(1)
+        while frame is not None:
+            module_name = frame.f_globals.get("__name__", "")
+            if module_name.startswith("app_"):
+                return module_name[4:]
+            frame = frame.f_back
 
         return "Unknown"
 
     # Sends a notification with a message
-    # Finds the calling app by inspecting the call stack
+    # The source is the app running in the current context (see run_as_app), if not given
+    # A repeat of a recent message from the same source raises that entry's "count" instead of
+    # adding one ("coalesced": True); new notifications past the source's rate limit are dropped
+    # with {"success": False, "rate_limited": True}
     def send_notification(self, message, source=None):
-        global _notifications
-
         calling_app = self._resolve_source(source)
-        notification_id = uuid.uuid4().hex
         notification_timestamp = time.time()
-        _notifications[notification_id] = {
-            "message": message,
-            "timestamp": notification_timestamp,
-            "source": calling_app
-        }
 
-        notification = {
+        notification = _notifications.coalesce(calling_app, message, notification_timestamp)
+        if notification is not None:
+            _notification_journal.append({
+                "op": "update", "id": notification["id"],
+                "count": notification["count"], "timestamp": notification_timestamp
+            })
+            _notification_limiter.record(calling_app, "coalesced")
+            _emit_notification_event(
+                "notification-updated",
+                notification=notification,
+                notification_id=notification["id"],
+                timestamp=notification_timestamp,
+            )
+            return {
+                "success": True,
+                "notification_id": notification["id"],
+                "source": calling_app,
+                "timestamp": notification_timestamp,
+                "count": notification["count"],
+                "coalesced": True,
+            }
+
+        if not _notification_limiter.allow(calling_app):
+            return {"success": False, "rate_limited": True, "source": calling_app, "error": "Too many notifications from this source"}
+
+        notification_id = uuid.uuid4().hex
+        record = {
             "id": notification_id,
             "message": message,
             "timestamp": notification_timestamp,
             "source": calling_app,
         }
+        notification, evicted = _notifications.add(record)
+        _notification_limiter.record(calling_app, "delivered")
+        _notification_journal.append({"op": "add", "notification": record})
+        if evicted:
+            log_info("NMA", "Notification limit reached, evicted %d (%s policy)", len(evicted), _notifications.eviction)
+            for evicted_id in evicted:
+                _notification_journal.append({"op": "delete", "id": evicted_id})
 
         _emit_notification_event(
             "notification-added",
@@ -1107,23 +2329,22 @@ class NotificationManagerAPI:
             timestamp=notification_timestamp,
         )
 
-        print(f"NMA: Notification sent: {calling_app} - {message} (ID: {notification_id})")
-        print(f"NMA: Total notifications: {len(_notifications)}")
-        print(f"NMA: Notifications dict id: {id(_notifications)}")
+        log_debug("NMA", "Notification sent: %s - %s (ID: %s)", calling_app, message, notification_id)
         return {
             "success": True,
             "notification_id": notification_id,
             "source": calling_app,
             "timestamp": notification_timestamp,
+            "count": 1,
+            "coalesced": False,
         }
     
     # Deletes a notification by finding it by its ID
     # Returns success status
     def delete_notification(self, notification_id):
-        global _notifications
         normalized_id = str(notification_id)
-        if normalized_id in _notifications:
-            del _notifications[normalized_id]
+        if _notifications.delete(normalized_id):
+            _notification_journal.append({"op": "delete", "id": normalized_id})
             _emit_notification_event(
                 "notification-deleted",
                 notification_id=normalized_id,
@@ -1132,30 +2353,360 @@ class NotificationManagerAPI:
         else:
             return {"success": False, "error": "Notification ID not found"}
     
-    # Returns all current notifications
-    # Returns a success status
-    def get_notifications(self):
-        global _notifications
-        # Return all notifications with their IDs
-        print(f"Getting notifications: {len(_notifications)} total")
-        print(f"Notifications dict id: {id(_notifications)}")
-        notifications = [
-            {"id": nid, **ndata}
-            for nid, ndata in _notifications.items()
-        ]
-        notifications.sort(key=lambda notif: notif.get("timestamp", 0), reverse=True)
-        return {
-            "success": True,
-            "notifications": notifications
+    # Returns notifications newest first, a page at a time
+    # {"success", "notifications", "cursor", "total", "has_more", "next_before"}
+    # Pass next_before as before to get the next page
+    # With since_cursor (the cursor of an earlier result), returns only what changed since:
+    # {"success", "reset": False, "added", "deleted", "cursor", "total"}; if that cursor can't be
+    # served it returns a first page with "reset": True, so callers should replace their list
+    def get_notifications(self, since_cursor=None, limit=None, before=None):
+        try:
+            limit = NOTIFICATION_PAGE_SIZE if limit is None else int(limit)
+            if limit <= 0:
+                raise ValueError("limit must be positive")
+            limit = min(limit, NOTIFICATION_MAX_PAGE_SIZE)
+            if since_cursor is not None:
+                result = _notifications.changes_since(int(since_cursor), limit)
+            else:
+                result = _notifications.page(limit, None if before is None else int(before))
+        except (TypeError, ValueError) as e:
+            return {"success": False, "error": f"Invalid notification query: {e}"}
+        result["success"] = True
+        return result
+
+    # Returns notification counters: store size and eviction policy, journal and event batching,
+    # and per source {"stored", "delivered", "coalesced", "dropped", "evicted"}
+    def get_notification_stats(self):
+        stats = _notifications.stats()
+        stored = stats.pop("sources")
+        evicted = stats.pop("evicted_by_source")
+        delivery = _notification_limiter.stats()
+        stats["sources"] = {
+            source: dict(
+                delivery.get(source, {"delivered": 0, "coalesced": 0, "dropped": 0}),
+                stored=stored.get(source, 0),
+                evicted=evicted.get(source, 0)
+            )
+            for source in set(stored) | set(evicted) | set(delivery)
         }
+        stats["journal"] = _notification_journal.stats()
+        stats["events"] = _notification_events.stats()
+        return stats
     
     # Clears all notifications in the dictionary
     def clear_all_notifications(self):
-        global _notifications
         _notifications.clear()
+        _notification_journal.append({"op": "clear"})
         _emit_notification_event("notifications-cleared", timestamp=time.time())
         return {"success": True}
 
+# Appends lines to a file in DATA_DIR from a background thread, a batch at a time
+# Lines are queued in memory and written with one open and append once delay has passed since
+# the first, so a storm of lines costs a few writes. A batch that would take the file past
+# max_bytes first renames it to backup_name, replacing the previous backup
+# With echo, each batch is also written to stdout in one call, off the caller's thread
+class RotatingAppender:
+    def __init__(self, name, backup_name, max_bytes, delay, max_pending=LOG_APPENDER_MAX_PENDING, echo=False):
+        self.name = name
+        self.backup_name = backup_name
+        self.max_bytes = max_bytes
+        self.delay = delay
+        self.max_pending = max_pending
+        self.echo = echo
+        self._failing = False  # Only the first of a run of failed writes is reported
+        self._pending = collections.deque()
+        self._first_pending = None  # monotonic time the oldest pending line was queued
+        self._size = None  # (path, bytes) of the file as last written
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stats = {"lines": 0, "writes": 0, "rotations": 0, "dropped": 0, "errors": 0}
+
+    # DATA_DIR can change before backend.initialize on Android, so the path is resolved per write
+    def path(self):
+        return os.path.join(DATA_DIR, self.name)
+
+    def append(self, line):
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self._stats["dropped"] += 1
+            self._pending.append(line)
+            self._stats["lines"] += 1
+            if self._first_pending is None:
+                self._first_pending = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"Appender-{self.name}", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    # Writes queued lines now; returns False if the write failed
+    def flush(self):
+        with self._write_lock:
+            with self._condition:
+                if not self._pending:
+                    return True
+                lines = list(self._pending)
+                self._pending.clear()
+                self._first_pending = None
+            path = self.path()
+            text = "".join(lines)
+            if self.echo:
+                try:
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+                except Exception:
+                    pass
+            data = text.encode("utf-8")
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if self._size is None or self._size[0] != path:
+                    self._size = (path, os.path.getsize(path) if os.path.exists(path) else 0)
+                if self._size[1] and self._size[1] + len(data) > self.max_bytes:
+                    os.replace(path, os.path.join(os.path.dirname(path), self.backup_name))
+                    self._size = (path, 0)
+                    with self._condition:
+                        self._stats["rotations"] += 1
+                with open(path, "ab") as log_file:
+                    log_file.write(data)
+                self._size = (path, self._size[1] + len(data))
+                self._failing = False
+                with self._condition:
+                    self._stats["writes"] += 1
+                return True
+            except Exception as e:
+                self._size = None
+                with self._condition:
+                    self._stats["errors"] += 1
+                    self._stats["dropped"] += len(lines)
+                if not self._failing:
+                    # Printing, not logging: the log itself is what failed
+                    print(f"Error writing {path}: {e}")
+                self._failing = True
+                return False
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+        return stats
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                wait_seconds = self._first_pending + self.delay - time.monotonic()
+                if wait_seconds > 0:
+                    self._condition.wait(wait_seconds)
+                    continue
+            self.flush()
+
+_error_log = RotatingAppender("error_log.txt", "old_error_log.txt", MAX_ERROR_LOG_SIZE, ERROR_LOG_FLUSH_SECONDS)
+atexit.register(_error_log.flush)
+
+# Backend log with levels and categories (the short prefixes such as "LA" and "IA")
+# Records are kept in a ring for get_logs and handed to a background appender that prints them
+# and writes DATA_DIR/sanctum_log.txt, so callers never wait on stdout or the disk.
+# A record below the current level is rejected with one comparison before its message is
+# formatted, so pass values as arguments: log_debug("LA", "Launching %s", app_id)
+class BackendLog:
+    def __init__(self, level=LOG_LEVEL, buffer_size=LOG_BUFFER_SIZE):
+        self._records = collections.deque(maxlen=buffer_size)  # deque appends are atomic, so writers take no lock
+        self._sequence = itertools.count(1)
+        self._file = RotatingAppender(
+            "sanctum_log.txt", "old_sanctum_log.txt", LOG_FILE_MAX_SIZE, LOG_FLUSH_SECONDS, echo=True
+        )
+        self.threshold = LOG_LEVELS["info"]
+        self.set_level(level)
+
+    def set_level(self, level):
+        level = str(level or "").lower()
+        if level not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level: {level}")
+        self.threshold = LOG_LEVELS[level]
+        return level
+
+    def level(self):
+        return next(name for name, value in LOG_LEVELS.items() if value == self.threshold)
+
+    def log(self, level, category, message, *args):
+        if LOG_LEVELS[level] < self.threshold:
+            return
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args!r}"
+        timestamp = time.time()
+        self._records.append({
+            "seq": next(self._sequence),
+            "timestamp": timestamp,
+            "level": level,
+            "category": category,
+            "message": message,
+        })
+        clock = time.strftime("%H:%M:%S", time.localtime(timestamp))
+        self._file.append(f"{clock} {level.upper():<7} {category}: {message}\n")
+
+    # Records at or above level and after the since sequence number, oldest first
+    # Without since the newest limit records are returned; with it the oldest limit after since
+    def records(self, level=None, since=None, category=None, limit=None):
+        threshold = LOG_LEVELS[str(level).lower()] if level else 0
+        limit = max(1, min(int(limit or LOG_PAGE_SIZE), self._records.maxlen))
+        while True:
+            try:
+                snapshot = list(self._records)
+                break
+            except RuntimeError:
+                continue  # Appended to while copying; copy again
+        matches = [
+            record for record in snapshot
+            if LOG_LEVELS[record["level"]] >= threshold
+            and (since is None or record["seq"] > since)
+            and (category is None or record["category"] == category)
+        ]
+        more = len(matches) > limit
+        matches = matches[:limit] if since is not None else matches[-limit:]
+        cursor = snapshot[-1]["seq"] if snapshot else (since or 0)
+        if since is not None and more:
+            cursor = matches[-1]["seq"]
+        return {"logs": [dict(record) for record in matches], "cursor": cursor, "more": more}
+
+    def stats(self):
+        stats = self._file.stats()
+        stats["level"] = self.level()
+        stats["buffered"] = len(self._records)
+        return stats
+
+    def flush(self):
+        return self._file.flush()
+
+_log = BackendLog()
+atexit.register(_log.flush)
+
+def log_debug(category, message, *args):
+    if _log.threshold <= 10:
+        _log.log("debug", category, message, *args)
+
+def log_info(category, message, *args):
+    if _log.threshold <= 20:
+        _log.log("info", category, message, *args)
+
+def log_warning(category, message, *args):
+    _log.log("warning", category, message, *args)
+
+JS_LOG_LEVELS = {"LOG": "info", "INFO": "info", "DEBUG": "debug", "WARN": "warning", "WARNING": "warning", "ERROR": "error"}
+
+_js_log_level = JS_LOG_LEVEL
+
+# Records a frontend console line under the JS category
+def log_js(level, message):
+    _log.log(JS_LOG_LEVELS.get(str(level).upper(), "info"), "JS", "%s", message)
+    return {"success": True}
+
+# The console forwarding settings for the frontend; js_log_batch returns them too, so a level change reaches it on its next flush
+def js_log_config():
+    return {
+        "success": True,
+        "level": _js_log_level,
+        "threshold": LOG_LEVELS[_js_log_level],
+        "flush_ms": JS_LOG_FLUSH_MS,
+        "batch_max": JS_LOG_BATCH_MAX,
+    }
+
+# Records a batch of frontend console lines, each [level, message] or {"level", "message"}
+# dropped is the number of lines the frontend discarded because its buffer was full
+def log_js_batch(records, dropped=0):
+    if not isinstance(records, list):
+        return {"success": False, "error": "records must be a list"}
+    accepted = 0
+    for record in records[:JS_LOG_BATCH_LIMIT]:
+        if isinstance(record, dict):
+            level, message = record.get("level"), record.get("message")
+        elif isinstance(record, (list, tuple)) and len(record) >= 2:
+            level, message = record[0], record[1]
+        else:
+            continue
+        _log.log(JS_LOG_LEVELS.get(str(level).upper(), "info"), "JS", "%s", message)
+        accepted += 1
+    try:
+        dropped = int(dropped or 0) + max(0, len(records) - JS_LOG_BATCH_LIMIT)
+    except (TypeError, ValueError):
+        dropped = 0
+    if dropped:
+        log_warning("JS", "Frontend dropped %d console lines", dropped)
+    result = js_log_config()
+    result["accepted"] = accepted
+    return result
+
+# Sets the lowest frontend console level sent to the backend
+def set_js_log_level(level):
+    global _js_log_level
+    level = str(level or "").lower()
+    if level not in LOG_LEVELS:
+        return {"success": False, "error": f"Unknown log level: {level}"}
+    _js_log_level = level
+    return js_log_config()
+
+# Writes queued log lines now instead of after the appender delay
+def flush_logs():
+    logged = _log.flush()
+    return _error_log.flush() and logged
+
+# The error catalog from errors.json beside backend.py, parsed once
+# Each lookup checks the file's mtime and size and reparses it only when they change
+class ErrorCatalog:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(BASE_DIR, "errors.json")
+        self._lock = threading.Lock()
+        self._errors = None
+        self._signature = None  # (mtime_ns, size) of the parsed file
+        self._stats = {"lookups": 0, "loads": 0}
+
+    # Returns the catalog entry for code, or None for an unknown code
+    # Raises if the catalog can't be read and no earlier copy was loaded
+    def get(self, code):
+        errors = self._current()
+        with self._lock:
+            self._stats["lookups"] += 1
+        error = errors.get(str(code))
+        return dict(error) if error is not None else None
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["codes"] = len(self._errors or {})
+        return stats
+
+    def _current(self):
+        try:
+            stat_info = os.stat(self.path)
+            signature = (stat_info.st_mtime_ns, stat_info.st_size)
+        except OSError:
+            if self._errors is not None:
+                return self._errors
+            raise
+        with self._lock:
+            if signature == self._signature:
+                return self._errors
+            try:
+                with open(self.path, "r", encoding="utf-8") as catalog_file:
+                    errors = json.load(catalog_file)
+            except Exception as e:
+                # An edit in progress can leave the file half written; keep serving the last good copy
+                if self._errors is None:
+                    raise
+                print(f"Error reloading errors.json, keeping the previous catalog: {e}")
+                self._signature = signature  # Retry once the file changes again, not on every lookup
+                return self._errors
+            self._errors = errors
+            self._signature = signature
+            self._stats["loads"] += 1
+            return errors
+
+_error_catalog = ErrorCatalog()
+
 #API for managing errors within the environment
 class ErrorManagerAPI:
     # Displays an error message
@@ -1167,15 +2718,16 @@ class ErrorManagerAPI:
     # Returns the error information for a given code
     def get_error(self, code):
         try:
-            with open("src/errors.json", "r") as f:
-                errors = json.load(f)
-                return errors.get(str(code), {
-                    "code": code,
-                    "source": "Unknown",
-                    "issue": "Unknown error code.",
-                    "effects": "Unknown effects.",
-                    "fix": "Please post an issue on the GitHub repository including the steps taken to get this error."
-                })
+            error = _error_catalog.get(code)
+            if error is not None:
+                return error
+            return {
+                "code": code,
+                "source": "Unknown",
+                "issue": "Unknown error code.",
+                "effects": "Unknown effects.",
+                "fix": "Please post an issue on the GitHub repository including the steps taken to get this error."
+            }
         except Exception as e:
             print(f"Error loading errors.json: {e}")
             return {
@@ -1186,52 +2738,2657 @@ class ErrorManagerAPI:
                 "fix": "Check errors.json file."
             }
     
-    # Logs the error data to data/error_log.txt and manages log size
+    # Queues the error data for data/error_log.txt, which is rotated to old_error_log.txt past MAX_ERROR_LOG_SIZE
     def log_error(self, error_data):
-        if os.path.exists("data/error_log.txt") and os.path.getsize("data/error_log.txt") > MAX_ERROR_LOG_SIZE:
-            os.rename("data/error_log.txt", "data/old_error_log.txt")
+        _error_log.append(json.dumps(error_data) + "\n")
+        _log.log("error", str(error_data.get("code", "ERR")), "%s", error_data.get("issue", ""))
 
-        with open("data/error_log.txt", "a") as f:
-            f.write(json.dumps(error_data) + "\n")
+    # Returns recent backend log records; pass the returned cursor as since to get only newer ones
+    def get_logs(self, level=None, since=None, category=None, limit=None):
+        try:
+            result = _log.records(level, since, category, limit)
+        except (KeyError, TypeError, ValueError) as e:
+            return {"success": False, "error": f"Invalid log query: {e}"}
+        result["success"] = True
+        result["level"] = _log.level()
+        return result
+
+    # Sets the lowest level the backend records
+    def set_log_level(self, level):
+        try:
+            return {"success": True, "level": _log.set_level(level)}
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
 
+    def get_log_stats(self):
+        return {"success": True, "log": _log.stats(), "error_log": _error_log.stats()}
 
-# API for file management between the app and the system(s)
-class FileManagerAPI:
-    def _resolve_path(self, path):
+
+_NATURAL_SORT_SPLIT = re.compile(r"(\d+)")
+
+# Sort key that orders "file2" before "file10"
+def _natural_sort_key(name):
+    return [int(part) if part.isdigit() else part.casefold() for part in _NATURAL_SORT_SPLIT.split(name)]
+
+_LIST_DIRECTORY_SORT_KEYS = {
+    "name": lambda item: item['name'].casefold(),
+    "natural": lambda item: _natural_sort_key(item['name']),
+    "size": lambda item: (item['size'], item['name'].casefold()),
+    "mtime": lambda item: (item['modified'], item['name'].casefold()),
+    "date": lambda item: (item['modified'], item['name'].casefold()),
+    "type": lambda item: (item['type'] != 'folder', item['name'].casefold()),
+}
+
+# Normalizes an extension filter ("png", ".PNG", ["jpg", "png"]) to a set like {".png"}
+def _normalize_extension_filter(extensions):
+    if not extensions:
+        return set()
+    if isinstance(extensions, str):
+        extensions = extensions.split(",")
+    normalized = set()
+    for ext in extensions:
+        value = str(ext or "").strip().lower()
+        if value:
+            normalized.add(value if value.startswith(".") else f".{value}")
+    return normalized
+
+# LRU cache of directory listings, validated by the directory's device, inode and mtime
+# Bounded by the total number of cached entries across all directories
+class DirectoryListingCache:
+    def __init__(self, max_entries=LISTING_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._listings = collections.OrderedDict()  # path -> {"signature", "items", "views"}
+        self._cached_entries = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "invalidations": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+    @staticmethod
+    def _signature(path):
+        stat_info = os.stat(path)
+        return (stat_info.st_dev, stat_info.st_ino, stat_info.st_mtime_ns)
+
+    # Returns the sorted listing for path, calling scan() on a miss and sort(items) once per view
+    def get(self, path, scan, sort, view_key):
+        key = self._key(path)
+        signature = self._signature(path)
+
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and cached["signature"] != signature:
+                self._remove(key)
+                self._stats["stale"] += 1
+                cached = None
+
+            if cached is not None:
+                self._listings.move_to_end(key)
+                self._stats["hits"] += 1
+                view = cached["views"].get(view_key)
+                if view is not None:
+                    return view
+                items = cached["items"]
+            else:
+                self._stats["misses"] += 1
+                items = None
+
+        if items is None:
+            items = scan(path)
+        view = sort(items)
+
+        # Directories modified within the timestamp granularity window may change again
+        # without a visible mtime change, so they are not cached yet
+        if time.time_ns() - signature[2] < LISTING_CACHE_RACY_WINDOW_NS:
+            return view
+
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is None or cached["signature"] != signature:
+                if cached is not None:
+                    self._remove(key)
+                cached = {"signature": signature, "items": items, "views": {}}
+                self._listings[key] = cached
+                self._cached_entries += len(items)
+            cached["views"][view_key] = view
+            self._evict()
+        return view
+
+    # Drops the listing containing path and any cached listings at or below path
+    def invalidate(self, path):
+        self.invalidate_many([path])
+
+    # Same as invalidate for many paths, in a single pass over the cache
+    def invalidate_many(self, paths):
+        keys = {self._key(path) for path in paths if path}
+        if not keys:
+            return
+        exact_keys = keys | {os.path.dirname(key) for key in keys}
+        prefixes = tuple(key.rstrip(os.sep) + os.sep for key in keys)
+
+        with self._lock:
+            stale_keys = [
+                cached_key for cached_key in self._listings
+                if cached_key in exact_keys or cached_key.startswith(prefixes)
+            ]
+            for cached_key in stale_keys:
+                self._remove(cached_key)
+            if stale_keys:
+                self._stats["invalidations"] += len(stale_keys)
+
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+            self._cached_entries = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["directories"] = len(self._listings)
+            stats["cached_entries"] = self._cached_entries
+            stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] / lookups) if lookups else 0.0
+        return stats
+
+    def _remove(self, key):
+        cached = self._listings.pop(key, None)
+        if cached is not None:
+            self._cached_entries -= len(cached["items"])
+
+    def _evict(self):
+        while self._cached_entries > self.max_entries and len(self._listings) > 1:
+            oldest_key = next(iter(self._listings))
+            self._remove(oldest_key)
+            self._stats["evictions"] += 1
+
+_directory_listing_cache = DirectoryListingCache()
+
+# Pushes recursive folder size updates to the frontend as a 'sanctum-folder-size-event' window event
+def _dispatch_folder_size_event(updates):
+    if not updates:
+        return False
+    return _dispatch_window_event(
+        "sanctum-folder-size-event", "handleSanctumFolderSizeEvent",
+        {"event": "folder-sizes", "folders": updates}, "FSIZE"
+    )
+
+# Recursive folder sizes and file counts for listings, computed on a background thread
+# Each directory keeps its own direct file bytes and count plus its subdirectories, validated
+# against the directory mtime. Totals are the own figures plus the subdirectory totals, so a
+# recheck only lists directories whose mtime changed, and a change made by the backend only
+# rescans one directory and re-adds the totals of the parents above it
+class FolderSizeAggregator:
+    def __init__(self, max_entries=FOLDER_SIZE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._nodes = collections.OrderedDict()  # path -> own figures, subdirectories and totals
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._queued = set()
+        self._thread = None
+        self._stats = {"computed": 0, "scanned": 0, "reused": 0, "changes": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+    # Returns the known totals for a folder and queues a (re)computation when they are
+    # missing, incomplete or older than FOLDER_SIZE_REVALIDATE_SECONDS
+    def lookup(self, path):
+        key = self._key(path)
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is not None:
+                self._nodes.move_to_end(key)
+                result = self._public(node)
+                fresh = node["complete"] and time.monotonic() - node["checked"] < FOLDER_SIZE_REVALIDATE_SECONDS
+            else:
+                result = {"size": 0, "file_count": 0, "size_state": "computing"}
+                fresh = False
+        if not fresh:
+            self._enqueue("compute", key)
+        return result
+
+    # Queues an incremental update for a path the backend wrote, deleted or moved
+    def notify_changed(self, path):
+        if path and self._nodes:
+            self._enqueue("changed", self._key(path))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["directories"] = len(self._nodes)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    @staticmethod
+    def _public(node):
+        return {
+            "size": node["size"],
+            "file_count": node["files"],
+            "size_state": "ready" if node["complete"] else "computing"
+        }
+
+    def _enqueue(self, kind, key):
+        with self._lock:
+            if (kind, key) in self._queued:
+                return
+            self._queued.add((kind, key))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="FolderSizes", daemon=True)
+                self._thread.start()
+        self._queue.put((kind, key))
+
+    def _run(self):
+        while True:
+            kind, key = self._queue.get()
+            with self._lock:
+                self._queued.discard((kind, key))
+                node = self._nodes.get(key)
+                # An earlier walk of a parent folder may already have covered this one
+                if kind == "compute" and node is not None and node["complete"] and \
+                        time.monotonic() - node["checked"] < FOLDER_SIZE_REVALIDATE_SECONDS:
+                    continue
+            try:
+                if kind == "compute":
+                    self._compute(key)
+                else:
+                    self._apply_change(key)
+            except Exception as e:
+                print(f"FSIZE: Error computing folder sizes for {key}: {e}")
+
+    # Walks the tree below root, rescanning only directories whose mtime changed
+    def _compute(self, root):
+        try:
+            root_dev = os.stat(root).st_dev
+        except OSError:
+            self._drop_tree(root)
+            return
+        before = self._snapshot(root)
+
+        stack = [(root, False)]
+        while stack:
+            directory, children_done = stack.pop()
+            if children_done:
+                self._update_totals(directory)
+                continue
+            subdirectories = self._scan_own(directory, root_dev)
+            if subdirectories is None:
+                continue
+            stack.append((directory, True))
+            stack.extend((child, False) for child in subdirectories)
+
+        with self._lock:
+            self._stats["computed"] += 1
+        updates = self._propagate(os.path.dirname(root))
+        if self._snapshot(root) != before:
+            updates.insert(0, self._update_for(root))
+        _dispatch_folder_size_event([update for update in updates if update])
+
+    # Refreshes a directory's own figures; returns its subdirectories, or None if it is gone
+    def _scan_own(self, directory, root_dev):
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._drop_tree(directory)
+            return None
+
+        with self._lock:
+            node = self._nodes.get(directory)
+            if node is not None and node["mtime_ns"] == mtime_ns:
+                self._stats["reused"] += 1
+                return node["subdirs"]
+
+        own_size = 0
+        own_files = 0
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Like du -x, other filesystems mounted inside the tree are not counted
+                            if entry.stat(follow_symlinks=False).st_dev == root_dev:
+                                subdirectories.append(self._key(entry.path))
+                        else:
+                            own_size += entry.stat(follow_symlinks=False).st_size
+                            own_files += 1
+                    except OSError:
+                        continue
+        except OSError as e:
+            log_debug("FSIZE", "Skipping %s: %s", directory, e)
+
+        # Directories changed within the timestamp granularity window are rescanned next time
+        if time.time_ns() - mtime_ns < LISTING_CACHE_RACY_WINDOW_NS:
+            mtime_ns = None
+
+        with self._lock:
+            previous = self._nodes.get(directory)
+            self._nodes[directory] = {
+                "mtime_ns": mtime_ns,
+                "own_size": own_size,
+                "own_files": own_files,
+                "subdirs": tuple(subdirectories),
+                "size": previous["size"] if previous else own_size,
+                "files": previous["files"] if previous else own_files,
+                "complete": False,
+                "checked": 0.0
+            }
+            self._nodes.move_to_end(directory)
+            self._stats["scanned"] += 1
+            self._evict()
+        return subdirectories
+
+    # Recomputes a directory's totals from its own figures and its subdirectories' totals
+    # Returns True if the totals changed
+    def _update_totals(self, directory):
+        with self._lock:
+            node = self._nodes.get(directory)
+            if node is None:
+                return False
+            size = node["own_size"]
+            files = node["own_files"]
+            complete = True
+            for child in node["subdirs"]:
+                child_node = self._nodes.get(child)
+                if child_node is None:
+                    complete = False
+                    continue
+                size += child_node["size"]
+                files += child_node["files"]
+                complete = complete and child_node["complete"]
+            changed = (size, files, complete) != (node["size"], node["files"], node["complete"])
+            node.update(size=size, files=files, complete=complete, checked=time.monotonic())
+            return changed
+
+    # Re-adds totals up the chain of cached parents; returns updates for those that changed
+    def _propagate(self, directory):
+        updates = []
+        while directory in self._nodes:
+            if self._update_totals(directory):
+                updates.append(self._update_for(directory))
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+        return updates
+
+    def _apply_change(self, path):
+        with self._lock:
+            self._stats["changes"] += 1
+            is_cached_directory = path in self._nodes
+        # A folder that was deleted, moved or replaced takes its cached subtree with it
+        if is_cached_directory:
+            self._drop_tree(path)
+
+        parent = os.path.dirname(path)
+        with self._lock:
+            node = self._nodes.get(parent)
+            if node is None:
+                # Mark the nearest cached parent stale so its next lookup rechecks the tree
+                ancestor = os.path.dirname(parent)
+                while ancestor not in self._nodes and os.path.dirname(ancestor) != ancestor:
+                    ancestor = os.path.dirname(ancestor)
+                if ancestor in self._nodes:
+                    self._nodes[ancestor]["checked"] = 0.0
+                return
+            # A write changes a file's size without touching the directory mtime
+            node["mtime_ns"] = None
+
+        try:
+            root_dev = os.stat(parent).st_dev
+        except OSError:
+            self._drop_tree(parent)
+            return
+        subdirectories = self._scan_own(parent, root_dev) or ()
+        for child in subdirectories:
+            if child not in self._nodes:
+                self._enqueue("compute", child)
+        _dispatch_folder_size_event(self._propagate(parent))
+
+    def _drop_tree(self, path):
+        prefix = path.rstrip(os.sep) + os.sep
+        with self._lock:
+            for key in [key for key in self._nodes if key == path or key.startswith(prefix)]:
+                del self._nodes[key]
+
+    def _snapshot(self, path):
+        with self._lock:
+            node = self._nodes.get(path)
+            return (node["size"], node["files"], node["complete"]) if node else None
+
+    def _update_for(self, path):
+        with self._lock:
+            node = self._nodes.get(path)
+            return dict(self._public(node), path=path) if node else None
+
+    def _evict(self):
+        while len(self._nodes) > self.max_entries:
+            self._nodes.popitem(last=False)
+            self._stats["evictions"] += 1
+
+_folder_sizes = FolderSizeAggregator()
+
+_FILE_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_parent ON files(parent);
+CREATE INDEX IF NOT EXISTS files_name_lower ON files(name_lower);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Trigram full-text index over lowercase names, used for substring and fuzzy search
+# Needs SQLite 3.34+; search falls back to LIKE scans when it is unavailable
+_FILE_INDEX_TRIGRAM_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    name_lower, content='files', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS files_fts_insert AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, name_lower) VALUES (new.id, new.name_lower);
+END;
+CREATE TRIGGER IF NOT EXISTS files_fts_delete AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, name_lower) VALUES ('delete', old.id, old.name_lower);
+END;
+"""
+
+def _path_is_within(path, root):
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+_FILE_INDEX_COLUMNS = "files.path, files.name, files.name_lower, files.is_dir, files.size, files.mtime_ns"
+
+# Ranks an indexed name against a lowercase query
+# Exact and prefix matches rank above substring matches, which rank above fuzzy matches
+def _score_file_name(query, name_lower):
+    if name_lower == query:
+        return 1000
+    if os.path.splitext(name_lower)[0] == query:
+        return 980
+    extra_length = min(len(name_lower) - len(query), 50)
+    if name_lower.startswith(query):
+        return 900 - extra_length
+    position = name_lower.find(query)
+    if position >= 0:
+        at_word_start = not name_lower[position - 1].isalnum()
+        return (800 if at_word_start else 700) - min(position, 50) - extra_length
+    ratio = fuzz.partial_ratio(query, name_lower)
+    return ratio * 6 if ratio >= 60 else 0
+
+# Persistent filename index over DATA_DIR and user-approved roots, stored with sqlite3
+# A background thread builds it, applies queued updates from FileManagerAPI mutations
+# and rescans changed directories (by mtime) every FILE_INDEX_RESCAN_INTERVAL_SECONDS
+class FileIndex:
+    def __init__(self):
+        self.db_path = None
+        self.has_trigram = False
+        self._queue = queue.Queue()
+        self._thread = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._status = {"ready": False, "scanning": False, "last_scan": None, "last_scan_seconds": None, "error": None}
+
+    # Starts the indexer thread; the database lives in the current DATA_DIR
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.db_path = os.path.join(DATA_DIR, FILE_INDEX_DB_NAME)
+            self._thread = threading.Thread(target=self._run, name="FileIndex", daemon=True)
+            self._thread.start()
+
+    # Queues an incremental update for a path changed by the backend
+    def notify_changed(self, path):
+        if path and self._thread is not None:
+            self._queue.put(("path", os.path.normpath(os.path.abspath(path))))
+
+    def rescan(self):
+        if self._thread is not None:
+            self._queue.put(("rescan", None))
+
+    def add_root(self, path):
+        root = os.path.normpath(os.path.abspath(path))
+        if not os.path.isdir(root):
+            raise FileNotFoundError(f"Directory not found: {root}")
+        self._queue.put(("add_root", root))
+        return root
+
+    def remove_root(self, path):
+        root = os.path.normpath(os.path.abspath(path))
+        self._queue.put(("remove_root", root))
+        return root
+
+    def status(self):
+        status = dict(self._status)
+        status["db_path"] = self.db_path
+        status["trigram"] = self.has_trigram
+        status["pending_updates"] = self._queue.qsize()
+        connection = self._reader()
+        if connection is not None:
+            status["roots"] = self._roots(connection)
+            status["indexed"] = connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        else:
+            status["roots"] = []
+            status["indexed"] = 0
+        return status
+
+    # Returns up to limit ranked matches for query
+    def search(self, query, limit=FILE_INDEX_SEARCH_LIMIT):
+        query = str(query or "").strip().lower()
+        connection = self._reader()
+        if not query or connection is None:
+            return []
+
+        rows = {}
+        def collect(sql, params):
+            for row in connection.execute(sql, params):
+                rows.setdefault(row[0], row)
+
+        # Prefix matches come straight off the name_lower index
+        collect(
+            f"SELECT {_FILE_INDEX_COLUMNS} FROM files WHERE name_lower >= ? AND name_lower < ? LIMIT ?",
+            (query, query + "\U0010ffff", FILE_INDEX_FUZZY_CANDIDATES)
+        )
+        if self.has_trigram and len(query) >= 3:
+            phrase = '"' + query.replace('"', '""') + '"'
+            collect(
+                f"SELECT {_FILE_INDEX_COLUMNS} FROM files_fts JOIN files ON files.id = files_fts.rowid "
+                "WHERE files_fts MATCH ? LIMIT ?",
+                (phrase, FILE_INDEX_FUZZY_CANDIDATES)
+            )
+            if len(rows) < limit:
+                # Typo tolerance: names sharing the most trigrams with the query, rescored below
+                # Each trigram's postings are capped, which keeps common trigrams cheap; ranking
+                # all OR matches with bm25 costs hundreds of milliseconds on large indexes
+                shared_trigrams = collections.Counter()
+                for trigram in {query[i:i + 3] for i in range(len(query) - 2)}:
+                    shared_trigrams.update(row[0] for row in connection.execute(
+                        "SELECT rowid FROM files_fts WHERE files_fts MATCH ? LIMIT ?",
+                        ('"' + trigram.replace('"', '""') + '"', FILE_INDEX_TRIGRAM_POSTINGS)
+                    ))
+                candidate_ids = [row_id for row_id, _ in shared_trigrams.most_common(FILE_INDEX_FUZZY_CANDIDATES)]
+                if candidate_ids:
+                    collect(
+                        f"SELECT {_FILE_INDEX_COLUMNS} FROM files WHERE id IN ({','.join('?' * len(candidate_ids))})",
+                        candidate_ids
+                    )
+        else:
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            collect(
+                f"SELECT {_FILE_INDEX_COLUMNS} FROM files WHERE name_lower LIKE ? ESCAPE '\\' LIMIT ?",
+                (f"%{escaped}%", FILE_INDEX_FUZZY_CANDIDATES)
+            )
+
+        results = []
+        for path, name, name_lower, is_dir, size, mtime_ns in rows.values():
+            score = _score_file_name(query, name_lower)
+            if score <= 0:
+                continue
+            results.append({
+                'name': name,
+                'path': path,
+                'type': 'folder' if is_dir else 'file',
+                'size': size,
+                'modified': mtime_ns // 1000000,
+                'score': score
+            })
+        results.sort(key=lambda item: (-item['score'], len(item['name']), item['path']))
+        return results[:limit]
+
+    # Read connections are per thread; WAL mode lets them run alongside the indexer
+    def _reader(self):
+        if not self._status["ready"]:
+            return None
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.db_path != self.db_path:
+            connection = sqlite3.connect(self.db_path)
+            connection.execute("PRAGMA query_only = ON")
+            self._local.connection = connection
+            self._local.db_path = self.db_path
+        return connection
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.executescript(_FILE_INDEX_SCHEMA)
+        try:
+            connection.executescript(_FILE_INDEX_TRIGRAM_SCHEMA)
+            self.has_trigram = True
+        except sqlite3.OperationalError as e:
+            log_info("FIDX", "Trigram search unavailable (%s), using LIKE scans", e)
+            self.has_trigram = False
+        connection.commit()
+        return connection
+
+    def _run(self):
+        try:
+            connection = self._connect()
+        except Exception as e:
+            self._status["error"] = str(e)
+            print(f"FIDX-E1: Error opening file index {self.db_path}: {e}")
+            return
+
+        # An index left by a previous run is searchable while the first rescan runs
+        self._status["ready"] = True
+        next_rescan = 0.0
+        while True:
+            try:
+                task = self._queue.get(timeout=max(0.0, next_rescan - time.monotonic()))
+            except queue.Empty:
+                task = ("rescan", None)
+
+            # Coalesce queued path updates so a burst of writes refreshes each directory once
+            tasks = [task]
+            while True:
+                try:
+                    tasks.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                changed_paths = []
+                for kind, path in tasks:
+                    if kind == "path":
+                        if path not in changed_paths:
+                            changed_paths.append(path)
+                    elif kind == "add_root":
+                        connection.execute("INSERT OR IGNORE INTO roots(path) VALUES (?)", (path,))
+                        connection.commit()
+                        self._scan_tree(connection, path)
+                    elif kind == "remove_root":
+                        connection.execute("DELETE FROM roots WHERE path = ?", (path,))
+                        if not self._root_for(connection, path):
+                            self._remove_tree(connection, path)
+                        connection.commit()
+                    elif kind == "rescan":
+                        self._rescan_all(connection)
+                        next_rescan = time.monotonic() + FILE_INDEX_RESCAN_INTERVAL_SECONDS
+                for path in changed_paths:
+                    self._refresh_path(connection, path)
+                connection.commit()
+            except Exception as e:
+                connection.rollback()
+                self._status["error"] = str(e)
+                print(f"FIDX-E2: Error updating file index: {e}")
+
+    def _roots(self, connection):
+        roots = [os.path.normpath(os.path.abspath(DATA_DIR))]
+        for (path,) in connection.execute("SELECT path FROM roots ORDER BY path"):
+            if path not in roots:
+                roots.append(path)
+        return roots
+
+    def _root_for(self, connection, path):
+        for root in self._roots(connection):
+            if _path_is_within(path, root):
+                return root
+        return None
+
+    def _rescan_all(self, connection):
+        started = time.monotonic()
+        self._status["scanning"] = True
+        try:
+            roots = self._roots(connection)
+            # Drop rows left behind by roots that are no longer indexed (e.g. a moved DATA_DIR)
+            for (path,) in connection.execute("SELECT path FROM dirs").fetchall():
+                if not any(_path_is_within(path, root) for root in roots):
+                    self._remove_tree(connection, path)
+            for root in roots:
+                self._scan_tree(connection, root)
+            connection.commit()
+        finally:
+            self._status["scanning"] = False
+        self._status["last_scan"] = time.time()
+        self._status["last_scan_seconds"] = round(time.monotonic() - started, 3)
+        self._status["error"] = None
+
+    # Walks a tree, rescanning only directories whose mtime changed since the last scan
+    def _scan_tree(self, connection, root):
+        pending_rows = 0
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._remove_tree(connection, directory)
+                continue
+
+            known = connection.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (directory,)).fetchone()
+            if known is not None and known[0] == mtime_ns:
+                stack.extend(row[0] for row in connection.execute(
+                    "SELECT path FROM files WHERE parent = ? AND is_dir = 1", (directory,)
+                ))
+                continue
+
+            subdirectories, written = self._index_directory(connection, directory, mtime_ns)
+            stack.extend(subdirectories)
+            pending_rows += written
+            if pending_rows >= FILE_INDEX_COMMIT_ROWS:
+                connection.commit()
+                pending_rows = 0
+
+    # Diffs one directory against its indexed rows and writes the changes
+    # Returns the subdirectories to descend into and the number of rows written
+    def _index_directory(self, connection, directory, mtime_ns):
+        indexed = {
+            row[0]: row[1:] for row in connection.execute(
+                "SELECT path, is_dir, size, mtime_ns FROM files WHERE parent = ?", (directory,)
+            )
+        }
+        index_files = {self.db_path, self.db_path + "-wal", self.db_path + "-shm"}
+        subdirectories = []
+        upserts = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.path in index_files or _is_internal_data_path(entry.path) or _is_atomic_temp_name(entry.name):
+                        continue
+                    try:
+                        # Symlinked folders are indexed by name but not followed
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        stat_info = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    values = (1 if is_dir else 0, 0 if is_dir else stat_info.st_size, stat_info.st_mtime_ns)
+                    if is_dir:
+                        subdirectories.append(entry.path)
+                    if indexed.pop(entry.path, None) != values:
+                        name = entry.name
+                        upserts.append((entry.path, directory, name, name.lower(), os.path.splitext(name)[1].lower()) + values)
+        except OSError as e:
+            log_debug("FIDX", "Skipping %s: %s", directory, e)
+            return [], 0
+
+        if upserts:
+            connection.executemany(
+                "INSERT INTO files(path, parent, name, name_lower, extension, is_dir, size, mtime_ns) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET is_dir = excluded.is_dir, size = excluded.size, mtime_ns = excluded.mtime_ns",
+                upserts
+            )
+        for removed_path in indexed:
+            self._remove_tree(connection, removed_path)
+
+        # A directory changed within the timestamp granularity window may change again without
+        # a visible mtime change, so it is recorded as unscanned and read again next time
+        if time.time_ns() - mtime_ns < LISTING_CACHE_RACY_WINDOW_NS:
+            mtime_ns = 0
+        connection.execute(
+            "INSERT INTO dirs(path, mtime_ns) VALUES (?, ?) ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns",
+            (directory, mtime_ns)
+        )
+        return subdirectories, len(upserts) + len(indexed)
+
+    # Refreshes the parent listing of a changed path, then the path's own tree if it is a folder
+    def _refresh_path(self, connection, path):
+        if self._root_for(connection, path) is None:
+            return
+        parent = os.path.dirname(path)
+        if self._root_for(connection, parent) is not None:
+            try:
+                self._index_directory(connection, parent, os.stat(parent).st_mtime_ns)
+            except OSError:
+                self._remove_tree(connection, parent)
+        if _is_internal_data_path(path) or _is_atomic_temp_name(os.path.basename(path)):
+            return
+        if os.path.isdir(path) and not os.path.islink(path):
+            self._scan_tree(connection, path)
+
+    # Removes a path and everything indexed below it
+    # Descendants sort between "path/" and the next character after the separator
+    def _remove_tree(self, connection, path):
+        low = path.rstrip(os.sep) + os.sep
+        high = path.rstrip(os.sep) + chr(ord(os.sep) + 1)
+        connection.execute("DELETE FROM files WHERE path = ? OR (path >= ? AND path < ?)", (path, low, high))
+        connection.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (path, low, high))
+
+_file_index = FileIndex()
+
+# Called after FileManagerAPI changes a path so cached listings and the file index stay current
+def _notify_path_changed(path):
+    _directory_listing_cache.invalidate(path)
+    _file_index.notify_changed(path)
+    _folder_sizes.notify_changed(path)
+
+# Batch form of _notify_path_changed for bulk operations
+# Listings are invalidated in one pass and each parent folder is refreshed once instead of once per item
+def _notify_paths_changed(paths):
+    paths = list(dict.fromkeys(os.path.normpath(os.path.abspath(path)) for path in paths if path))
+    _directory_listing_cache.invalidate_many(paths)
+    parents = {}
+    for path in paths:
+        parents.setdefault(os.path.dirname(path), path)
+    for parent, path in parents.items():
+        # Refreshing the parent also walks any folder trees that were copied or moved into it
+        _file_index.notify_changed(parent)
+        _folder_sizes.notify_changed(path)
+
+
+# Pushes a file job snapshot to the frontend as a 'sanctum-file-job-event' window event
+def _dispatch_file_job_event(event_name, job):
+    return _dispatch_window_event(
+        "sanctum-file-job-event", "handleSanctumFileJobEvent",
+        {"event": event_name, "job": job}, "FJOB"
+    )
+
+# A background copy, move or delete with progress counters, pause and cancel
+class FileJob:
+    def __init__(self, kind, src, dest=None):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.src = src
+        self.dest = dest
+        self.state = "queued"  # queued, scanning, running, paused, completed, cancelled, failed
+        self.error = None
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.files_total = 0
+        self.files_done = 0
+        self.current_path = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._cancelled = False
+        self._paused_seconds = 0.0
+        self._paused_at = None
+        self._last_progress_event = 0.0
+
+    def pause(self):
+        with self._lock:
+            if self.state not in ("queued", "scanning", "running") or self._paused_at is not None:
+                return False
+            self._paused_at = time.monotonic()
+            self._resume_event.clear()
+        return True
+
+    def resume(self):
+        with self._lock:
+            if self._paused_at is None:
+                return False
+            self._paused_seconds += time.monotonic() - self._paused_at
+            self._paused_at = None
+            self._resume_event.set()
+        return True
+
+    def cancel(self):
+        with self._lock:
+            if self.state in ("completed", "cancelled", "failed"):
+                return False
+            self._cancelled = True
+            self._resume_event.set()
+        return True
+
+    @property
+    def is_paused(self):
+        return self._paused_at is not None
+
+    # Blocks while the job is paused; raises CallCancelledError once it is cancelled
+    def checkpoint(self):
+        while not self._resume_event.wait(0.25):
+            pass
+        if self._cancelled:
+            raise CallCancelledError(f"File job {self.job_id} cancelled.")
+
+    def add_progress(self, byte_count=0, file_count=0, current_path=None):
+        with self._lock:
+            self.bytes_done += byte_count
+            self.files_done += file_count
+            if current_path is not None:
+                self.current_path = current_path
+            now = time.monotonic()
+            if now - self._last_progress_event < FILE_JOB_PROGRESS_INTERVAL_SECONDS:
+                return
+            self._last_progress_event = now
+        _dispatch_file_job_event("progress", self.snapshot())
+
+    def snapshot(self):
+        with self._lock:
+            active_seconds = 0.0
+            if self.started is not None:
+                end = self.finished if self.finished is not None else time.time()
+                paused = self._paused_seconds
+                if self._paused_at is not None:
+                    paused += time.monotonic() - self._paused_at
+                active_seconds = max(0.0, end - self.started - paused)
+            rate = self.bytes_done / active_seconds if active_seconds > 0 else 0.0
+            remaining = max(0, self.bytes_total - self.bytes_done)
+            state = "paused" if self._paused_at is not None and self.state in ("queued", "scanning", "running") else self.state
+            return {
+                "job_id": self.job_id,
+                "kind": self.kind,
+                "src": self.src,
+                "dest": self.dest,
+                "state": state,
+                "error": self.error,
+                "bytes_total": self.bytes_total,
+                "bytes_done": self.bytes_done,
+                "files_total": self.files_total,
+                "files_done": self.files_done,
+                "percent": round(100.0 * self.bytes_done / self.bytes_total, 1) if self.bytes_total else (100.0 if state == "completed" else 0.0),
+                "bytes_per_second": int(rate),
+                "eta_seconds": round(remaining / rate, 1) if rate > 0 and state == "running" else None,
+                "current_path": self.current_path,
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished
+            }
+
+# Runs FileJobs on background threads, at most max_concurrent at a time
+# Files below FILE_JOB_SMALL_FILE_BYTES are copied in parallel on a shared bounded worker pool
+class FileJobManager:
+    def __init__(self, max_concurrent=FILE_JOB_MAX_CONCURRENT, workers=FILE_JOB_WORKERS):
+        self.max_concurrent = max_concurrent
+        self.workers = workers
+        self._jobs = collections.OrderedDict()
+        self._running = 0
+        self._condition = threading.Condition()
+        self._pool = None
+
+    def start(self, kind, src, dest=None):
+        if not os.path.lexists(src):
+            raise FileNotFoundError(f"Source not found: {src}")
+        if dest is not None and kind in ("copy", "move"):
+            if os.path.isdir(dest) and (kind == "move" or not os.path.isdir(src)):
+                # Same convention as shutil.move: an existing folder destination receives the item
+                dest = os.path.join(dest, os.path.basename(src.rstrip(os.sep)))
+            src_key = os.path.normpath(os.path.abspath(src))
+            if _path_is_within(os.path.normpath(os.path.abspath(dest)), src_key):
+                raise ValueError("Cannot copy or move a folder into itself.")
+
+        job = FileJob(kind, src, dest)
+        with self._condition:
+            self._jobs[job.job_id] = job
+            self._prune()
+        threading.Thread(target=self._run, args=(job,), name=f"FileJob-{job.job_id[:8]}", daemon=True).start()
+        _dispatch_file_job_event("state", job.snapshot())
+        return job
+
+    def get(self, job_id):
+        with self._condition:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        with self._condition:
+            jobs = list(self._jobs.values())
+        return [job.snapshot() for job in jobs]
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished is not None]
+        for job_id in finished[:max(0, len(self._jobs) - FILE_JOB_HISTORY)]:
+            del self._jobs[job_id]
+
+    def _executor(self):
+        with self._condition:
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="FileJobWorker")
+            return self._pool
+
+    def _set_state(self, job, state, error=None):
+        with job._lock:
+            job.state = state
+            if error is not None:
+                job.error = error
+            if state in ("completed", "cancelled", "failed"):
+                job.finished = time.time()
+        _dispatch_file_job_event("state", job.snapshot())
+
+    def _run(self, job):
+        # Wait for a free slot; queued jobs can still be cancelled
+        with self._condition:
+            while (self._running >= self.max_concurrent or job.is_paused) and not job._cancelled:
+                self._condition.wait(0.25)
+            cancelled = job._cancelled
+            if not cancelled:
+                self._running += 1
+        # State events reach the window, so they are sent after the manager lock is released
+        if cancelled:
+            self._set_state(job, "cancelled")
+            return
+
+        try:
+            job.started = time.time()
+            if job.kind == "copy":
+                self._run_copy(job)
+            elif job.kind == "move":
+                self._run_move(job)
+            elif job.kind == "delete":
+                self._run_delete(job)
+            else:
+                raise ValueError(f"Unknown job kind: {job.kind}")
+            self._set_state(job, "completed")
+        except CallCancelledError:
+            self._set_state(job, "cancelled")
+        except Exception as e:
+            print(f"FJOB-E1: {job.kind} job {job.job_id} failed: {e}")
+            self._set_state(job, "failed", str(e))
+        finally:
+            if job.kind != "copy":
+                _notify_path_changed(job.src)
+            if job.dest:
+                _notify_path_changed(job.dest)
+            with self._condition:
+                self._running -= 1
+                self._condition.notify_all()
+
+    # Lists (src_file, dest_file, size) for every file below src, plus folders to create
+    def _scan(self, job, src, dest):
+        self._set_state(job, "scanning")
+        if not os.path.isdir(src) or os.path.islink(src):
+            size = os.lstat(src).st_size
+            job.files_total, job.bytes_total = 1, size
+            return [], [(src, dest, size)]
+
+        directories = [(src, dest)]
+        files = []
+        stack = [(src, dest)]
+        while stack:
+            job.checkpoint()
+            src_dir, dest_dir = stack.pop()
+            with os.scandir(src_dir) as entries:
+                for entry in entries:
+                    target = os.path.join(dest_dir, entry.name) if dest_dir is not None else None
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append((entry.path, target))
+                        stack.append((entry.path, target))
+                    else:
+                        size = entry.stat(follow_symlinks=False).st_size
+                        files.append((entry.path, target, size))
+                        job.files_total += 1
+                        job.bytes_total += size
+        return directories, files
+
+    # created collects dest when this call makes it, so a failed job can remove it again
+    def _copy_file(self, job, src, dest, size, created):
+        job.checkpoint()
+        if not os.path.lexists(dest):
+            created.append(dest)
+        if os.path.islink(src):
+            if os.path.lexists(dest):
+                os.unlink(dest)
+            os.symlink(os.readlink(src), dest)
+            job.add_progress(size, 1, src)
+            return
+        try:
+            _copy_file(src, dest, lambda byte_count: job.add_progress(byte_count, 0, src), job.checkpoint)
+            shutil.copystat(src, dest)
+        except CallCancelledError:
+            # Never leave a half-written file behind
+            try:
+                os.remove(dest)
+            except OSError:
+                pass
+            raise
+        job.add_progress(0, 1, src)
+
+    # Copies src to dest; a cancelled or failed copy removes the files and folders it created
+    # Returns the scanned (directories, files) of src
+    def _copy_tree(self, job, src, dest):
+        if os.path.isdir(dest) and os.path.isdir(src) and not os.path.islink(src):
+            raise FileExistsError(f"Destination already exists: {dest}")
+        directories, files = self._scan(job, src, dest)
+        self._set_state(job, "running")
+
+        created_directories = []
+        created_files = []  # appended to from pool threads
+        pool = self._executor()
+        pending = set()
+        try:
+            for _, dest_dir in directories:
+                if not os.path.isdir(dest_dir):
+                    os.makedirs(dest_dir)
+                    created_directories.append(dest_dir)
+
+            # Large files stream on the job thread; small ones fan out to the worker pool
+            for src_file, dest_file, size in files:
+                job.checkpoint()
+                if size >= FILE_JOB_SMALL_FILE_BYTES:
+                    self._copy_file(job, src_file, dest_file, size, created_files)
+                    continue
+                pending.add(pool.submit(self._copy_file, job, src_file, dest_file, size, created_files))
+                if len(pending) >= self.workers * 4:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+            for future in concurrent.futures.as_completed(pending):
+                future.result()
+
+            # Folder timestamps last, since copying files into them changes their mtime
+            for src_dir, dest_dir in reversed(directories):
+                shutil.copystat(src_dir, dest_dir)
+        except BaseException:
+            job.cancel()
+            concurrent.futures.wait(pending)
+            self._remove_created(created_files, created_directories)
+            raise
+        return directories, files
+
+    # Removes what a failed copy created; folders that still hold anything else are kept
+    def _remove_created(self, files, directories):
+        for path in files:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log_warning("FJOB", "Could not remove partial copy %s: %s", path, e)
+        for path in reversed(directories):
+            try:
+                os.rmdir(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log_warning("FJOB", "Could not remove partial copy folder %s: %s", path, e)
+
+    def _run_copy(self, job):
+        self._copy_tree(job, job.src, job.dest)
+
+    def _run_move(self, job):
+        try:
+            if os.path.lexists(job.dest) and os.path.isdir(job.dest):
+                raise FileExistsError(f"Destination already exists: {job.dest}")
+            os.rename(job.src, job.dest)
+            job.files_total = job.files_done = 1
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+        # Cross-device: copy everything first, then remove the source. Removing counts toward
+        # files_done, so files_total covers both passes; a cancel leaves the complete copy in place
+        directories, files = self._copy_tree(job, job.src, job.dest)
+        with job._lock:
+            job.files_total += len(files)
+        self._remove_scanned(job, directories, files, count_bytes=False)
+
+    def _run_delete(self, job):
+        directories, files = self._scan(job, job.src, None)
+        self._set_state(job, "running")
+        self._remove_scanned(job, directories, files, count_bytes=True)
+
+    # Deletes scanned files and then their folders, checking for pause and cancel before each
+    def _remove_scanned(self, job, directories, files, count_bytes):
+        for src_file, _, size in files:
+            job.checkpoint()
+            os.remove(src_file)
+            job.add_progress(size if count_bytes else 0, 1, src_file)
+        for src_dir, _ in reversed(directories):
+            job.checkpoint()
+            os.rmdir(src_dir)
+
+_file_job_manager = FileJobManager()
+
+def _fsync_directory(directory):
+    # Makes a rename durable; directories can't be opened for fsync on Windows
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+# Write-behind buffer for FileManagerAPI.write_file
+# Writes to the same path within WRITE_BEHIND_DELAY_SECONDS collapse into one. Every flush writes
+# temp files beside their targets, fsyncs them together, swaps them in with os.replace and then
+# fsyncs each parent directory once, so a crash leaves either the old or the new file
+class WriteBehindBuffer:
+    def __init__(self, delay=WRITE_BEHIND_DELAY_SECONDS, max_pending_bytes=WRITE_BEHIND_MAX_PENDING_BYTES):
+        self.delay = delay
+        self.max_pending_bytes = max_pending_bytes
+        self._pending = {}  # path -> [data, first write time]
+        self._in_flight = {}  # path -> data taken by the running flush and not yet swapped into place
+        self._pending_bytes = 0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()  # Keeps flushes of the same path in write order
+        self._thread = None
+        self._failures = 0  # flushes in a row that left data unwritten
+        self._retry_at = 0  # monotonic time before which the background thread doesn't retry failed data
+        self._saved_times = collections.deque()
+        self._started = time.monotonic()
+        self._stats = {"writes": 0, "coalesced": 0, "files_written": 0, "flushes": 0, "fsyncs": 0, "errors": 0}
+
+    @staticmethod
+    def _key(path):
+        return os.path.normpath(os.path.abspath(path))
+
+    # Queues data for path, replacing any data still pending for it
+    def write(self, path, data):
+        key = self._key(path)
+        with self._condition:
+            self._stats["writes"] += 1
+            pending = self._pending.get(key)
+            if pending is not None:
+                self._stats["coalesced"] += 1
+                self._saved_times.append(time.monotonic())
+                self._pending_bytes -= len(pending[0])
+                pending[0] = data
+            else:
+                self._pending[key] = [data, time.monotonic()]
+            self._pending_bytes += len(data)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="WriteBehind", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    # Returns data still waiting to be written for path, or None
+    # Data a flush is writing stays visible here until its os.replace has finished
+    def get(self, path):
+        key = self._key(path)
+        with self._condition:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending[0]
+            return self._in_flight.get(key)
+
+    def has_pending(self, path):
+        return self.get(path) is not None
+
+    # Drops pending writes at or below path (used before deletes); returns how many were dropped
+    def discard(self, path):
+        key = self._key(path)
+        with self._condition:
+            discarded = [p for p in self._pending if _path_is_within(p, key)]
+            for pending_path in discarded:
+                self._pending_bytes -= len(self._pending.pop(pending_path)[0])
+            writing = any(_path_is_within(p, key) for p in self._in_flight)
+        if writing:
+            # Wait for the running flush so it can't recreate the path after the caller deletes it,
+            # then drop anything it put back after failing
+            with self._flush_lock:
+                with self._condition:
+                    for pending_path in [p for p in self._pending if _path_is_within(p, key)]:
+                        self._pending_bytes -= len(self._pending.pop(pending_path)[0])
+        return len(discarded)
+
+    # Writes pending data (all of it, or only at or below path) and waits until it is durable
+    # Returns False if any file could not be written; that data stays pending and is retried,
+    # unless requeue is False (the caller reports the failure and drops the data itself)
+    def flush(self, path=None, requeue=True):
+        key = self._key(path) if path else None
+        with self._flush_lock:
+            with self._condition:
+                if not self._pending:
+                    return True
+                paths = [p for p in self._pending if key is None or _path_is_within(p, key)]
+                entries = []
+                for pending_path in paths:
+                    data = self._pending.pop(pending_path)[0]
+                    self._pending_bytes -= len(data)
+                    self._in_flight[pending_path] = data
+                    entries.append((pending_path, data))
+            if not entries:
+                return True
+            failed = entries
+            try:
+                failed = self._write_group(entries)
+            finally:
+                with self._condition:
+                    for pending_path, _ in entries:
+                        self._in_flight.pop(pending_path, None)
+                    if requeue:
+                        failures = self._requeue(failed, key is None)
+            # write_file already reported success to the caller, so show the first failure
+            if requeue and failed and failures == 1 and webview_window and not IS_MOBILE:
+                webview_window.evaluate_js('displayError("FMAPI-E3")')
+            return not failed
+
+    # Puts data that failed to write back unless a newer write has replaced it, and schedules
+    # the retry; callers hold _condition. A flush of everything that fully succeeds ends the
+    # failure episode. Returns how many flushes in a row have failed
+    def _requeue(self, failed, flushed_all):
+        now = time.monotonic()
+        for path, data in failed:
+            if path not in self._pending:
+                self._pending[path] = [data, now]
+                self._pending_bytes += len(data)
+        if failed:
+            self._failures += 1
+            self._retry_at = now + min(self.delay * 2 ** self._failures, WRITE_BEHIND_RETRY_MAX_SECONDS)
+        elif flushed_all or not self._pending:
+            self._failures = 0
+            self._retry_at = 0
+        return self._failures
+
+    def stats(self):
+        with self._condition:
+            now = time.monotonic()
+            while self._saved_times and now - self._saved_times[0] > WRITE_STATS_WINDOW_SECONDS:
+                self._saved_times.popleft()
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+            stats["pending_bytes"] = self._pending_bytes
+            window = min(WRITE_STATS_WINDOW_SECONDS, max(now - self._started, 1.0))
+            stats["saved_per_second"] = round(len(self._saved_times) / window, 3)
+            stats["delay_seconds"] = self.delay
+        return stats
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                oldest = min(first_write for _, first_write in self._pending.values())
+                now = time.monotonic()
+                wait_seconds = oldest + self.delay - now
+                if self._pending_bytes >= self.max_pending_bytes:
+                    wait_seconds = 0
+                wait_seconds = max(wait_seconds, self._retry_at - now)
+                if wait_seconds > 0:
+                    self._condition.wait(wait_seconds)
+                    continue
+            self.flush()
+
+    # Returns the entries that could not be written
+    def _write_group(self, entries):
+        failed = []
+        staged = []
+        files_written = 0
+        for path, data in entries:
+            temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp")
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(temp_path, "xb" if isinstance(data, (bytes, bytearray)) else "x") as temp_file:
+                    temp_file.write(data)
+                    temp_file.flush()
+                    os.fsync(temp_file.fileno())
+                if os.path.exists(path):
+                    shutil.copymode(path, temp_path)
+                staged.append((temp_path, path, data))
+            except Exception as e:
+                failed.append((path, data))
+                print(f"FMAPI-E3: Error writing file {path}: {e}")
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+        directories = set()
+        for temp_path, path, data in staged:
+            try:
+                os.replace(temp_path, path)
+                directories.add(os.path.dirname(path))
+                files_written += 1
+            except Exception as e:
+                failed.append((path, data))
+                print(f"FMAPI-E3: Error replacing file {path}: {e}")
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            finally:
+                _notify_path_changed(path)
+
+        for directory in directories:
+            try:
+                _fsync_directory(directory)
+            except OSError as e:
+                log_warning("FMAPI", "Could not fsync directory %s: %s", directory, e)
+        with self._condition:
+            self._stats["files_written"] += files_written
+            self._stats["errors"] += len(failed)
+            self._stats["flushes"] += 1
+            self._stats["fsyncs"] += len(staged) + len(directories)
+        return failed
+
+_write_behind = WriteBehindBuffer()
+atexit.register(_write_behind.flush)
+
+# Writes all write-behind data to disk; called on shutdown and available to apps
+def flush_writes():
+    return _write_behind.flush()
+
+_HASH_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (dev, inode, size, mtime_ns, algorithm)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS hashes_used ON hashes(used);
+"""
+
+_hash_buffers = threading.local()
+
+# Content hashes for get_file_hash/get_file_hashes
+# Digests are cached in sqlite under (device, inode, size, mtime) so an unchanged file is only
+# read once, even across renames and restarts. Misses are streamed through hashlib on a small
+# thread pool; hashlib releases the GIL for large updates, so files hash in parallel
+class FileHasher:
+    def __init__(self, workers=HASH_WORKERS, max_entries=HASH_CACHE_MAX_ENTRIES):
+        self.workers = workers
+        self.max_entries = max_entries
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        self._inserts_since_prune = 0
+        self._stats_lock = threading.Lock()
+        self._stats = {"requested": 0, "cache_hits": 0, "hashed": 0, "bytes_hashed": 0, "errors": 0}
+
+    @staticmethod
+    def normalize_algorithm(algorithm):
+        name = str(algorithm or HASH_DEFAULT_ALGORITHM).strip().lower()
+        # shake_* digests have no fixed length, so they can't be cached under one key
+        if name not in hashlib.algorithms_guaranteed or name.startswith("shake_"):
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+        return name
+
+    # Returns {path: (hex digest or None, error or None, cached)} for absolute paths
+    def hash_files(self, paths, algorithm=HASH_DEFAULT_ALGORITHM):
+        algorithm = self.normalize_algorithm(algorithm)
+        results = {}
+        keys = {}
+        for path in dict.fromkeys(paths):
+            try:
+                stat_info = os.stat(path)
+                if not os.path.isfile(path):
+                    raise IsADirectoryError(f"Not a file: {path}")
+                keys[path] = (stat_info.st_dev, stat_info.st_ino, stat_info.st_size, stat_info.st_mtime_ns)
+            except OSError as e:
+                results[path] = (None, str(e), False)
+
+        connection = self._connection()
+        now = time.time()
+        misses = []
+        hits = []
+        for path, key in keys.items():
+            row = None
+            if connection is not None:
+                row = connection.execute(
+                    "SELECT digest FROM hashes WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ? AND algorithm = ?",
+                    key + (algorithm,)
+                ).fetchone()
+            if row is not None:
+                results[path] = (row[0], None, True)
+                hits.append(key)
+            else:
+                misses.append(path)
+
+        computed = []
+        if misses:
+            cancelled = threading.Event()
+            futures = {
+                self._executor().submit(self._digest, path, algorithm, keys[path], cancelled): path
+                for path in misses
+            }
+            try:
+                pending = set(futures)
+                while pending:
+                    done, pending = concurrent.futures.wait(pending, timeout=0.1)
+                    for future in done:
+                        path = futures[future]
+                        try:
+                            digest, stable = future.result()
+                            results[path] = (digest, None, False)
+                            if stable:
+                                computed.append(keys[path] + (algorithm, digest, now))
+                        except Exception as e:
+                            results[path] = (None, str(e), False)
+                    check_cancelled()
+            except CallCancelledError:
+                cancelled.set()
+                raise
+
+        if connection is not None and (hits or computed):
+            try:
+                with connection:
+                    connection.executemany(
+                        "UPDATE hashes SET used = ? WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ? AND algorithm = ?",
+                        [(now,) + key + (algorithm,) for key in hits]
+                    )
+                    connection.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)", computed)
+                self._inserts_since_prune += len(computed)
+                if self._inserts_since_prune >= max(1, self.max_entries // 10):
+                    self._prune(connection)
+            except sqlite3.Error as e:
+                log_warning("HASH", "Could not update hash cache: %s", e)
+
+        with self._stats_lock:
+            self._stats["requested"] += len(results)
+            self._stats["cache_hits"] += len(hits)
+            self._stats["hashed"] += sum(1 for path in misses if results[path][0] is not None)
+            self._stats["bytes_hashed"] += sum(keys[path][2] for path in misses if results[path][0] is not None)
+            self._stats["errors"] += sum(1 for result in results.values() if result[1] is not None)
+        return results
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        connection = self._connection()
+        stats["cached"] = connection.execute("SELECT COUNT(*) FROM hashes").fetchone()[0] if connection else 0
+        stats["db_path"] = os.path.join(DATA_DIR, HASH_DB_NAME)
+        return stats
+
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="FileHash")
+            return self._pool
+
+    # Connections are per thread and follow DATA_DIR, which app.py moves on Android
+    # Returns None when the cache can't be opened; hashing still works without it
+    def _connection(self):
+        db_path = os.path.join(DATA_DIR, HASH_DB_NAME)
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.db_path == db_path:
+            return connection
+        try:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            connection = sqlite3.connect(db_path, timeout=5)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(_HASH_CACHE_SCHEMA)
+            connection.commit()
+        except sqlite3.Error as e:
+            log_warning("HASH", "Hash cache unavailable at %s: %s", db_path, e)
+            connection = None
+        self._local.connection = connection
+        self._local.db_path = db_path
+        return connection
+
+    # Streams path through hashlib; returns the hex digest and whether it is safe to cache
+    def _digest(self, path, algorithm, key, cancelled):
+        buffer = getattr(_hash_buffers, "buffer", None)
+        if buffer is None:
+            buffer = _hash_buffers.buffer = bytearray(HASH_CHUNK_BYTES)
+        view = memoryview(buffer)
+        hasher = hashlib.new(algorithm)
+        with open(path, "rb", buffering=0) as file:
+            while True:
+                if cancelled.is_set():
+                    raise CallCancelledError("Call was cancelled")
+                read = file.readinto(buffer)
+                if not read:
+                    break
+                hasher.update(view[:read])
+            stat_info = os.fstat(file.fileno())
+
+        # A file written during hashing, or so recently that another write could keep the same
+        # mtime, is hashed but not cached
+        stable = (
+            (stat_info.st_dev, stat_info.st_ino, stat_info.st_size, stat_info.st_mtime_ns) == key
+            and time.time_ns() - stat_info.st_mtime_ns >= LISTING_CACHE_RACY_WINDOW_NS
+        )
+        return hasher.hexdigest(), stable
+
+    # Drops the least recently used digests once the cache grows past max_entries
+    def _prune(self, connection):
+        self._inserts_since_prune = 0
+        count = connection.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        with connection:
+            connection.execute(
+                "DELETE FROM hashes WHERE used <= (SELECT used FROM hashes ORDER BY used LIMIT 1 OFFSET ?)",
+                (count - self.max_entries,)
+            )
+
+_file_hasher = FileHasher()
+
+# Downscaled image thumbnails and screen-size display proxies
+# Images are decoded on a process pool (threads on mobile, where multiprocessing is unavailable)
+# and cached in DATA_DIR/thumbnails under their content hash, so copies and renames reuse the
+# same files. The cache is trimmed back below max_bytes, least recently used first
+class ThumbnailService:
+    def __init__(self, workers=THUMBNAIL_WORKERS, max_bytes=THUMBNAIL_CACHE_MAX_BYTES):
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self._pool = None
+        self._lock = threading.RLock()  # A render that is already done runs its callback while this is held
+        self._inflight = {}  # cache path base -> Future
+        self._batches = {}  # batch id -> cancel Event
+        self._cache_bytes = None
+        self._stats = {"hits": 0, "generated": 0, "errors": 0, "evictions": 0}
+
+    @staticmethod
+    def cache_dir():
+        return os.path.join(DATA_DIR, THUMBNAIL_DIR_NAME)
+
+    # Returns {"cache_path", "mime_type", "cached", "version"} for path at a THUMBNAIL_SIZES preset
+    # checkpoint is called while waiting so callers can abandon the request
+    def get(self, path, size="thumb", checkpoint=check_cancelled):
+        max_edge = THUMBNAIL_SIZES.get(str(size or "thumb").strip().lower())
+        if max_edge is None:
+            raise ValueError(f"Unknown thumbnail size: {size} (expected one of {', '.join(THUMBNAIL_SIZES)})")
+        return self._get_rendition(path, str(max_edge), image_render.render_image_proxy, (max_edge, THUMBNAIL_JPEG_QUALITY), checkpoint)
+
+    # Same as get for a copy that covers width x height (used for wallpapers)
+    # With render=False a missing copy returns None instead of being rendered
+    def get_cover(self, path, width, height, checkpoint=check_cancelled, render=True):
+        return self._get_rendition(path, f"cover-{width}x{height}", image_render.render_image_cover, (width, height, THUMBNAIL_JPEG_QUALITY), checkpoint, render)
+
+    # Cached renditions are named after the source's content hash and the variant
+    def _get_rendition(self, path, variant, renderer, args, checkpoint, render=True):
+        if not PILLOW_AVAILABLE:
+            raise RuntimeError("Pillow is not installed")
+
+        digest, error, _ = _file_hasher.hash_files([path])[path]
+        if digest is None:
+            raise FileNotFoundError(error)
+        version = f"{digest[:16]}-{variant}"
+        cache_dir = self.cache_dir()
+        dest_base = os.path.join(cache_dir, f"{digest[:40]}-{variant}")
+        for extension, mime_type in ((".jpg", "image/jpeg"), (".png", "image/png")):
+            cache_path = dest_base + extension
+            try:
+                # The mtime records last use for eviction
+                os.utime(cache_path)
+                # Opening only parses the header, so a hit reports the same size keys as a render
+                with Image.open(cache_path) as cached:
+                    width, height = cached.size
+                with self._lock:
+                    self._stats["hits"] += 1
+                return {
+                    "cache_path": cache_path, "mime_type": mime_type, "width": width, "height": height,
+                    "cached": True, "version": version
+                }
+            except FileNotFoundError:
+                continue
+        if not render:
+            return None
+
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._lock:
+            future = self._inflight.get(dest_base)
+            if future is None:
+                future = self._executor().submit(renderer, path, dest_base, *args)
+                self._inflight[dest_base] = future
+                future.add_done_callback(lambda _: self._finish(dest_base))
+
+        while True:
+            done, _ = concurrent.futures.wait([future], timeout=0.1)
+            if done:
+                break
+            checkpoint()
+        try:
+            cache_path, width, height, mime_type = future.result()
+        except concurrent.futures.BrokenExecutor:
+            with self._lock:
+                self._pool = None
+            raise
+        return {"cache_path": cache_path, "mime_type": mime_type, "width": width, "height": height, "cached": False, "version": version}
+
+    # Starts rendering paths in the background and returns a batch id; each result is sent as a
+    # 'sanctum-thumbnail-event' as soon as it is ready, in the order they finish
+    # paths maps the path reported back to the frontend to the absolute path to render
+    def start_batch(self, paths, size="thumb"):
+        batch_id = uuid.uuid4().hex
+        cancelled = threading.Event()
+        with self._lock:
+            self._batches[batch_id] = cancelled
+        threading.Thread(
+            target=self._run_batch, args=(batch_id, dict(paths), size, cancelled),
+            name="ThumbnailBatch", daemon=True
+        ).start()
+        return batch_id
+
+    def cancel_batch(self, batch_id):
+        with self._lock:
+            cancelled = self._batches.get(batch_id)
+        if cancelled is None:
+            return False
+        cancelled.set()
+        return True
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cache_bytes"] = self._cache_bytes
+            stats["active_batches"] = len(self._batches)
+        stats["max_bytes"] = self.max_bytes
+        stats["available"] = PILLOW_AVAILABLE
+        return stats
+
+    def _executor(self):
+        if self._pool is None:
+            if IS_MOBILE:
+                self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="Thumbnail")
+            else:
+                # spawn keeps the workers free of the GUI and server threads of this process.
+                # A spawned worker first re-runs the parent's __main__; started as ./src/backend.py
+                # that would be this whole file (GUI imports, startup output, exit hooks), so the
+                # workers run image_render, which only imports Pillow, as their main module instead
+                import multiprocessing
+                main_module = sys.modules["__main__"]
+                if main_module is sys.modules[__name__] and getattr(main_module, "__spec__", None) is None:
+                    main_module.__spec__ = importlib.util.find_spec("image_render")
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._pool
+
+    def _finish(self, dest_base):
+        with self._lock:
+            future = self._inflight.pop(dest_base, None)
+            if future is None or future.cancelled() or future.exception() is not None:
+                self._stats["errors"] += 1
+                return
+            self._stats["generated"] += 1
+            try:
+                added = os.path.getsize(future.result()[0])
+            except OSError:
+                return
+            if self._cache_bytes is not None:
+                self._cache_bytes += added
+        self._trim()
+
+    # Deletes the least recently used cache files until the cache is below 90% of max_bytes
+    def _trim(self):
+        cache_dir = self.cache_dir()
+        with self._lock:
+            if self._cache_bytes is not None and self._cache_bytes <= self.max_bytes:
+                return
+            entries = []
+            try:
+                with os.scandir(cache_dir) as scan:
+                    for entry in scan:
+                        if entry.name.endswith(".tmp") or not entry.is_file():
+                            continue
+                        stat_info = entry.stat()
+                        entries.append((stat_info.st_mtime_ns, stat_info.st_size, entry.path))
+            except OSError:
+                return
+            total = sum(entry[1] for entry in entries)
+            if total > self.max_bytes:
+                for _, byte_size, cache_path in sorted(entries):
+                    if total <= self.max_bytes * 0.9:
+                        break
+                    try:
+                        os.remove(cache_path)
+                        total -= byte_size
+                        self._stats["evictions"] += 1
+                    except OSError:
+                        pass
+            self._cache_bytes = total
+
+    def _run_batch(self, batch_id, paths, size, cancelled):
+        def checkpoint():
+            if cancelled.is_set():
+                raise CallCancelledError("Thumbnail batch was cancelled")
+
+        def render(resolved_path):
+            checkpoint()
+            return self.get(resolved_path, size, checkpoint)
+
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ThumbnailBatch")
+        try:
+            futures = {pool.submit(render, resolved_path): path for path, resolved_path in paths.items()}
+            for future in concurrent.futures.as_completed(futures):
+                if cancelled.is_set():
+                    break
+                path = futures[future]
+                try:
+                    thumbnail = _thumbnail_payload(path, size, future.result())
+                except Exception as e:
+                    thumbnail = {"success": False, "path": path, "size": size, "error": str(e)}
+                _dispatch_window_event(
+                    "sanctum-thumbnail-event", "handleSanctumThumbnailEvent",
+                    {"event": "thumbnail", "batch_id": batch_id, "thumbnail": thumbnail}, "THUMB"
+                )
+        finally:
+            cancelled.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            with self._lock:
+                self._batches.pop(batch_id, None)
+            _dispatch_window_event(
+                "sanctum-thumbnail-event", "handleSanctumThumbnailEvent",
+                {"event": "done", "batch_id": batch_id}, "THUMB"
+            )
+
+# Builds the API result for a rendered thumbnail, embedding the cached image as a data URL
+def _thumbnail_payload(path, size, rendered):
+    with open(rendered["cache_path"], "rb") as cache_file:
+        data = cache_file.read()
+    payload = dict(rendered, success=True, path=path, size=size, byte_size=len(data))
+    payload["data_url"] = f"data:{rendered['mime_type']};base64,{base64.b64encode(data).decode('ascii')}"
+    return payload
+
+_thumbnails = ThumbnailService()
+
+# Pushes a finished wallpaper rendition to the frontend as a 'sanctum-wallpaper-event' window event
+def _dispatch_wallpaper_event(payload):
+    return _dispatch_window_event(
+        "sanctum-wallpaper-event", "handleSanctumWallpaperEvent",
+        {"event": "ready", "wallpaper": payload}, "SMA"
+    )
+
+# Serves the wallpaper scaled to the screen instead of the full-size file
+# Renditions are ThumbnailService cover copies keyed by the source's content hash and the screen
+# size rounded up to WALLPAPER_SIZE_STEP. The first request for a source waits for its rendition;
+# after that a resize returns the previous one at once and sends the new one when it is ready
+class WallpaperService:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = {}  # source path -> last payload served for it
+        self._rendering = set()  # (source path, width, height) rendered in the background
+        self._stats = {"requests": 0, "hits": 0, "rendered": 0, "background": 0, "full_size": 0}
+
+    @staticmethod
+    def target_size(width, height):
+        def bucket(value):
+            value = min(max(int(value or 0), 1), WALLPAPER_MAX_EDGE)
+            return min(WALLPAPER_MAX_EDGE, -(-value // WALLPAPER_SIZE_STEP) * WALLPAPER_SIZE_STEP)
+        return bucket(width), bucket(height)
+
+    def get(self, source, width, height):
+        width, height = self.target_size(width, height)
+        with self._lock:
+            self._stats["requests"] += 1
+        mime_type, _ = mimetypes.guess_type(source)
+        # Animated GIFs and vector images would lose their point when rasterized
+        if not PILLOW_AVAILABLE or mime_type in ("image/gif", "image/svg+xml"):
+            return self._full_size(source, mime_type)
+
+        try:
+            rendered = _thumbnails.get_cover(source, width, height, render=False)
+            if rendered is not None:
+                with self._lock:
+                    self._stats["hits"] += 1
+                return self._remember(source, self._payload(source, rendered, width, height))
+
+            with self._lock:
+                previous = self._last.get(source)
+                start = previous is not None and (source, width, height) not in self._rendering
+                if start:
+                    self._rendering.add((source, width, height))
+            if previous is not None:
+                if start:
+                    threading.Thread(
+                        target=self._render_in_background, args=(source, width, height),
+                        name="Wallpaper", daemon=True
+                    ).start()
+                return dict(previous, pending=True)
+
+            rendered = _thumbnails.get_cover(source, width, height)
+            with self._lock:
+                self._stats["rendered"] += 1
+            return self._remember(source, self._payload(source, rendered, width, height))
+        except CallCancelledError:
+            raise
+        except Exception as e:
+            print(f"SMA: Serving the full-size wallpaper instead of a scaled copy: {e}")
+            return self._full_size(source, mime_type)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["rendering"] = len(self._rendering)
+        return stats
+
+    def _render_in_background(self, source, width, height):
+        try:
+            rendered = _thumbnails.get_cover(source, width, height, checkpoint=lambda: None)
+            payload = self._remember(source, self._payload(source, rendered, width, height))
+            with self._lock:
+                self._stats["background"] += 1
+            # The wallpaper may have been changed while this was rendering
+            if _resolve_configured_path(wallpaper) == source:
+                _dispatch_wallpaper_event(payload)
+        except Exception as e:
+            print(f"SMA: Error rendering wallpaper for {width}x{height}: {e}")
+        finally:
+            with self._lock:
+                self._rendering.discard((source, width, height))
+
+    def _remember(self, source, payload):
+        with self._lock:
+            self._last = {source: payload}
+        return payload
+
+    def _payload(self, source, rendered, width, height):
+        payload = {
+            "success": True,
+            "version": rendered["version"],
+            "mime_type": rendered["mime_type"],
+            "target_width": width,
+            "target_height": height,
+            "scaled": True,
+            "pending": False
+        }
+        payload.update(self._locate(rendered["cache_path"], rendered["mime_type"], rendered["version"]))
+        return payload
+
+    def _full_size(self, source, mime_type):
+        with self._lock:
+            self._stats["full_size"] += 1
+        stat_info = os.stat(source)
+        version = f"{stat_info.st_mtime_ns:x}-{stat_info.st_size:x}-full"
+        payload = {"success": True, "version": version, "mime_type": mime_type or "image/png", "scaled": False, "pending": False}
+        payload.update(self._locate(source, payload["mime_type"], version))
+        return payload
+
+    # Desktop loads the image from the byte channel; mobile gets a data URL of the (small) file
+    @staticmethod
+    def _locate(path, mime_type, version):
+        if IS_MOBILE:
+            return {"data_url": DataUrlStream(path, mime_type, os.path.getsize(path)).read()}
+        channel = _byte_channel.info()
+        return {"url": f"{channel['url']}?path={quote(path)}&token={quote(channel['token'])}&v={quote(version)}"}
+
+_wallpapers = WallpaperService()
+
+# Compresses a font to WOFF2 next to the cache (same glyphs, roughly a third of the bytes)
+def _compress_font(src, dest):
+    temp_path = f"{dest}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        woff2.compress(src, temp_path)
+        os.replace(temp_path, dest)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return dest
+
+# Describes the configured font weights once for the shell and every app
+# Each face is versioned by its content hash, so the frontend registers a face once per document
+# and only swaps the ones that changed. When fontTools and brotli are installed, faces are also
+# compressed to WOFF2 in DATA_DIR/fonts in the background and served by URL once ready (desktop)
+class FontService:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._compressing = set()  # cache paths being written
+        self._stats = {"manifests": 0, "compressed": 0, "compressed_bytes_saved": 0, "errors": 0}
+
+    @staticmethod
+    def cache_dir():
+        return os.path.join(DATA_DIR, FONT_CACHE_DIR_NAME)
+
+    # Returns {"success", "family", "version", "faces": [{"key", "weight", "source", "version", "url"?}]}
+    def manifest(self):
+        configured = {key: fonts[key] for key in sorted(fonts, key=lambda k: -FONT_WEIGHTS.get(k, 0)) if key in FONT_WEIGHTS}
+        resolved = {key: _resolve_configured_path(path) for key, path in configured.items()}
+        hashes = _file_hasher.hash_files([path for path in resolved.values() if path])
+
+        faces = []
+        for key, source in configured.items():
+            digest, error, _ = hashes.get(resolved[key], (None, "Unresolvable path", False))
+            if digest is None:
+                print(f"SMA: Skipping unreadable font {key}: {error}")
+                continue
+            face = {"key": key, "weight": FONT_WEIGHTS[key], "source": source, "version": digest[:16]}
+            if WOFF2_AVAILABLE and not IS_MOBILE:
+                cache_path = os.path.join(self.cache_dir(), f"{digest[:40]}.woff2")
+                if os.path.isfile(cache_path):
+                    channel = _byte_channel.info()
+                    face["url"] = f"{channel['url']}?path={quote(cache_path)}&token={quote(channel['token'])}&v={face['version']}"
+                else:
+                    self._compress_in_background(resolved[key], cache_path)
+            faces.append(face)
+
+        with self._lock:
+            self._stats["manifests"] += 1
+        version = hashlib.sha1(
+            "|".join(f"{face['key']}:{face['version']}:{'url' in face}" for face in faces).encode("utf-8")
+        ).hexdigest()[:16]
+        return {"success": True, "family": FONT_FAMILY, "version": version, "faces": faces}
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["compressing"] = len(self._compressing)
+        stats["woff2_available"] = WOFF2_AVAILABLE
+        return stats
+
+    def _compress_in_background(self, source, cache_path):
+        with self._lock:
+            if cache_path in self._compressing:
+                return
+            self._compressing.add(cache_path)
+        threading.Thread(target=self._compress, args=(source, cache_path), name="FontCompress", daemon=True).start()
+
+    def _compress(self, source, cache_path):
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            _compress_font(source, cache_path)
+            saved = os.path.getsize(source) - os.path.getsize(cache_path)
+            with self._lock:
+                self._stats["compressed"] += 1
+                self._stats["compressed_bytes_saved"] += saved
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            print(f"SMA: Error compressing font {source}: {e}")
+        finally:
+            with self._lock:
+                self._compressing.discard(cache_path)
+
+_fonts = FontService()
+
+# Minimal ctypes binding for Linux inotify (Android included)
+class _Inotify:
+    IN_MODIFY = 0x2
+    IN_ATTRIB = 0x4
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ONLYDIR = 0x1000000
+    WATCH_MASK = (
+        IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+        IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    )
+    _EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+    def __init__(self):
+        if not sys.platform.startswith(("linux", "android")):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = None
+        for name in (ctypes.util.find_library("c"), "libc.so.6", "libc.so"):
+            if not name:
+                continue
+            try:
+                libc = ctypes.CDLL(name, use_errno=True)
+                libc.inotify_init1
+                break
+            except (OSError, AttributeError):
+                libc = None
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify functions not found in libc")
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+    def add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def remove_watch(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    # Waits up to timeout seconds and returns the queued events as (wd, mask, name) tuples
+    def read_events(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + self._EVENT_HEADER.size <= len(data):
+                wd, mask, _, name_length = self._EVENT_HEADER.unpack_from(data, offset)
+                offset += self._EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + name_length].rstrip(b"\0"))
+                offset += name_length
+                events.append((wd, mask, name))
+        return events
+
+# Pushes filesystem deltas for a watched directory as a 'sanctum-fs-event' window event
+def _dispatch_fs_event(directory, watch_ids, changes):
+    return _dispatch_window_event(
+        "sanctum-fs-event", "handleSanctumFsEvent",
+        {"event": "changes", "path": directory, "watch_ids": watch_ids, "changes": changes}, "FSW"
+    )
+
+# Returns True for files the backend itself keeps in DATA_DIR; changes to them are not reported,
+# since reporting them would feed index and cache updates that write them again
+def _is_internal_data_path(path):
+    if os.path.dirname(path) != os.path.normpath(os.path.abspath(DATA_DIR)):
+        return False
+    name = os.path.basename(path)
+    return name in (THUMBNAIL_DIR_NAME, FONT_CACHE_DIR_NAME) or name.startswith((FILE_INDEX_DB_NAME, HASH_DB_NAME))
+
+# Write-behind and settings writes go through ".<name>.<8 hex>.tmp" files that exist only until os.replace
+_ATOMIC_TEMP_NAME = re.compile(r"^\..+\.[0-9a-f]{8}\.tmp$")
+
+def _is_atomic_temp_name(name):
+    return _ATOMIC_TEMP_NAME.match(name) is not None
+
+# Watches directories that open views care about and pushes add/remove/modify deltas
+# Uses inotify on Linux and Android, and stat polling elsewhere. Raw events are collected per
+# directory and flushed once they have been quiet for FS_WATCH_DEBOUNCE_SECONDS, so a burst of
+# writes to one file becomes a single "modified" delta. Each directory keeps a snapshot of its
+# entries, and deltas are the difference between that snapshot and what is on disk at flush time
+class DirectoryWatcher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._watches = collections.OrderedDict()  # watch id -> directory
+        self._directories = {}  # directory -> {"snapshot", "wd", "mtime_ns", "watch_ids"}
+        self._wd_directories = {}
+        self._pending = {}  # directory -> names changed since the last flush (None means rescan)
+        self._first_event = None
+        self._last_event = None
+        self._inotify = None
+        self._backend = None
+        self._thread = None
+        self._stats = {"raw_events": 0, "flushes": 0, "changes": 0, "overflows": 0}
+
+    # Starts watching path for one subscriber and returns (watch id, directory)
+    def watch(self, path):
+        directory = os.path.normpath(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Directory not found: {directory}")
+
+        with self._lock:
+            self._start()
+            entry = self._directories.get(directory)
+            if entry is None:
+                wd = self._inotify.add_watch(directory) if self._inotify else None
+                entry = {
+                    "snapshot": self._scan(directory),
+                    "wd": wd,
+                    "mtime_ns": os.stat(directory).st_mtime_ns,
+                    "watch_ids": set()
+                }
+                self._directories[directory] = entry
+                if wd is not None:
+                    self._wd_directories[wd] = directory
+            watch_id = uuid.uuid4().hex
+            entry["watch_ids"].add(watch_id)
+            self._watches[watch_id] = directory
+
+            # Views that never unwatch (closed apps) are dropped oldest first
+            while len(self._watches) > FS_WATCH_MAX_WATCHES:
+                self._remove_watch(next(iter(self._watches)))
+        return watch_id, directory
+
+    def unwatch(self, watch_id):
+        with self._lock:
+            return self._remove_watch(watch_id)
+
+    def status(self):
+        with self._lock:
+            return dict(
+                self._stats,
+                backend=self._backend,
+                watches=len(self._watches),
+                directories=sorted(self._directories)
+            )
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        try:
+            self._inotify = _Inotify()
+            self._backend = "inotify"
+        except OSError as e:
+            print(f"FSW: inotify unavailable ({e}), polling every {FS_WATCH_POLL_SECONDS} s")
+            self._inotify = None
+            self._backend = "polling"
+        self._thread = threading.Thread(target=self._run, name="DirectoryWatcher", daemon=True)
+        self._thread.start()
+
+    def _remove_watch(self, watch_id):
+        directory = self._watches.pop(watch_id, None)
+        if directory is None:
+            return False
+        entry = self._directories.get(directory)
+        if entry is not None:
+            entry["watch_ids"].discard(watch_id)
+            if not entry["watch_ids"]:
+                self._drop_directory(directory)
+        return True
+
+    def _drop_directory(self, directory):
+        entry = self._directories.pop(directory, None)
+        self._pending.pop(directory, None)
+        if entry is not None and entry["wd"] is not None:
+            self._wd_directories.pop(entry["wd"], None)
+            try:
+                self._inotify.remove_watch(entry["wd"])
+            except OSError:
+                pass
+
+    @staticmethod
+    def _signature(stat_info, is_dir):
+        return (is_dir, 0 if is_dir else stat_info.st_size, stat_info.st_mtime_ns)
+
+    def _scan(self, directory):
+        snapshot = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                    snapshot[entry.name] = self._signature(entry.stat(), is_dir)
+                except OSError:
+                    continue
+        return snapshot
+
+    def _run(self):
+        while True:
+            try:
+                if self._inotify is not None:
+                    timeout = FS_WATCH_DEBOUNCE_SECONDS if self._pending else 1.0
+                    self._record(self._inotify.read_events(timeout))
+                else:
+                    time.sleep(FS_WATCH_POLL_SECONDS)
+                    self._poll()
+                self._flush_if_quiet()
+            except Exception as e:
+                print(f"FSW: Error processing filesystem events: {e}")
+                time.sleep(1.0)
+
+    def _record(self, events):
+        if not events:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._stats["raw_events"] += len(events)
+            for wd, mask, name in events:
+                if mask & _Inotify.IN_Q_OVERFLOW:
+                    # Events were lost, so every directory is compared in full
+                    self._stats["overflows"] += 1
+                    for directory in self._directories:
+                        self._pending[directory] = None
+                    continue
+                directory = self._wd_directories.get(wd)
+                if directory is None:
+                    continue
+                if mask & (_Inotify.IN_DELETE_SELF | _Inotify.IN_MOVE_SELF | _Inotify.IN_IGNORED):
+                    self._pending[directory] = None
+                    continue
+                if not name:
+                    continue
+                names = self._pending.setdefault(directory, set())
+                if names is not None:
+                    names.add(name)
+            self._first_event = self._first_event or now
+            self._last_event = now
+
+    # Stat polling fallback: directories whose mtime changed, or that are small enough to
+    # compare cheaply (file edits don't change the directory mtime), are compared in full
+    def _poll(self):
+        with self._lock:
+            directories = list(self._directories.items())
+        for directory, entry in directories:
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if mtime_ns != entry["mtime_ns"] or len(entry["snapshot"]) <= FS_WATCH_POLL_MAX_ENTRIES:
+                with self._lock:
+                    self._pending[directory] = None
+        with self._lock:
+            if self._pending:
+                self._first_event = self._last_event = 0.0
+
+    def _flush_if_quiet(self):
+        now = time.monotonic()
+        with self._lock:
+            if not self._pending:
+                return
+            if now - self._last_event < FS_WATCH_DEBOUNCE_SECONDS and now - self._first_event < FS_WATCH_MAX_DELAY_SECONDS:
+                return
+            pending = self._pending
+            self._pending = {}
+            self._first_event = self._last_event = None
+            self._stats["flushes"] += 1
+
+        for directory, names in pending.items():
+            self._flush_directory(directory, names)
+
+    # Diffs the changed names (or the whole directory) against the snapshot and sends the deltas
+    def _flush_directory(self, directory, names):
+        with self._lock:
+            entry = self._directories.get(directory)
+            if entry is None:
+                return
+            snapshot = dict(entry["snapshot"])
+            watch_ids = sorted(entry["watch_ids"])
+
+        changes = []
+        if not os.path.isdir(directory):
+            changes.append({"type": "removed", "path": directory, "name": os.path.basename(directory), "directory_removed": True})
+            current = {}
+            names = set(snapshot)
+        elif names is None:
+            try:
+                current = self._scan(directory)
+            except OSError:
+                current = {}
+            names = set(snapshot) | set(current)
+        else:
+            current = {}
+            for name in names:
+                try:
+                    stat_info = os.stat(os.path.join(directory, name))
+                    current[name] = self._signature(stat_info, stat.S_ISDIR(stat_info.st_mode))
+                except OSError:
+                    pass
+
+        for name in sorted(names):
+            path = os.path.join(directory, name)
+            if _is_internal_data_path(path):
+                continue
+            before = snapshot.get(name)
+            after = current.get(name)
+            if before == after:
+                continue
+            if after is None:
+                snapshot.pop(name, None)
+                changes.append({"type": "removed", "path": path, "name": name})
+            else:
+                snapshot[name] = after
+                item = {
+                    "name": name,
+                    "path": path,
+                    "type": "folder" if after[0] else "file",
+                    "size": after[1],
+                    "modified": after[2] // 1000000
+                }
+                if after[0]:
+                    item.update(_folder_sizes.lookup(path))
+                changes.append({"type": "added" if before is None else "modified", "path": path, "name": name, "item": item})
+            # Edits made outside the backend reach the listing cache, index and folder sizes here
+            _notify_path_changed(path)
+
+        with self._lock:
+            entry = self._directories.get(directory)
+            if entry is None:
+                return
+            entry["snapshot"] = snapshot
+            try:
+                entry["mtime_ns"] = os.stat(directory).st_mtime_ns
+            except OSError:
+                entry["mtime_ns"] = None
+            self._stats["changes"] += len(changes)
+            if changes and changes[0].get("directory_removed"):
+                for watch_id in list(entry["watch_ids"]):
+                    self._watches.pop(watch_id, None)
+                self._drop_directory(directory)
+        if changes:
+            _dispatch_fs_event(directory, watch_ids, changes)
+
+_directory_watcher = DirectoryWatcher()
+
+# Shares DATA_URL_MEMORY_BUDGET_BYTES between concurrent data URL encodings
+# A request larger than the whole budget still runs, but only once nothing else is encoding
+class DataUrlEncoder:
+    def __init__(self, budget_bytes=DATA_URL_MEMORY_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            "requests": 0, "streamed": 0, "bytes_encoded": 0, "queued": 0, "queue_wait_seconds": 0.0,
+            "peak_in_use_bytes": 0, "peak_request_bytes": 0, "last_request_bytes": 0
+        }
+
+    def acquire(self, byte_count):
+        started = time.monotonic()
+        with self._condition:
+            waited = False
+            while self._in_use and self._in_use + byte_count > self.budget_bytes:
+                waited = True
+                self._condition.wait()
+            self._in_use += byte_count
+            self._stats["requests"] += 1
+            if waited:
+                self._stats["queued"] += 1
+                self._stats["queue_wait_seconds"] += time.monotonic() - started
+            self._stats["peak_in_use_bytes"] = max(self._stats["peak_in_use_bytes"], self._in_use)
+            self._stats["peak_request_bytes"] = max(self._stats["peak_request_bytes"], byte_count)
+            self._stats["last_request_bytes"] = byte_count
+
+    def release(self, byte_count, encoded_bytes, streamed):
+        with self._condition:
+            self._in_use -= byte_count
+            self._stats["bytes_encoded"] += encoded_bytes
+            if streamed:
+                self._stats["streamed"] += 1
+            self._condition.notify_all()
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats["in_use_bytes"] = self._in_use
+        stats["budget_bytes"] = self.budget_bytes
+        stats["queue_wait_seconds"] = round(stats["queue_wait_seconds"], 3)
+        return stats
+
+_data_urls = DataUrlEncoder()
+
+# A file's data URL, base64-encoded chunk by chunk instead of read and encoded in one piece
+# read() builds the string in one preallocated buffer; write_json() streams a JSON response
+# holding the data URL, so the Android HTTP bridge never holds the encoded file in memory
+class DataUrlStream:
+    def __init__(self, path, mime_type, byte_size, fields=None):
+        self.path = path
+        self.mime_type = mime_type
+        self.byte_size = byte_size
+        self.fields = fields  # None: the JSON value is the data URL itself; dict: an object with a data_url field
+        self.prefix = f"data:{mime_type};base64,".encode("utf-8")
+
+    @property
+    def encoded_length(self):
+        return len(self.prefix) + 4 * ((self.byte_size + 2) // 3)
+
+    def _chunks(self):
+        buffer = bytearray(min(DATA_URL_CHUNK_BYTES, max(3, self.byte_size)))
+        view = memoryview(buffer)
+        remaining = self.byte_size
+        with open(self.path, "rb") as source_file:
+            while remaining > 0:
+                count = source_file.readinto(view[:min(len(buffer), remaining)])
+                if not count:
+                    raise OSError(f"File changed while encoding: {self.path}")
+                remaining -= count
+                # Full chunks are a multiple of 3 bytes, so only the last one is padded
+                yield binascii.b2a_base64(view[:count], newline=False)
+
+    def _working_bytes(self):
+        chunk = min(DATA_URL_CHUNK_BYTES, self.byte_size)
+        return chunk + (chunk * 4) // 3
+
+    # Returns the data URL string; at most the encoded buffer and the final string exist at once
+    def read(self):
+        cost = 2 * self.encoded_length + self._working_bytes()
+        _data_urls.acquire(cost)
+        try:
+            output = bytearray(self.encoded_length)
+            output[:len(self.prefix)] = self.prefix
+            position = len(self.prefix)
+            for encoded in self._chunks():
+                output[position:position + len(encoded)] = encoded
+                position += len(encoded)
+            return output.decode("utf-8")
+        finally:
+            _data_urls.release(cost, self.encoded_length, False)
+
+    # Writes the JSON response through write() while the file is encoded
+    def write_json(self, write):
+        prefix = json.dumps(self.prefix.decode("utf-8"))[:-1].encode("utf-8")
+        if self.fields is None:
+            head, tail = prefix, b'"'
+        else:
+            fields = json.dumps(self.fields)[:-1]
+            head = f'{fields}{", " if self.fields else ""}"data_url": '.encode("utf-8") + prefix
+            tail = b'"}'
+        cost = self._working_bytes()
+        _data_urls.acquire(cost)
+        try:
+            write(head)
+            for encoded in self._chunks():
+                write(encoded)
+            write(tail)
+        finally:
+            _data_urls.release(cost, self.encoded_length, True)
+
+    def to_result(self):
+        data_url = self.read()
+        if self.fields is None:
+            return data_url
+        return dict(self.fields, data_url=data_url)
+
+# API for file management between the app and the system(s)
+class FileManagerAPI:
+    def _resolve_path(self, path):
         if not os.path.isabs(path):
             return os.path.join(DATA_DIR, path)
         return path
 
-    # Lists contents of a directory
-    def list_directory(self, path):
-        try:
-            # Convert relative paths to absolute using DATA_DIR
-            if not os.path.isabs(path):
-                path = os.path.join(DATA_DIR, path)
-            
-            items = []
-            for item in os.listdir(path):
-                full_path = os.path.join(path, item)
+    # Scans a directory with os.scandir, using cached DirEntry type data
+    # Only one stat per entry is needed (for size and mtime)
+    def _scan_directory(self, path):
+        items = []
+        with os.scandir(path) as entries:
+            for index, entry in enumerate(entries):
+                if index % 256 == 0:
+                    check_cancelled()
                 try:
-                    stat_info = os.stat(full_path)
-                    is_dir = os.path.isdir(full_path)
+                    is_dir = entry.is_dir()
+                    stat_info = entry.stat()
                     items.append({
-                        'name': item,
-                        'path': full_path,
+                        'name': entry.name,
+                        'path': entry.path,
                         'type': 'folder' if is_dir else 'file',
                         'size': 0 if is_dir else stat_info.st_size,
                         'modified': int(stat_info.st_mtime * 1000)
                     })
                 except (OSError, PermissionError) as e:
-                    print(f"FMAPI: Skipping {full_path}: {e}")
+                    log_debug("FMAPI", "Skipping %s: %s", entry.path, e)
+                    continue
+        return items
+
+    # Filters scanned items by extension and glob pattern
+    # Filters apply to files only so folders stay navigable
+    def _filter_items(self, items, extensions=None, pattern=None):
+        extension_filter = _normalize_extension_filter(extensions)
+        glob_pattern = str(pattern or "").strip().lower()
+        if not extension_filter and not glob_pattern:
+            return items
+
+        filtered = []
+        for item in items:
+            if item['type'] == 'file':
+                lowered_name = item['name'].lower()
+                if extension_filter and os.path.splitext(lowered_name)[1] not in extension_filter:
                     continue
+                if glob_pattern and not fnmatch.fnmatchcase(lowered_name, glob_pattern):
+                    continue
+            filtered.append(item)
+        return filtered
+
+    # Sorts scanned items, returning them unchanged when sort_by is unknown
+    def _sort_items(self, items, sort_by=None, descending=False, folders_first=True):
+        sort_key = _LIST_DIRECTORY_SORT_KEYS.get(str(sort_by or "").strip().lower())
+        if sort_key is None:
             return items
+
+        items = sorted(items, key=sort_key, reverse=bool(descending))
+        if folders_first and sort_by != "type":
+            # sorted() is stable, so this keeps the requested order within each group
+            items.sort(key=lambda item: item['type'] != 'folder')
+        return items
+
+    # Returns filtered and sorted items, served from the listing cache when valid
+    # Items are shared with the cache, so callers must copy them before handing them out
+    def _list_items(self, path, sort_by=None, descending=False, extensions=None, pattern=None, folders_first=True):
+        _write_behind.flush(path)
+        items = _directory_listing_cache.get(
+            path,
+            self._scan_directory,
+            lambda scanned: self._sort_items(scanned, sort_by, descending, folders_first),
+            (str(sort_by or "").strip().lower(), bool(descending), bool(folders_first))
+        )
+        return self._attach_folder_sizes(self._filter_items(items, extensions, pattern), sort_by, descending, folders_first)
+
+    # Copies folder items with their recursive size, file_count and size_state ("ready" or "computing")
+    # Sizes come from the background aggregator, so this never walks a tree itself
+    def _attach_folder_sizes(self, items, sort_by=None, descending=False, folders_first=True):
+        if not any(item['type'] == 'folder' for item in items):
+            return items
+        items = [
+            dict(item, **_folder_sizes.lookup(item['path'])) if item['type'] == 'folder' else item
+            for item in items
+        ]
+        if str(sort_by or "").strip().lower() == "size":
+            items = self._sort_items(items, sort_by, descending, folders_first)
+        return items
+
+    # Lists contents of a directory
+    # Optional sort_by (name, natural, size, mtime, type) and extension/glob filters
+    def list_directory(self, path, sort_by=None, descending=False, extensions=None, pattern=None, folders_first=True):
+        try:
+            # Convert relative paths to absolute using DATA_DIR
+            if not os.path.isabs(path):
+                path = os.path.join(DATA_DIR, path)
+
+            items = self._list_items(path, sort_by, descending, extensions, pattern, folders_first)
+            return [dict(item) for item in items]
+        except CallCancelledError:
+            raise
         except Exception as e:
             print(f"FMAPI-E1: Error listing directory {path}: {e}")
             if webview_window and not IS_MOBILE:
                 webview_window.evaluate_js('displayError("FMAPI-E1")')
             return []
 
+    # Lists one page of a directory, sorted and filtered on the backend
+    # The returned next_cursor is passed back to fetch the following page
+    def list_directory_page(self, path, sort_by="name", descending=False, extensions=None, pattern=None, cursor=None, limit=LIST_DIRECTORY_PAGE_SIZE, folders_first=True):
+        try:
+            if not os.path.isabs(path):
+                path = os.path.join(DATA_DIR, path)
+
+            try:
+                offset = max(0, int(cursor)) if cursor not in (None, "") else 0
+            except (TypeError, ValueError):
+                offset = 0
+            try:
+                page_size = max(1, min(int(limit), LIST_DIRECTORY_MAX_PAGE_SIZE))
+            except (TypeError, ValueError):
+                page_size = LIST_DIRECTORY_PAGE_SIZE
+
+            items = self._list_items(path, sort_by or "name", descending, extensions, pattern, folders_first)
+            page = [dict(item) for item in items[offset:offset + page_size]]
+            next_offset = offset + len(page)
+            return {
+                "success": True,
+                "path": path,
+                "items": page,
+                "total": len(items),
+                "cursor": str(offset),
+                "next_cursor": str(next_offset) if next_offset < len(items) else None
+            }
+        except CallCancelledError:
+            raise
+        except Exception as e:
+            print(f"FMAPI-E1: Error listing directory {path}: {e}")
+            if webview_window and not IS_MOBILE:
+                webview_window.evaluate_js('displayError("FMAPI-E1")')
+            return {
+                "success": False,
+                "error": str(e),
+                "path": path,
+                "items": [],
+                "total": 0,
+                "next_cursor": None
+            }
+
     # Reads the contents of a file
     def read_file(self, path):
         try:
@@ -1239,6 +5396,13 @@ class FileManagerAPI:
             if not os.path.isabs(path):
                 path = os.path.join(DATA_DIR, path)
             
+            # Write-behind data not yet on disk is the file's current content
+            pending = _write_behind.get(path)
+            if isinstance(pending, str):
+                return pending
+            if pending is not None:
+                _write_behind.flush(path)
+
             with open(path, "r") as file:
                 return file.read()
         except Exception as e:
@@ -1247,24 +5411,114 @@ class FileManagerAPI:
                 webview_window.evaluate_js('displayError("FMAPI-E2")')
             return ""
         
-    # Writes content to a file
-    def write_file(self, path, content):
+    # Writes content to a file atomically (temp file + os.replace)
+    # With write_behind=True the write is buffered briefly and repeated writes to the same path
+    # collapse into one; otherwise it is durable on disk when this returns
+    def write_file(self, path, content, write_behind=False):
         try:
             # Convert relative paths to absolute using DATA_DIR
             if not os.path.isabs(path):
                 path = os.path.join(DATA_DIR, path)
-            
-            # Create parent directories if they don't exist
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            
-            with open(path, "w") as file:
-                file.write(content)
-            return True
+
+            # Both modes go through the buffer so a direct write supersedes pending data for the path
+            _write_behind.write(path, content)
+            if write_behind or _write_behind.flush(path, requeue=False):
+                return True
+            # The flush has already logged the failure
+            if webview_window and not IS_MOBILE:
+                webview_window.evaluate_js('displayError("FMAPI-E3")')
+            return False
         except Exception as e:
             print(f"FMAPI-E3: Error writing file {path}: {e}")
             if webview_window and not IS_MOBILE:
                 webview_window.evaluate_js('displayError("FMAPI-E3")')
             return False
+
+    # Reads raw bytes from a file, optionally only length bytes starting at offset
+    # Errors are raised: the HTTP bridge answers 404/403/500 and js_api rejects the call
+    def read_bytes(self, path, offset=0, length=None):
+        try:
+            path = self._resolve_path(path)
+            _write_behind.flush(path)
+            with open(path, "rb") as file:
+                if offset:
+                    file.seek(max(0, int(offset)))
+                return file.read(-1 if length is None else max(0, int(length)))
+        except Exception as e:
+            print(f"FMAPI-E2: Error reading bytes from {path}: {e}")
+            if webview_window and not IS_MOBILE:
+                webview_window.evaluate_js('displayError("FMAPI-E2")')
+            # Raised rather than returning b"", which callers can't tell from an empty file
+            raise
+
+    # Writes raw bytes atomically; write_behind works as in write_file
+    def write_bytes(self, path, data, write_behind=False):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if not isinstance(data, (bytes, bytearray)):
+            return {"success": False, "error": "write_bytes expects bytes.", "path": path}
+        resolved_path = self._resolve_path(path)
+        success = self.write_file(resolved_path, bytes(data), write_behind)
+        return {"success": success, "path": resolved_path, "byte_size": len(data)}
+
+    # Returns the loopback URL and token the desktop frontend uses for raw byte transfers
+    def get_byte_channel(self):
+        try:
+            return _byte_channel.info()
+        except Exception as e:
+            print(f"FMAPI-E2: Error starting byte channel: {e}")
+            return {"success": False, "error": str(e)}
+
+    # Writes all write-behind data to disk and fsyncs it
+    def flush_writes(self):
+        return flush_writes()
+
+    # Returns write-behind counters, including writes saved per second by coalescing
+    def get_write_stats(self):
+        return _write_behind.stats()
+
+    # Returns the hex content hash of a file (blake2b by default), or None on error
+    # Unchanged files are answered from the hash cache without being read
+    def get_file_hash(self, path, algorithm=HASH_DEFAULT_ALGORITHM):
+        result = self.get_file_hashes([path], algorithm)
+        if result["success"] and result["hashes"].get(path):
+            return result["hashes"][path]
+        # A failed batch has already logged its error
+        if result["success"]:
+            print(f"FMAPI-E16: Error hashing file {path}: {result['errors'].get(path)}")
+        if webview_window and not IS_MOBILE:
+            webview_window.evaluate_js('displayError("FMAPI-E16")')
+        return None
+
+    # Hashes many files in one call; results are keyed by the paths as given
+    # Files that could not be hashed map to None and have an entry in "errors"
+    def get_file_hashes(self, paths, algorithm=HASH_DEFAULT_ALGORITHM):
+        if isinstance(paths, str):
+            paths = [paths]
+        try:
+            resolved = {path: self._resolve_path(path) for path in paths}
+            for resolved_path in resolved.values():
+                _write_behind.flush(resolved_path)
+            results = _file_hasher.hash_files(list(resolved.values()), algorithm)
+            return {
+                "success": True,
+                "algorithm": _file_hasher.normalize_algorithm(algorithm),
+                "hashes": {path: results[resolved_path][0] for path, resolved_path in resolved.items()},
+                "errors": {
+                    path: results[resolved_path][1]
+                    for path, resolved_path in resolved.items() if results[resolved_path][1]
+                },
+                "cached": sum(1 for resolved_path in set(resolved.values()) if results[resolved_path][2])
+            }
+        except CallCancelledError:
+            raise
+        except Exception as e:
+            print(f"FMAPI-E16: Error hashing files: {e}")
+            return {"success": False, "error": str(e), "hashes": {}, "errors": {}}
+
+    # Returns hash cache counters (requests, cache hits, files and bytes hashed)
+    def get_hash_stats(self):
+        return _file_hasher.stats()
         
     # Deletes a file
     def delete_file(self, path):
@@ -1273,6 +5527,9 @@ class FileManagerAPI:
             if not os.path.isabs(path):
                 path = os.path.join(DATA_DIR, path)
             
+            # A file that only existed as write-behind data is gone once discarded
+            if _write_behind.discard(path) and not os.path.lexists(path):
+                return True
             os.remove(path)
             return True
         except Exception as e:
@@ -1280,6 +5537,8 @@ class FileManagerAPI:
             if webview_window and not IS_MOBILE:
                 webview_window.evaluate_js('displayError("FMAPI-E4")')
             return False
+        finally:
+            _notify_path_changed(path)
     
     # Deletes a directory
     def delete_directory(self, path):
@@ -1288,17 +5547,21 @@ class FileManagerAPI:
             if not os.path.isabs(path):
                 path = os.path.join(DATA_DIR, path)
 
+            _write_behind.discard(path)
             if not os.path.exists(path):
                 return True
             
-            import shutil
-            shutil.rmtree(path)
+            _cancellable_rmtree(path)
             return True
+        except CallCancelledError:
+            raise
         except Exception as e:
             print(f"FMAPI-E5: Error deleting directory {path}: {e}")
             if webview_window and not IS_MOBILE:
                 webview_window.evaluate_js('displayError("FMAPI-E5")')
             return False
+        finally:
+            _notify_path_changed(path)
     
     # Creates a directory
     def create_directory(self, path):
@@ -1314,6 +5577,8 @@ class FileManagerAPI:
             if webview_window and not IS_MOBILE:
                 webview_window.evaluate_js('displayError("FMAPI-E6")')
             return False
+        finally:
+            _notify_path_changed(path)
     
     # Creates an empty file
     def create_file(self, path):
@@ -1330,12 +5595,15 @@ class FileManagerAPI:
             if webview_window and not IS_MOBILE:
                 webview_window.evaluate_js('displayError("FMAPI-E7")')
             return False
+        finally:
+            _notify_path_changed(path)
     
     # Renames a file or directory
     def rename_item(self, old_path, new_name):
         try:
             base_dir = os.path.dirname(old_path)
             new_path = os.path.join(base_dir, new_name)
+            _write_behind.flush(old_path)
             os.rename(old_path, new_path)
             return {'success': True, 'new_path': new_path}
         except Exception as e:
@@ -1343,33 +5611,148 @@ class FileManagerAPI:
             if webview_window and not IS_MOBILE:
                 webview_window.evaluate_js('displayError("FMAPI-E8")')
             return {'success': False, 'error': str(e)}
+        finally:
+            _notify_path_changed(old_path)
+            _notify_path_changed(os.path.join(os.path.dirname(old_path), new_name))
     
     # Moves a file or directory
     def move_item(self, src, dest):
         try:
-            import shutil
-            shutil.move(src, dest)
+            _write_behind.flush(src)
+            shutil.move(src, dest, copy_function=_cancellable_copy2)
             return True
+        except CallCancelledError:
+            raise
         except Exception as e:
             print(f"FMAPI-E9: Error moving {src} to {dest}: {e}")
             if webview_window and not IS_MOBILE:
                 webview_window.evaluate_js('displayError("FMAPI-E9")')
             return False
+        finally:
+            _notify_path_changed(src)
+            _notify_path_changed(dest)
         
     # Copies a file or directory
     def copy_item(self, src, dest):
         try:
-            import shutil
+            _write_behind.flush(src)
             if os.path.isdir(src):
-                shutil.copytree(src, dest)
+                shutil.copytree(src, dest, copy_function=_cancellable_copy2)
             else:
-                shutil.copy2(src, dest)
+                _cancellable_copy2(src, dest)
             return True
+        except CallCancelledError:
+            raise
         except Exception as e:
             print(f"FMAPI-E10: Error copying {src} to {dest}: {e}")
             if webview_window and not IS_MOBILE:
                 webview_window.evaluate_js('displayError("FMAPI-E10")')
             return False
+        finally:
+            _notify_path_changed(dest)
+
+    # Deletes many files and folders in one call; see _run_bulk for the result format
+    def bulk_delete(self, paths):
+        return self._run_bulk("delete", paths)
+
+    # Moves many items into the dest folder, keeping their names
+    def bulk_move(self, paths, dest):
+        return self._run_bulk("move", paths, dest)
+
+    # Copies many items into the dest folder, keeping their names
+    def bulk_copy(self, paths, dest):
+        return self._run_bulk("copy", paths, dest)
+
+    # Runs one bulk operation on a bounded worker pool and reports every item
+    # Failures are grouped by error so the frontend can show one message for the whole batch
+    def _run_bulk(self, kind, paths, dest=None):
+        if isinstance(paths, str):
+            paths = [paths]
+        paths = list(dict.fromkeys(self._resolve_path(path) for path in paths or []))
+        if dest is not None:
+            dest = self._resolve_path(dest)
+            if not os.path.isdir(dest):
+                print(f"FMAPI-E19: Bulk {kind} destination is not a folder: {dest}")
+                if webview_window and not IS_MOBILE:
+                    webview_window.evaluate_js('displayError("FMAPI-E19")')
+                return {"success": False, "error": f"Destination folder not found: {dest}", "results": [], "errors": {}}
+
+        def run_item(path):
+            target = os.path.join(dest, os.path.basename(path.rstrip(os.sep))) if dest is not None else None
+            result = {"path": path, "success": False}
+            if target is not None:
+                result["dest"] = target
+            try:
+                self._bulk_item(kind, path, target)
+                result["success"] = True
+            except CallCancelledError:
+                result["cancelled"] = True
+                result["error"] = "Cancelled"
+            except Exception as e:
+                result["error"] = e.strerror if isinstance(e, OSError) and e.strerror else str(e)
+            return result
+
+        results = []
+        if paths:
+            workers = min(BULK_OPERATION_WORKERS, len(paths))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="BulkFileWorker") as pool:
+                # Each item runs in the caller's context so call_with_deadline/cancel_call reach it
+                futures = [pool.submit(contextvars.copy_context().run, run_item, path) for path in paths]
+                results = [future.result() for future in futures]
+
+        # One invalidation for the whole batch, including targets of partly failed copies
+        _notify_paths_changed(paths + [result["dest"] for result in results if "dest" in result])
+
+        errors = {}
+        for result in results:
+            if not result["success"] and not result.get("cancelled"):
+                errors.setdefault(result["error"], []).append(result["path"])
+        failed = sum(len(failed_paths) for failed_paths in errors.values())
+        skipped = sum(1 for result in results if result.get("cancelled"))
+        if failed:
+            summary = "; ".join(f"{error} ({len(failed_paths)})" for error, failed_paths in errors.items())
+            print(f"FMAPI-E19: Bulk {kind} failed for {failed} of {len(results)} items: {summary}")
+            if webview_window and not IS_MOBILE:
+                webview_window.evaluate_js('displayError("FMAPI-E19")')
+        return {
+            "success": not failed and not skipped,
+            "cancelled": skipped > 0,
+            "total": len(results),
+            "succeeded": len(results) - failed - skipped,
+            "failed": failed,
+            "skipped": skipped,
+            "results": results,
+            "errors": errors
+        }
+
+    # Deletes, moves or copies one item of a bulk operation, raising on failure
+    # Unlike copy_item, existing targets are never overwritten
+    def _bulk_item(self, kind, path, target):
+        check_cancelled()
+        if kind == "delete":
+            # Like delete_directory, items that are already gone count as deleted
+            _write_behind.discard(path)
+            if not os.path.lexists(path):
+                return
+            if os.path.isdir(path) and not os.path.islink(path):
+                _cancellable_rmtree(path)
+            else:
+                os.remove(path)
+            return
+
+        if not os.path.lexists(path):
+            raise FileNotFoundError(errno.ENOENT, "Source not found", path)
+        if os.path.lexists(target):
+            raise FileExistsError(errno.EEXIST, "Destination already exists", target)
+        if _path_is_within(target, os.path.normpath(path)):
+            raise ValueError("Cannot copy or move a folder into itself.")
+        _write_behind.flush(path)
+        if kind == "move":
+            shutil.move(path, target, copy_function=_cancellable_copy2)
+        elif os.path.isdir(path) and not os.path.islink(path):
+            shutil.copytree(path, target, symlinks=True, copy_function=_cancellable_copy2)
+        else:
+            _cancellable_copy2(path, target, follow_symlinks=False)
         
     # Gets file or directory metadata
     def get_metadata(self, path):
@@ -1377,6 +5760,7 @@ class FileManagerAPI:
             if not os.path.isabs(path):
                 path = os.path.join(DATA_DIR, path)
             
+            _write_behind.flush(path)
             stats = os.stat(path)
             return {
                 "size": stats.st_size,
@@ -1394,6 +5778,7 @@ class FileManagerAPI:
     def get_file_info(self, path):
         try:
             resolved_path = self._resolve_path(path)
+            _write_behind.flush(resolved_path)
             if not os.path.exists(resolved_path):
                 return {
                     "success": False,
@@ -1427,8 +5812,20 @@ class FileManagerAPI:
 
     # Gets a base64 data URL for a file (useful when file:// loading is blocked)
     def get_file_data_url(self, path, max_bytes=None, fallback_mime=None):
+        result = self.open_file_data_url(path, max_bytes, fallback_mime)
+        if not isinstance(result, DataUrlStream):
+            return result
+        try:
+            return result.to_result()
+        except Exception as e:
+            return self._file_data_url_error(path, e)
+
+    # Validates a get_file_data_url request and returns a DataUrlStream, or an error result
+    # The Android HTTP bridge writes the stream straight into its response
+    def open_file_data_url(self, path, max_bytes=None, fallback_mime=None):
         try:
             resolved_path = self._resolve_path(path)
+            _write_behind.flush(resolved_path)
             if not os.path.isfile(resolved_path):
                 return {
                     "success": False,
@@ -1460,31 +5857,214 @@ class FileManagerAPI:
                 fallback = str(fallback_mime or "").strip()
                 mime_type = fallback if fallback else "application/octet-stream"
 
-            with open(resolved_path, "rb") as source_file:
-                encoded = base64.b64encode(source_file.read()).decode("utf-8")
-
-            return {
+            return DataUrlStream(resolved_path, mime_type, byte_size, {
                 "success": True,
                 "path": resolved_path,
                 "mime_type": mime_type,
-                "byte_size": byte_size,
-                "data_url": f"data:{mime_type};base64,{encoded}"
+                "byte_size": byte_size
+            })
+        except Exception as e:
+            return self._file_data_url_error(path, e)
+
+    def _file_data_url_error(self, path, e):
+        print(f"FMAPI-E13: Error creating file data URL for {path}: {e}")
+        if webview_window and not IS_MOBILE:
+            webview_window.evaluate_js('displayError("FMAPI-E13")')
+        return {
+            "success": False,
+            "error": str(e),
+            "path": path
+        }
+
+    # Returns data URL encoder counters: queued requests, peak memory per request and in total
+    def get_data_url_stats(self):
+        return _data_urls.stats()
+
+    # Returns a downscaled copy of an image as a data URL
+    # size is "thumb" (256 px longest edge) or "proxy" (1920 px, for on-screen display)
+    def get_thumbnail(self, path, size="thumb"):
+        try:
+            resolved_path = self._resolve_path(path)
+            _write_behind.flush(resolved_path)
+            return _thumbnail_payload(path, size, _thumbnails.get(resolved_path, size))
+        except CallCancelledError:
+            raise
+        except Exception as e:
+            print(f"FMAPI-E17: Error creating thumbnail for {path}: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "path": path,
+                "size": size
+            }
+
+    # Renders thumbnails for many images in the background and returns a batch id at once
+    # Each result arrives as a 'sanctum-thumbnail-event' as soon as it is ready, followed by a "done" event
+    def get_thumbnails(self, paths, size="thumb"):
+        try:
+            if size not in THUMBNAIL_SIZES:
+                raise ValueError(f"Unknown thumbnail size: {size} (expected one of {', '.join(THUMBNAIL_SIZES)})")
+            if not PILLOW_AVAILABLE:
+                raise RuntimeError("Pillow is not installed")
+            if isinstance(paths, str):
+                paths = [paths]
+            resolved_paths = {path: self._resolve_path(path) for path in paths}
+            for resolved_path in resolved_paths.values():
+                _write_behind.flush(resolved_path)
+            return {"success": True, "batch_id": _thumbnails.start_batch(resolved_paths, size), "total": len(resolved_paths)}
+        except Exception as e:
+            print(f"FMAPI-E17: Error starting thumbnail batch: {e}")
+            return {"success": False, "error": str(e)}
+
+    # Stops a get_thumbnails batch; thumbnails already sent stay valid
+    def cancel_thumbnails(self, batch_id):
+        return {"success": _thumbnails.cancel_batch(batch_id), "batch_id": batch_id}
+
+    # Returns thumbnail cache counters and whether Pillow is available
+    def get_thumbnail_stats(self):
+        return _thumbnails.stats()
+
+    # Subscribes to changes in a directory; deltas arrive as 'sanctum-fs-event' window events
+    # whose watch_ids include the returned watch_id. Call unwatch_directory when the view closes
+    def watch_directory(self, path):
+        try:
+            watch_id, directory = _directory_watcher.watch(self._resolve_path(path))
+            return {
+                "success": True,
+                "watch_id": watch_id,
+                "path": directory,
+                "backend": _directory_watcher.status()["backend"]
             }
         except Exception as e:
-            print(f"FMAPI-E13: Error creating file data URL for {path}: {e}")
+            print(f"FMAPI-E18: Error watching directory {path}: {e}")
+            return {"success": False, "error": str(e), "path": path}
+
+    def unwatch_directory(self, watch_id):
+        return {"success": _directory_watcher.unwatch(watch_id), "watch_id": watch_id}
+
+    # Returns the watcher backend (inotify or polling), watched directories and event counters
+    def get_watch_status(self):
+        return _directory_watcher.status()
+
+    # Returns hit/miss counters and size of the directory listing cache
+    def get_listing_cache_stats(self):
+        return _directory_listing_cache.stats()
+
+    # Returns the recursive size and file count of a folder, computed in the background
+    # size_state is "computing" until the whole tree has been counted; a
+    # 'sanctum-folder-size-event' window event follows when the totals change
+    def get_folder_size(self, path):
+        path = self._resolve_path(path)
+        if not os.path.isdir(path):
+            return {"success": False, "error": f"Not a folder: {path}", "path": path}
+        return dict(_folder_sizes.lookup(path), success=True, path=path)
+
+    # Returns folder size aggregator counters
+    def get_folder_size_stats(self):
+        return _folder_sizes.stats()
+
+    # Searches the persistent filename index for ranked prefix, substring and fuzzy name matches
+    def search_files(self, query, limit=FILE_INDEX_SEARCH_LIMIT):
+        started = time.perf_counter()
+        try:
+            try:
+                limit = max(1, min(int(limit), FILE_INDEX_MAX_SEARCH_LIMIT))
+            except (TypeError, ValueError):
+                limit = FILE_INDEX_SEARCH_LIMIT
+            results = _file_index.search(query, limit)
+            return {
+                "success": True,
+                "query": query,
+                "results": results,
+                "ready": _file_index.status()["ready"],
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+        except Exception as e:
+            print(f"FMAPI-E14: Error searching files for {query!r}: {e}")
             if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("FMAPI-E13")')
+                webview_window.evaluate_js('displayError("FMAPI-E14")')
             return {
                 "success": False,
                 "error": str(e),
-                "path": path
+                "query": query,
+                "results": []
             }
 
+    # Adds a user-approved folder to the file index (DATA_DIR is always indexed)
+    def add_index_root(self, path):
+        try:
+            return {"success": True, "path": _file_index.add_root(self._resolve_path(path))}
+        except Exception as e:
+            print(f"FMAPI-E14: Error adding index root {path}: {e}")
+            return {"success": False, "error": str(e), "path": path}
+
+    # Removes a folder added with add_index_root and drops its indexed entries
+    def remove_index_root(self, path):
+        try:
+            return {"success": True, "path": _file_index.remove_root(self._resolve_path(path))}
+        except Exception as e:
+            print(f"FMAPI-E14: Error removing index root {path}: {e}")
+            return {"success": False, "error": str(e), "path": path}
+
+    # Returns the file index roots, entry count and scan state
+    def get_index_status(self):
+        return _file_index.status()
+
+    # Starts a background copy and returns its job id; progress arrives as 'sanctum-file-job-event'
+    def start_copy(self, src, dest):
+        return self._start_job("copy", src, dest)
+
+    # Starts a background move; same-device moves are a rename, others copy then delete
+    def start_move(self, src, dest):
+        return self._start_job("move", src, dest)
+
+    # Starts a background delete of a file or folder
+    def start_delete(self, path):
+        return self._start_job("delete", path)
+
+    def _start_job(self, kind, src, dest=None):
+        try:
+            src = self._resolve_path(src)
+            if dest is not None:
+                dest = self._resolve_path(dest)
+            if kind == "delete":
+                _write_behind.discard(src)
+            else:
+                _write_behind.flush(src)
+            job = _file_job_manager.start(kind, src, dest)
+            return {"success": True, "job_id": job.job_id, "job": job.snapshot()}
+        except Exception as e:
+            print(f"FMAPI-E15: Error starting {kind} job for {src}: {e}")
+            if webview_window and not IS_MOBILE:
+                webview_window.evaluate_js('displayError("FMAPI-E15")')
+            return {"success": False, "error": str(e)}
+
+    # Returns the progress snapshot of a job, or None for an unknown id
+    def get_job(self, job_id):
+        job = _file_job_manager.get(job_id)
+        return job.snapshot() if job else None
+
+    # Returns snapshots of running, queued and recently finished jobs
+    def list_jobs(self):
+        return _file_job_manager.list_jobs()
+
+    def pause_job(self, job_id):
+        job = _file_job_manager.get(job_id)
+        return {"success": bool(job and job.pause()), "job": job.snapshot() if job else None}
+
+    def resume_job(self, job_id):
+        job = _file_job_manager.get(job_id)
+        return {"success": bool(job and job.resume()), "job": job.snapshot() if job else None}
+
+    def cancel_job(self, job_id):
+        job = _file_job_manager.get(job_id)
+        return {"success": bool(job and job.cancel()), "job": job.snapshot() if job else None}
+
     # Checks if a file or directory exists
     def exists(self, path):
         if not os.path.isabs(path):
             path = os.path.join(DATA_DIR, path)
-        return os.path.exists(path)
+        return _write_behind.has_pending(path) or os.path.exists(path)
     
     # Returns the proper storage path based on platform
     def get_storage_path(self, sub_path="", is_data=True):
@@ -1507,6 +6087,109 @@ class FileManagerAPI:
             return os.path.join(base, sub_path)
         return base
 
+# Serves raw file bytes to the desktop frontend over loopback HTTP
+# pywebview's js_api can only return JSON, so binary data would otherwise need base64
+class _ByteChannelHandler(BaseHTTPRequestHandler):
+    server_version = "SanctumBytes/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_cors_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, PUT, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self._send_cors_headers()
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Returns the query parameters of an authorized /bytes request, or None after sending an error
+    def _authorized_params(self):
+        parsed = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        if parsed.path != "/bytes" or not params.get("path"):
+            self._send_json(404, {"success": False, "error": "Not found."})
+            return None
+        if not secrets.compare_digest(params.get("token", ""), self.server.token):
+            self._send_json(403, {"success": False, "error": "Invalid byte channel token."})
+            return None
+        return params
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._send_cors_headers()
+        self.end_headers()
+
+    def do_GET(self):
+        params = self._authorized_params()
+        if params is None:
+            return
+        path = FileManagerAPI()._resolve_path(params["path"])
+        try:
+            offset = max(0, int(params.get("offset") or 0))
+            length = int(params["length"]) if params.get("length") not in (None, "") else None
+            _write_behind.flush(path)
+            with open(path, "rb") as source_file:
+                size = os.fstat(source_file.fileno()).st_size
+                offset = min(offset, size)
+                count = size - offset if length is None else max(0, min(length, size - offset))
+                # A real content type lets <img> tags load images straight from the channel
+                content_type, _ = mimetypes.guess_type(path)
+                self.send_response(200)
+                self._send_cors_headers()
+                self.send_header("Content-Type", content_type or "application/octet-stream")
+                self.send_header("Content-Length", str(count))
+                if params.get("v"):
+                    # Versioned URLs (wallpapers, fonts) never change content, so the webview may keep them
+                    self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+                self.end_headers()
+                if count:
+                    # socket.sendfile is zero-copy where the OS supports it
+                    self.connection.sendfile(source_file, offset, count)
+        except FileNotFoundError:
+            self._send_json(404, {"success": False, "error": "File not found.", "path": path})
+        except (ValueError, OSError) as e:
+            print(f"FMAPI-E2: Error reading bytes from {path}: {e}")
+            self._send_json(500, {"success": False, "error": str(e), "path": path})
+
+    def do_PUT(self):
+        params = self._authorized_params()
+        if params is None:
+            return
+        try:
+            content_length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._send_json(411, {"success": False, "error": "Content-Length required."})
+            return
+        data = self.rfile.read(content_length)
+        write_behind = params.get("write_behind") in ("1", "true")
+        self._send_json(200, FileManagerAPI().write_bytes(params["path"], data, write_behind))
+
+# Lazily started loopback server for _ByteChannelHandler, protected by a per-run token
+class ByteChannel:
+    def __init__(self):
+        self._server = None
+        self._lock = threading.Lock()
+
+    def info(self):
+        with self._lock:
+            if self._server is None:
+                server = ThreadingHTTPServer(("127.0.0.1", 0), _ByteChannelHandler)
+                server.daemon_threads = True
+                server.token = secrets.token_urlsafe(24)
+                threading.Thread(target=server.serve_forever, name="ByteChannel", daemon=True).start()
+                self._server = server
+            port = self._server.server_address[1]
+            return {"success": True, "url": f"http://127.0.0.1:{port}/bytes", "token": self._server.token}
+
+_byte_channel = ByteChannel()
+
 # API for managing apps within the environment
 class AppManagerAPI:
     # Lists all initialized apps
@@ -1527,12 +6210,149 @@ class AppManagerAPI:
                 return {"success": False, "message": f"Function '{function_name}' not found in app '{app_name}'"}
             
             func = getattr(app_module, function_name)
-            result = func(*args, **kwargs)
+            result = run_as_app(app_name, func, *args, **kwargs)
             return result
             
+        except CallCancelledError:
+            raise
         except Exception as e:
             return {"success": False, "message": f"Error calling {function_name}: {str(e)}"}
 
+# The settings.yaml document, kept in memory after the first load
+# Changes are written back on a background thread once they have stopped for
+# SETTINGS_SAVE_DELAY_SECONDS, so a burst of set_* calls costs one atomic write
+class SettingsStore:
+    def __init__(self, delay=SETTINGS_SAVE_DELAY_SECONDS):
+        self.delay = delay
+        self.path = None
+        self._settings = None
+        self._last_change = None  # monotonic time of the newest unsaved change
+        self._condition = threading.Condition(threading.RLock())
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._failures = 0  # failed writes since the last successful one
+        self._retries = 0  # background retries since the last change
+        self._retry_at = 0  # monotonic time before which the background thread doesn't retry
+        self._stats = {"updates": 0, "writes": 0, "errors": 0}
+
+    # Reads settings.yaml (DATA_DIR can change before backend.initialize on Android)
+    def load(self):
+        path = os.path.join(DATA_DIR, "settings.yaml")
+        with open(path, "r") as file:
+            settings = yaml.load(file, Loader=yaml_loader) or {}
+        with self._condition:
+            self.path = path
+            self._settings = settings
+            self._last_change = None
+            return dict(settings)
+
+    def get(self, key, default=None):
+        with self._condition:
+            self._ensure_loaded()
+            return self._settings.get(key, default)
+
+    # Applies changes in memory and schedules a write
+    def update(self, changes):
+        with self._condition:
+            self._ensure_loaded()
+            self._settings.update(changes)
+            self._stats["updates"] += 1
+            self._last_change = time.monotonic()
+            self._retries = 0
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="SettingsStore", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    # Writes pending changes now; returns False if the write failed
+    def flush(self):
+        with self._write_lock:
+            with self._condition:
+                if self._last_change is None:
+                    return True
+                settings = dict(self._settings)
+                path = self.path
+                self._last_change = None
+            try:
+                data = yaml.dump(settings, Dumper=yaml_dumper, default_flow_style=False, sort_keys=True)
+                temp_path = os.path.join(os.path.dirname(path), f".settings.yaml.{uuid.uuid4().hex[:8]}.tmp")
+                try:
+                    with open(temp_path, "x") as temp_file:
+                        temp_file.write(data)
+                        temp_file.flush()
+                        os.fsync(temp_file.fileno())
+                    os.replace(temp_path, path)
+                except BaseException:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                    raise
+                _fsync_directory(os.path.dirname(path))
+                with self._condition:
+                    self._stats["writes"] += 1
+                    self._failures = 0
+                    self._retries = 0
+                    self._retry_at = 0
+                return True
+            except Exception as e:
+                with self._condition:
+                    self._stats["errors"] += 1
+                    self._failures += 1
+                    failures = self._failures
+                    self._retry_at = time.monotonic() + min(self.delay * 2 ** failures, SETTINGS_SAVE_RETRY_MAX_SECONDS)
+                    # Keep the changes pending so the next change or flush retries the write
+                    if self._last_change is None:
+                        self._last_change = time.monotonic()
+                # Only the first failure until a save succeeds again is reported
+                if failures == 1:
+                    print(f"SMA-E14: Error saving settings: {e}")
+                    if webview_window and not IS_MOBILE:
+                        webview_window.evaluate_js('displayError("SMA-E14")')
+                else:
+                    log_debug("SMA", "Save failed again (%d in a row): %s", failures, e)
+                return False
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = self._last_change is not None
+            stats["failures"] = self._failures
+        stats["delay_seconds"] = self.delay
+        return stats
+
+    # A missing settings.yaml starts empty; an unreadable one raises rather than being overwritten
+    def _ensure_loaded(self):
+        if self._settings is not None:
+            return
+        try:
+            self.load()
+        except FileNotFoundError:
+            self.path = os.path.join(DATA_DIR, "settings.yaml")
+            self._settings = {}
+
+    # Failed saves are retried with backoff; after SETTINGS_SAVE_MAX_RETRIES the
+    # changes stay pending until the next update() or flush()
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._last_change is None or self._retries >= SETTINGS_SAVE_MAX_RETRIES:
+                    self._condition.wait()
+                wait_seconds = max(self._last_change + self.delay, self._retry_at) - time.monotonic()
+                if wait_seconds > 0:
+                    self._condition.wait(wait_seconds)
+                    continue
+                if self._failures:
+                    self._retries += 1
+            self.flush()
+
+_settings_store = SettingsStore()
+atexit.register(_settings_store.flush)
+
+# Writes pending settings changes now instead of after the save delay
+def flush_settings():
+    return _settings_store.flush()
+
 # API for managing the settings for the environment from within
 class SettingsManagerAPI:
     # Gets current settings
@@ -1571,8 +6391,17 @@ class SettingsManagerAPI:
     
     # Gets wallpaper as base64 data URL
     def get_wallpaper_data(self):
+        stream = self.open_wallpaper_data()
+        if stream is None:
+            return None
+        try:
+            return stream.read()
+        except Exception as e:
+            return self._wallpaper_data_error(e)
+
+    # Returns the wallpaper as a DataUrlStream, or None when there is no readable wallpaper
+    def open_wallpaper_data(self):
         global wallpaper
-        import base64
         
         if not wallpaper or wallpaper.lower() == 'none':
             return None
@@ -1587,23 +6416,109 @@ class SettingsManagerAPI:
             if not mime_type:
                 mime_type = 'image/png'  # Default to PNG
             
-            # Read the file as binary
-            with open(wallpaper_path, 'rb') as f:
-                image_data = f.read()
-            
-            # Encode to base64
-            b64_data = base64.b64encode(image_data).decode('utf-8')
-            
-            # Return as data URL
-            return f"data:{mime_type};base64,{b64_data}"
+            return DataUrlStream(wallpaper_path, mime_type, os.path.getsize(wallpaper_path))
         except Exception as e:
-            print(f"SMA-E1: Error reading wallpaper file: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E1")')
-            return None
+            return self._wallpaper_data_error(e)
+
+    # Returns the wallpaper scaled to cover a width x height screen (in device pixels)
+    # {"success", "version", "url" (desktop) or "data_url" (mobile), "scaled", "pending", ...}
+    # The version only changes when the source or the rounded screen size does, so callers can
+    # skip reloading the image; "pending" means a better-sized copy follows as 'sanctum-wallpaper-event'
+    def get_scaled_wallpaper(self, width, height):
+        global wallpaper
+        if not wallpaper or wallpaper.lower() == 'none':
+            return {"success": True, "version": None}
+        try:
+            wallpaper_path = _resolve_configured_path(wallpaper)
+            if not wallpaper_path or not os.path.isfile(wallpaper_path):
+                return {"success": True, "version": None}
+            return _wallpapers.get(wallpaper_path, width, height)
+        except Exception as e:
+            self._wallpaper_data_error(e)
+            return {"success": False, "error": str(e)}
+
+    # Returns wallpaper rendition counters
+    def get_wallpaper_stats(self):
+        return _wallpapers.stats()
+
+    # Returns the font faces to register, with a version per face and for the whole set
+    # The shell loads these once and apps reuse them through window.SanctumFonts
+    def get_font_manifest(self):
+        try:
+            return _fonts.manifest()
+        except Exception as e:
+            print(f"SMA: Error building font manifest: {e}")
+            return {"success": False, "error": str(e)}
+
+    # Returns font manifest and WOFF2 compression counters
+    def get_font_stats(self):
+        return _fonts.stats()
+
+    def _wallpaper_data_error(self, e):
+        print(f"SMA-E1: Error reading wallpaper file: {e}")
+        if webview_window and not IS_MOBILE:
+            webview_window.evaluate_js('displayError("SMA-E1")')
+        return None
     
+    # Applies several settings at once, e.g. {"ui_scale": 1.25, "color_theme": "dark"}
+    # Valid keys are applied even if others fail; settings.yaml is written once, shortly after
+    # Returns {"success": bool, "applied": {key: stored value}, "errors": {key: message}}
+    def set_settings(self, changes):
+        applied = {}
+        errors = {}
+        for key, value in dict(changes or {}).items():
+            if key in SUPPORTED_FONT_KEYS:
+                apply, code = self._apply_font, "SMA-E5"
+            elif key in self._SETTERS:
+                name, code = self._SETTERS[key]
+                apply = getattr(self, name)
+            else:
+                print(f"SMA: Unknown setting: {key}")
+                errors[key] = "Unknown setting."
+                continue
+            try:
+                applied[key] = apply(key, value)
+            except ValueError as e:
+                print(f"{code}: {e}")
+                errors[key] = str(e)
+            except Exception as e:
+                print(f"{code}: Error setting {key}: {e}")
+                if webview_window and not IS_MOBILE:
+                    webview_window.evaluate_js(f'displayError("{code}")')
+                errors[key] = str(e)
+
+        if applied:
+            try:
+                _settings_store.update(applied)
+            except Exception as e:
+                print(f"SMA-E14: Error updating settings: {e}")
+                if webview_window and not IS_MOBILE:
+                    webview_window.evaluate_js('displayError("SMA-E14")')
+                for key in applied:
+                    errors[key] = str(e)
+                applied = {}
+        return {"success": not errors, "applied": applied, "errors": errors}
+
+    # Setting key -> (apply method, error code); font weight keys use _apply_font
+    _SETTERS = {
+        "wallpaper": ("_apply_wallpaper", "SMA-E2"),
+        "day_gradient": ("_apply_day_gradient", "SMA-E3"),
+        "fullscreen": ("_apply_fullscreen", "SMA-E4"),
+        "updates": ("_apply_updates", "SMA-E6"),
+        "logo": ("_apply_logo", "SMA-E7"),
+        "ui_scale": ("_apply_ui_scale", "SMA-E8"),
+        "notification_bind": ("_apply_notification_bind", "SMA-E9"),
+        "command_palette_bind": ("_apply_command_palette_bind", "SMA-E10"),
+        "apps_per_ring": ("_apply_apps_per_ring", "SMA-E11"),
+        "reduce_graphics": ("_apply_reduce_graphics", "SMA-E12"),
+        "color_theme": ("_apply_color_theme", "SMA-E13")
+    }
+
     # Sets wallpaper path
     def set_wallpaper(self, wallpaper_path):
+        return self.set_settings({"wallpaper": wallpaper_path})["success"]
+
+    def _apply_wallpaper(self, key, wallpaper_path):
         global wallpaper
         normalized_value = str(wallpaper_path or "").strip()
 
@@ -1612,80 +6527,42 @@ class SettingsManagerAPI:
         else:
             resolved_path = _resolve_configured_path(normalized_value)
             if not resolved_path or not os.path.isfile(resolved_path):
-                print(f"SMA-E2: Wallpaper path does not exist: {normalized_value}")
-                return False
+                raise ValueError(f"Wallpaper path does not exist: {normalized_value}")
 
             mime_type, _ = mimetypes.guess_type(resolved_path)
             extension = os.path.splitext(resolved_path)[1].lower()
             is_image_mime = bool(mime_type and mime_type.startswith('image/'))
 
             if not is_image_mime and extension not in SUPPORTED_WALLPAPER_EXTENSIONS:
-                print(f"SMA-E2: Unsupported wallpaper format: {extension or 'unknown'}")
-                return False
+                raise ValueError(f"Unsupported wallpaper format: {extension or 'unknown'}")
 
         wallpaper = normalized_value
-        # Write to settings.yaml
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["wallpaper"] = normalized_value
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E2: Error setting wallpaper: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E2")')
-            return False
-        return True
+        return normalized_value
     
     # Sets day gradient preference
     def set_day_gradient(self, enabled):
+        return self.set_settings({"day_gradient": enabled})["success"]
+
+    def _apply_day_gradient(self, key, enabled):
         global day_gradient
         day_gradient = enabled
-        # Write to settings.yaml
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["day_gradient"] = enabled
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E3: Error setting day_gradient: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E3")')
-            return False
-        return True
+        return enabled
     
     # Sets fullscreen preference
     def set_fullscreen(self, enabled):
+        return self.set_settings({"fullscreen": enabled})["success"]
+
+    def _apply_fullscreen(self, key, enabled):
         global fullscreen, webview_window
         fullscreen = enabled
         
         # Actually toggle the pywebview window fullscreen
         if webview_window and not IS_MOBILE:
             webview_window.toggle_fullscreen()
-        
-        # Write to settings.yaml
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["fullscreen"] = enabled
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E4: Error setting fullscreen: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E4")')
-            return False
-        return True
+        return enabled
     
     # Sets font path for a given weight
     def set_font(self, weight, font_path):
-        global fonts
-
         weight_key = str(weight or "").strip().lower()
         if not weight_key:
             print("SMA-E5: Missing font weight")
@@ -1696,130 +6573,70 @@ class SettingsManagerAPI:
         if weight_key not in SUPPORTED_FONT_KEYS:
             print(f"SMA-E5: Unsupported font weight key: {weight_key}")
             return False
+        return self.set_settings({weight_key: font_path})["success"]
 
+    def _apply_font(self, weight_key, font_path):
+        global fonts
         normalized_path = str(font_path or "").strip()
         if not normalized_path:
-            print("SMA-E5: Missing font path")
-            return False
+            raise ValueError("Missing font path")
 
         resolved_path = _resolve_configured_path(normalized_path)
         if not resolved_path or not os.path.isfile(resolved_path):
-            print(f"SMA-E5: Font path does not exist: {normalized_path}")
-            return False
+            raise ValueError(f"Font path does not exist: {normalized_path}")
 
         extension = os.path.splitext(resolved_path)[1].lower()
         if extension not in SUPPORTED_FONT_EXTENSIONS:
-            print(f"SMA-E5: Unsupported font extension: {extension or 'unknown'}")
-            return False
+            raise ValueError(f"Unsupported font extension: {extension or 'unknown'}")
 
         fonts[weight_key] = normalized_path
-        # Write to settings.yaml
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings[weight_key] = normalized_path
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E5: Error setting font {weight}: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E5")')
-            return False
-        return True
+        return normalized_path
     
     # Sets update preference
     def set_updates(self, channel):
+        return self.set_settings({"updates": channel})["success"]
+
+    def _apply_updates(self, key, channel):
         global updates
         updates = channel
-        # Write to settings.yaml
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["updates"] = channel
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E6: Error setting updates: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E6")')
-            return False
-        return True
+        return channel
     
     # Sets UI scale multiplier
     def set_ui_scale(self, scale):
+        return self.set_settings({"ui_scale": scale})["success"]
+
+    def _apply_ui_scale(self, key, scale):
         global ui_scale
         ui_scale = float(scale)
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["ui_scale"] = ui_scale
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E8: Error setting ui_scale: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E8")')
-            return False
-        return True
+        return ui_scale
 
     # Sets logo preference
     def set_logo(self, logo_type):
-        print(f"Setting logo to: {logo_type}")
+        return self.set_settings({"logo": logo_type})["success"]
+
+    def _apply_logo(self, key, logo_type):
         global logo
+        print(f"Setting logo to: {logo_type}")
         logo = logo_type
-        # Write to settings.yaml
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["logo"] = logo_type
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-            print(f"Logo successfully set to: {logo_type}")
-        except Exception as e:
-            print(f"SMA-E7: Error setting logo preference: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E7")')
-            return False
-        return True
+        return logo_type
+
     # Sets keybind for notifications
     def set_notification_bind(self, keybind):
+        return self.set_settings({"notification_bind": keybind})["success"]
+
+    def _apply_notification_bind(self, key, keybind):
         global notification_bind
         notification_bind = keybind
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["notification_bind"] = keybind
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E9: Error setting notification_bind: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E9")')
-            return False
-        return True
+        return keybind
     
     # Sets keybind for command palette
     def set_command_palette_bind(self, keybind):
+        return self.set_settings({"command_palette_bind": keybind})["success"]
+
+    def _apply_command_palette_bind(self, key, keybind):
         global command_palette_bind
         command_palette_bind = keybind
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["command_palette_bind"] = keybind
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E10: Error setting command_palette_bind: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E10")')
-            return False
-        return True
+        return keybind
     
     def get_notification_bind(self):
         global notification_bind
@@ -1830,23 +6647,17 @@ class SettingsManagerAPI:
         return command_palette_bind
 
     def set_apps_per_ring(self, count):
+        return self.set_settings({"apps_per_ring": count})["success"]
+
+    def _apply_apps_per_ring(self, key, count):
         global apps_per_ring
         apps_per_ring = int(count)
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["apps_per_ring"] = apps_per_ring
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E11: Error setting apps_per_ring: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E11")')
-            return False
-        return True
+        return apps_per_ring
     
     def set_reduce_graphics(self, level):
+        return self.set_settings({"reduce_graphics": level})["success"]
+
+    def _apply_reduce_graphics(self, key, level):
         global reduce_graphics
         normalized_level = str(level).strip().lower()
         if normalized_level in ["0", "level_0"]:
@@ -1857,36 +6668,19 @@ class SettingsManagerAPI:
             reduce_graphics = "level_2"
         else:
             reduce_graphics = "level_0"
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["reduce_graphics"] = reduce_graphics
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E12: Error setting reduce_graphics: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E12")')
-            return False
-        return True
+        return reduce_graphics
     
     def set_color_theme(self, theme):
+        return self.set_settings({"color_theme": theme})["success"]
+
+    def _apply_color_theme(self, key, theme):
         global color_theme
         color_theme = theme
-        try:
-            settings_path = os.path.join(DATA_DIR, "settings.yaml")
-            with open(settings_path, "r") as file:
-                settings = yaml.load(file, Loader=yaml_loader) or {}
-            settings["color_theme"] = color_theme
-            with open(settings_path, "w") as file:
-                yaml.safe_dump(settings, file)
-        except Exception as e:
-            print(f"SMA-E13: Error setting color_theme: {e}")
-            if webview_window and not IS_MOBILE:
-                webview_window.evaluate_js('displayError("SMA-E13")')
-            return False
-        return True
+        return theme
+
+    # Writes pending settings changes now instead of after the save delay
+    def flush_settings(self):
+        return flush_settings()
 
 class UsageMonitorAPI:
     def __init__(self):
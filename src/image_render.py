@@ -0,0 +1,50 @@
+################################################################################
+# Image rendering for Sanctum Station thumbnails and display proxies
+# The backend's thumbnail process pool runs these functions. This module only
+# imports Pillow, so pool workers start without the GUI or backend services.
+################################################################################
+
+import math
+import os
+import uuid
+
+from PIL import Image, ImageOps
+
+# Decodes src and writes a copy no larger than max_edge pixels beside dest_base
+# Opaque images become JPEG and images with transparency PNG; returns (cache path, width, height, mime type)
+def render_image_proxy(src, dest_base, max_edge, quality):
+    with Image.open(src) as source:
+        # JPEG can decode straight to a reduced scale, which skips most of the decoding work
+        source.draft(None, (max_edge, max_edge))
+        image = ImageOps.exif_transpose(source)
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS, reducing_gap=3.0)
+        return save_image_proxy(image, dest_base, quality)
+
+# Renders the smallest copy of src that still covers width x height, like CSS object-fit: cover
+def render_image_cover(src, dest_base, width, height, quality):
+    with Image.open(src) as source:
+        # The longer target edge for both sides keeps the draft large enough for rotated photos
+        source.draft(None, (max(width, height), max(width, height)))
+        image = ImageOps.exif_transpose(source)
+        scale = max(width / image.width, height / image.height)
+        if scale < 1:
+            size = (max(1, math.ceil(image.width * scale)), max(1, math.ceil(image.height * scale)))
+            image = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+        return save_image_proxy(image, dest_base, quality)
+
+# Saves a rendered image beside the cache as JPEG, or PNG when it has transparency
+def save_image_proxy(image, dest_base, quality):
+    if image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        dest, image_format, mime_type, options = f"{dest_base}.png", "PNG", "image/png", {"optimize": True}
+    else:
+        image = image.convert("RGB")
+        dest, image_format, mime_type, options = f"{dest_base}.jpg", "JPEG", "image/jpeg", {"quality": quality}
+    temp_path = f"{dest}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        image.save(temp_path, image_format, **options)
+        os.replace(temp_path, dest)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return dest, image.width, image.height, mime_type
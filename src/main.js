@@ -32,6 +32,72 @@ function buildFontSource(fontPath) {
     return `url("${normalizedPath}")`;
 }
 
+const FONT_FAMILY_STACK = `'Segoe UI', Tahoma, Geneva, Verdana, sans-serif`;
+
+// Registers the configured font faces once per document from get_font_manifest
+// Apps run inside this document, so they wait on ensureLoaded() instead of loading fonts again
+window.SanctumFonts = (function() {
+    const loadedFaces = new Map(); // manifest key -> { version, fontFace }
+    let manifestVersion = null;
+    let pending = null;
+
+    async function loadFace(family, face) {
+        const loaded = loadedFaces.get(face.key);
+        if (loaded && loaded.version === face.version) {
+            return;
+        }
+
+        const source = face.url ? `url("${face.url}")` : buildFontSource(face.source);
+        const fontFace = new FontFace(family, source, { weight: face.weight, style: 'normal' });
+        await fontFace.load();
+        if (loaded) {
+            document.fonts.delete(loaded.fontFace);
+        }
+        document.fonts.add(fontFace);
+        loadedFaces.set(face.key, { version: face.version, fontFace });
+    }
+
+    async function load() {
+        const manifest = await window.pywebview.api.get_font_manifest();
+        if (!manifest || !manifest.success) {
+            return false;
+        }
+        if (manifest.version === manifestVersion) {
+            return true;
+        }
+
+        const results = await Promise.allSettled(manifest.faces.map(face => loadFace(manifest.family, face)));
+        results.forEach((result, index) => {
+            if (result.status === 'rejected') {
+                console.error(`Error loading font ${manifest.faces[index].key}:`, result.reason);
+            }
+        });
+
+        manifestVersion = manifest.version;
+        document.body.style.fontFamily = `"${manifest.family}", ${FONT_FAMILY_STACK}`;
+        console.log(`Fonts ready (manifest ${manifest.version}, ${loadedFaces.size} faces)`);
+        return true;
+    }
+
+    return {
+        // Resolves once the fonts are registered; refresh re-reads the manifest (e.g. after set_font)
+        ensureLoaded(refresh = false) {
+            if (!pending || refresh) {
+                pending = load().catch(error => {
+                    console.error('Error loading fonts:', error);
+                    pending = null;
+                    return false;
+                });
+            }
+            return pending;
+        },
+
+        get version() {
+            return manifestVersion;
+        }
+    };
+})();
+
 const DEFAULT_NOTIFICATION_BIND = 'Ctrl+N';
 const DEFAULT_COMMAND_PALETTE_BIND = 'Ctrl+Space';
 const DEFAULT_APPS_PER_RING = 8;
@@ -546,50 +612,8 @@ class DesktopInteractions {
     }
 
     async loadFont() {
-        try {
-            const fonts = await window.pywebview.api.get_fonts();
-            if (fonts && Object.keys(fonts).length > 0) {
-                console.log('Loading fonts:', fonts);
-                
-                // Font weight mapping
-                const weightMap = {
-                    'black_font': 900,
-                    'extra_bold_font': 800,
-                    'bold_font': 700,
-                    'semi_bold_font': 600,
-                    'medium_font': 500,
-                    'regular_font': 400,
-                    'light_font': 300,
-                    'extra_light_font': 200,
-                    'thin_font': 100
-                };
-                
-                const fontName = 'Inter';
-                
-                // Load all font weights
-                for (const [key, filename] of Object.entries(fonts)) {
-                    const weight = weightMap[key];
-                    if (!weight) {
-                        continue;
-                    }
-
-                    const fontFace = new FontFace(fontName, buildFontSource(filename), {
-                        weight: weight,
-                        style: 'normal'
-                    });
-                    
-                    await fontFace.load();
-                    document.fonts.add(fontFace);
-                    console.log(`Loaded ${key} (weight ${weight}): ${filename}`);
-                }
-                
-                // Apply the font family to the body
-                document.body.style.fontFamily = `"${fontName}", 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif`;
-                console.log('All fonts loaded and applied successfully');
-            }
-        } catch (error) {
-            console.error('Error loading fonts:', error);
-        }
+        // Re-reads the manifest so faces changed in settings are swapped in
+        return window.SanctumFonts.ensureLoaded(true);
     }
 
     setupEventListeners() {
@@ -1041,8 +1065,43 @@ async function loadDayGradient() {
     }
 }
 
+let wallpaperVersion = null;
+let wallpaperResizeHandle = null;
+
+// Shows a get_scaled_wallpaper result, skipping the reload when the version has not changed
+function applyWallpaperPayload(payload) {
+    const wallpaperElement = document.getElementById('wallpaper');
+    const source = payload ? (payload.url || payload.data_url) : null;
+
+    if (!payload || !payload.version || !source) {
+        wallpaperVersion = null;
+        wallpaperElement.removeAttribute('src');
+        wallpaperElement.style.display = 'none';
+        return;
+    }
+
+    if (payload.version !== wallpaperVersion) {
+        wallpaperVersion = payload.version;
+        wallpaperElement.src = source;
+    }
+    wallpaperElement.style.display = 'block';
+}
+
 async function loadWallpaper() {
     try {
+        // Prefer a copy scaled to the screen over decoding the full-size file
+        if (typeof window.pywebview.api.get_scaled_wallpaper === 'function') {
+            const ratio = window.devicePixelRatio || 1;
+            const payload = await window.pywebview.api.get_scaled_wallpaper(
+                Math.round(window.innerWidth * ratio),
+                Math.round(window.innerHeight * ratio)
+            );
+            if (payload && payload.success) {
+                applyWallpaperPayload(payload);
+                return;
+            }
+        }
+
         console.log('Loading wallpaper...');
         const wallpaperData = await window.pywebview.api.get_wallpaper_data();
         console.log('Wallpaper data received:', wallpaperData ? 'Yes (base64)' : 'None');
@@ -1051,6 +1110,7 @@ async function loadWallpaper() {
         
         if (wallpaperData) {
             console.log('Setting wallpaper from data URL');
+            wallpaperVersion = null;
             wallpaperElement.src = wallpaperData;
             wallpaperElement.style.display = 'block';
             console.log('Wallpaper element display:', wallpaperElement.style.display);
@@ -1065,6 +1125,22 @@ async function loadWallpaper() {
     }
 }
 
+// Scaled wallpapers depend on the window size; the backend only changes the version when
+// the size crosses a rendition step, so most resizes cost one cheap API call
+function initializeWallpaperSync() {
+    window.addEventListener('sanctum-wallpaper-event', (event) => {
+        const payload = event && event.detail ? event.detail : null;
+        if (payload && payload.event === 'ready' && payload.wallpaper) {
+            applyWallpaperPayload(payload.wallpaper);
+        }
+    });
+
+    window.addEventListener('resize', () => {
+        clearTimeout(wallpaperResizeHandle);
+        wallpaperResizeHandle = setTimeout(loadWallpaper, 300);
+    });
+}
+
 async function loadScale() {
     try {
         console.log('loadScale: calling get_settings...');
@@ -1090,6 +1166,124 @@ async function loadLogo() {
     }
 }
 
+// Console lines are buffered and sent to the backend with js_log_batch every flush_ms,
+// once batch_max lines are waiting, or right away after an error, instead of one call per line.
+// The backend chooses the lowest level sent (set_js_log_level) and returns it with every batch.
+const JS_LOG_LEVELS = { DEBUG: 10, LOG: 20, INFO: 20, WARN: 30, ERROR: 40 };
+const JS_LOG_BUFFER_MAX = 500;
+const JS_LOG_FAILURE_PAUSE_MS = 30000;
+
+function installConsoleForwarding() {
+    const original = {};
+    const config = { threshold: JS_LOG_LEVELS.LOG, flushMs: 1000, batchMax: 50 };
+    let buffer = [];
+    let dropped = 0;
+    let timer = null;
+    let sending = false;
+    let pausedUntil = 0;
+
+    function applyConfig(result) {
+        if (!result || !result.success) {
+            return;
+        }
+        if (Number.isFinite(result.threshold)) config.threshold = result.threshold;
+        if (Number.isFinite(result.flush_ms) && result.flush_ms > 0) config.flushMs = result.flush_ms;
+        if (Number.isFinite(result.batch_max) && result.batch_max > 0) config.batchMax = result.batch_max;
+    }
+
+    function formatArg(arg) {
+        if (arg instanceof Error) {
+            return arg.stack || `${arg.name}: ${arg.message}`;
+        }
+        if (arg !== null && typeof arg === 'object') {
+            try {
+                return JSON.stringify(arg);
+            } catch (e) {
+                return String(arg);
+            }
+        }
+        return String(arg);
+    }
+
+    async function flush() {
+        if (timer) {
+            clearTimeout(timer);
+            timer = null;
+        }
+        if (sending || buffer.length === 0) {
+            return;
+        }
+        const records = buffer;
+        const lost = dropped;
+        buffer = [];
+        dropped = 0;
+        sending = true;
+        try {
+            applyConfig(await window.pywebview.api.js_log_batch(records, lost));
+        } catch (e) {
+            // The failed call logs its own error, which would be forwarded again; stop forwarding for a while
+            pausedUntil = Date.now() + JS_LOG_FAILURE_PAUSE_MS;
+            dropped += records.length + lost;
+        } finally {
+            sending = false;
+            if (buffer.length > 0) {
+                scheduleFlush();
+            }
+        }
+    }
+
+    function scheduleFlush() {
+        if (!timer) {
+            timer = setTimeout(flush, config.flushMs);
+        }
+    }
+
+    function forward(level, args) {
+        const value = JS_LOG_LEVELS[level];
+        if (value < config.threshold) {
+            return;
+        }
+        if (Date.now() < pausedUntil) {
+            dropped++;
+            return;
+        }
+        if (buffer.length >= JS_LOG_BUFFER_MAX) {
+            buffer.shift();
+            dropped++;
+        }
+        buffer.push([level, args.map(formatArg).join(' ')]);
+        if (value >= JS_LOG_LEVELS.ERROR || buffer.length >= config.batchMax) {
+            flush();
+        } else {
+            scheduleFlush();
+        }
+    }
+
+    [['log', 'LOG'], ['info', 'INFO'], ['debug', 'DEBUG'], ['warn', 'WARN'], ['error', 'ERROR']].forEach(([method, level]) => {
+        original[method] = console[method];
+        console[method] = function(...args) {
+            original[method].apply(console, args);
+            try {
+                forward(level, args);
+            } catch (e) {}
+        };
+    });
+
+    window.addEventListener('pagehide', flush);
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') {
+            flush();
+        }
+    });
+
+    Promise.resolve()
+        .then(() => window.pywebview.api.get_js_log_config())
+        .then(applyConfig)
+        .catch(() => {});
+
+    original.log('[Main.js] Console forwarding to Python enabled');
+}
+
 // Wait for pywebview API to be ready
 function waitForPywebview(callback, maxAttempts = 200) {
     let attempts = 0;
@@ -1101,32 +1295,10 @@ function waitForPywebview(callback, maxAttempts = 200) {
             
             // Forward console logs to Python on mobile
             if (window.location.protocol === 'http:' && window.location.hostname === '127.0.0.1') {
-                const originalLog = console.log;
-                const originalError = console.error;
-                const originalWarn = console.warn;
-                
-                console.log = function(...args) {
-                    originalLog.apply(console, args);
-                    try {
-                        window.pywebview.api.js_log('LOG', args.join(' '));
-                    } catch (e) {}
-                };
-                
-                console.error = function(...args) {
-                    originalError.apply(console, args);
-                    try {
-                        window.pywebview.api.js_log('ERROR', args.join(' '));
-                    } catch (e) {}
-                };
-                
-                console.warn = function(...args) {
-                    originalWarn.apply(console, args);
-                    try {
-                        window.pywebview.api.js_log('WARN', args.join(' '));
-                    } catch (e) {}
-                };
-                
-                originalLog('[Main.js] Console forwarding to Python enabled');
+                installConsoleForwarding();
+            } else if (window.sanctumDeadlines) {
+                // Desktop: give every API call a deadline and cancel it on the backend when it passes
+                window.sanctumDeadlines.install();
             }
             
             callback();
@@ -1141,8 +1313,12 @@ function waitForPywebview(callback, maxAttempts = 200) {
 const NOTIFICATION_FALLBACK_POLL_MS = 60000;
 const NOTIFICATION_POPUP_DURATION_MS = 5000;
 const NOTIFICATION_POPUP_LIMIT = 4;
+const NOTIFICATION_SYNC_LIMIT = 200;
 let notificationFallbackPollHandle = null;
 let notificationSyncInFlight = false;
+let notificationCursor = null; // Cursor of the last get_notifications result applied
+let notificationItems = []; // Newest first
+let notificationTotal = 0;
 
 function isNotificationPanelOpen() {
     const notificationPanel = document.getElementById('notificationPanel');
@@ -1328,7 +1504,7 @@ function renderNotifications(notifications) {
         return `
             <div class="notification-item">
                 <div class="notification-item-header">
-                    <span class="notification-source">${notif.source || 'System'}</span>
+                    <span class="notification-source">${notif.source || 'System'}${notif.count > 1 ? ` ×${notif.count}` : ''}</span>
                     <span class="notification-time">${timeStr}</span>
                 </div>
                 <div class="notification-message">${notif.message}</div>
@@ -1337,7 +1513,22 @@ function renderNotifications(notifications) {
         `;
     }).join('');
 
-    updateNotificationBadge(normalizedNotifications.length);
+    updateNotificationBadge(Math.max(notificationTotal, normalizedNotifications.length));
+}
+
+// Applies a get_notifications page or delta to the local list
+function applyNotificationResult(result) {
+    if (result.reset === false) {
+        const deletedIds = new Set(result.deleted || []);
+        const added = Array.isArray(result.added) ? result.added : [];
+        added.forEach(notification => deletedIds.add(notification.id));
+        notificationItems = added.concat(notificationItems.filter(notification => !deletedIds.has(notification.id)));
+    } else {
+        notificationItems = Array.isArray(result.notifications) ? result.notifications : [];
+    }
+    notificationItems = notificationItems.slice(0, NOTIFICATION_SYNC_LIMIT);
+    notificationCursor = result.cursor;
+    notificationTotal = Number(result.total) || 0;
 }
 
 async function syncNotificationsFromBackend({ refreshPanelIfOpen = true, reason = 'sync' } = {}) {
@@ -1347,16 +1538,17 @@ async function syncNotificationsFromBackend({ refreshPanelIfOpen = true, reason
 
     notificationSyncInFlight = true;
     try {
-        const result = await window.pywebview.api.get_notifications();
+        // Only what changed since the last sync is fetched once a cursor is known
+        const result = await window.pywebview.api.get_notifications(notificationCursor, NOTIFICATION_SYNC_LIMIT);
         if (!result.success) {
             return;
         }
 
-        const notifications = Array.isArray(result.notifications) ? result.notifications : [];
-        updateNotificationBadge(notifications.length);
+        applyNotificationResult(result);
+        updateNotificationBadge(notificationTotal);
 
         if (refreshPanelIfOpen && isNotificationPanelOpen()) {
-            renderNotifications(notifications);
+            renderNotifications(notificationItems);
         }
     } catch (error) {
         console.error(`Failed to sync notifications (${reason}):`, error);
@@ -1378,11 +1570,17 @@ function initializeNotificationSync() {
             updateNotificationBadge(Number(payload.count));
         }
 
-        if (payload && payload.event === 'notification-added' && payload.notification) {
-            showNotificationPopup(payload.notification);
-        }
+        // Bursts arrive as one notifications-batch event; only the newest of them pop up
+        const events = payload && payload.event === 'notifications-batch' && Array.isArray(payload.events)
+            ? payload.events
+            : [payload];
+        events
+            .filter(item => item && item.event === 'notification-added' && item.notification)
+            .slice(-NOTIFICATION_POPUP_LIMIT)
+            .forEach(item => showNotificationPopup(item.notification));
 
-        if (isNotificationPanelOpen()) {
+        const alreadySynced = payload && payload.cursor === notificationCursor;
+        if (isNotificationPanelOpen() && !alreadySynced) {
             syncNotificationsFromBackend({ refreshPanelIfOpen: true, reason: 'event-panel-open' });
         }
     });
@@ -1408,10 +1606,10 @@ async function toggleNotifications() {
 
 async function loadNotifications() {
     try {
-        const result = await window.pywebview.api.get_notifications();
+        const result = await window.pywebview.api.get_notifications(notificationCursor, NOTIFICATION_SYNC_LIMIT);
         if (result.success) {
-            const notifications = Array.isArray(result.notifications) ? result.notifications : [];
-            renderNotifications(notifications);
+            applyNotificationResult(result);
+            renderNotifications(notificationItems);
         }
     } catch (error) {
         console.error('Failed to load notifications:', error);
@@ -2379,6 +2577,7 @@ document.addEventListener('DOMContentLoaded', () => {
         console.log('waitForPywebview: callback fired, loading resources...');
         initializeNotificationSync();
         loadFileProcessorSupport();
+        initializeWallpaperSync();
         loadWallpaper();
         loadDayGradient();
         loadLogo();